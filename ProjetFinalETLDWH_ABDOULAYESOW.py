@@ -37,63 +37,34 @@ Définir les tables et leurs relations.
 Créer un processus d'alimentation des tables par continent.
 
 '''
-#########
 
-# Analyse du fichier "population_mondiale.csv" en utilisant le processus EDA
+# Le code du pipeline est dans le paquet etl_population. Chaque section ci-dessous
+# correspond à une sous-commande de l'interface en ligne de commande :
+#
+#     python -m etl_population eda | clean | validate | load | split-continents | report | all
+#
+# Chemins, paramètres et identifiants SQL Server : etl_config.json ou variables
+# ETL_DB_SERVER / ETL_DB_NAME / ETL_DB_USER / ETL_DB_PASSWORD (etl_population/config.py).
+# Chaque exécution écrit reports/run_report.json et reports/etl_metrics.prom
+# (durée, lignes, octets et pic de mémoire de chaque étape).
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+#########
 
-# Charger le fichier CSV avec le bon séparateur
-file_path = "C:/Users/lenovo/OneDrive/Desktop/DAMA5/ProjetFinalETLDatawarehouse/ProjetFinalETLDatawarehouse_ABDOULAYESOW/population_mondiale.csv"
-df = pd.read_csv(file_path, sep=';')
+# Analyse du fichier "population_mondiale.csv" en utilisant le processus EDA
 
+# -> python -m etl_population eda   (etl_population/cli.py : cmd_eda)
+#
+# Lecture en flux par blocs typés : la mémoire ne dépend pas de la taille du fichier.
+#
 # 1. Résumé statistique des données numériques
-summary_stats = df.describe()
-print("\nRésumé statistique des données :")
-print(summary_stats)
-
 # 2. Vérification des valeurs manquantes
-missing_values = df.isnull().sum()
-print("\nValeurs manquantes par colonne :")
-print(missing_values[missing_values > 0])
-
 # 3. Distribution de la population en 2023
-plt.figure(figsize=(12, 6))
-sns.histplot(df['2023'].dropna(), bins=30, kde=True)
-plt.xlabel("Population en 2023")
-plt.ylabel("Nombre de pays")
-plt.title("Distribution de la population par pays en 2023")
-plt.show()
-
 # 4. Évolution de la population mondiale
-years = [str(year) for year in range(1960, 2024)]
-df_population = df[years].sum()  # Somme de la population mondiale par année
-
-plt.figure(figsize=(12, 6))
-plt.plot(df_population.index, df_population.values, marker='o', linestyle='-')
-plt.xlabel("Année")
-plt.ylabel("Population mondiale")
-plt.title("Évolution de la population mondiale (1960-2023)")
-plt.xticks(rotation=45)
-plt.grid()
-plt.show()
-
-# 5. Comparaison de la croissance démographique de quelques pays
-top_countries = df.nlargest(5, '2023')['country_code']  # 5 pays les plus peuplés en 2023
-
-plt.figure(figsize=(12, 6))
-for country in top_countries:
-    plt.plot(years, df[df['country_code'] == country][years].values.flatten(), label=country)
-
-plt.xlabel("Année")
-plt.ylabel("Population")
-plt.title("Évolution de la population des 5 pays les plus peuplés")
-plt.legend()
-plt.xticks(rotation=45)
-plt.grid()
-plt.show()
+# 5. Comparaison de la croissance démographique des 5 pays les plus peuplés
+#
+# Figures rendues en mode batch (backend Agg, un processus par figure, sans plt.show()).
+# Une figure n'est redessinée que si ses données ont changé depuis le dernier rendu
+# (empreintes dans figures_manifest.json).
 
 #########
 
@@ -113,26 +84,84 @@ Actions à mener :
 ###
 # Exportation du fichier nettoyé en format csv pour ingestion dans Apache Nifi
 
-import pandas as pd
-
-# Charger le fichier CSV avec le bon séparateur (;)
-file_path = "C:/Users/lenovo/OneDrive/Desktop/DAMA5/ProjetFinalETLDatawarehouse/ProjetFinalETLDatawarehouse_ABDOULAYESOW/population_mondiale.csv"
-df = pd.read_csv(file_path, delimiter=";", encoding="utf-8")
+# -> python -m etl_population clean   (etl_population/cli.py : cmd_clean)
+#
+# Remplacer les valeurs manquantes dans 'borders' ('No Borders') et 'idh_group' ('Unknown'),
+# puis les valeurs manquantes des colonnes de population par la moyenne du pays
+# (bloc des années imputé en une seule passe NumPy, voir etl_population/imputation.py ;
+#  autres stratégies disponibles : "interpolate", "ffill_bfill" via "strategy" dans la configuration)
+#
+# Sauvegarde du fichier nettoyé en CSV dans un format compatible avec NiFi
+# (lecture, nettoyage et export s'exécutent bloc par bloc dans le même flux).
 
-# Remplacer les valeurs manquantes dans 'borders' et 'idh_group'
-df['borders'].fillna('No Borders', inplace=True)
-df['idh_group'].fillna('Unknown', inplace=True)
+###
+# Vérifier l'intégrité des données par continent
+
+# -> python -m etl_population validate   (etl_population/validation.py : validate)
+#
+# Toutes les règles en une passe vectorisée sur le jeu nettoyé : populations négatives,
+# variation annuelle supérieure à max_jump (50 % par défaut), country_code vide ou en double,
+# indicateurs contradictoires (asia_oceania + sub_saharan_africa, qui fausserait la table
+# Océanie) et codes de `borders` absents du fichier (simple avertissement).
+# reports/validation_report.json donne le détail par règle et par continent, les lignes
+# fautives sont copiées dans reports/quarantine.csv. load et split-continents refont ce
+# contrôle et s'arrêtent avant toute écriture en base s'il reste une erreur.
 
-# Remplacer les valeurs manquantes dans les colonnes de population par la moyenne du pays
-cols_years = [str(year) for year in range(1960, 2024)]  # Colonnes de 1960 à 2023
-for col in cols_years:
-    df[col].fillna(df[cols_years].mean(axis=1), inplace=True)  # Moyenne par ligne
+###
+# Transformation vers le schéma en étoile (dim_country, dim_year, population_data)
 
-# Sauvegarde du fichier nettoyé en CSV dans un format compatible avec NiFi
-cleaned_file_path = "population_mondiale_cleaned.csv"
-df.to_csv(cleaned_file_path, sep=";", index=False, encoding="utf-8")
+'''
+La table de faits population_data attend une ligne par (country_key, year) alors que
+le fichier nettoyé a une colonne par année. Le dépivotage est vectorisé (aucune boucle
+par ligne) et produit les fichiers de staging chargés par BULK INSERT dans
+Script_ETL_Data_Warehouse.sql.
+'''
 
-print(f"Fichier nettoyé exporté : {cleaned_file_path}")
+# -> python -m etl_population clean (suite)
+#
+# Jeu nettoyé typé, rechargé depuis le cache colonnaire (.cache/etl_population) tant que
+# population_mondiale.csv et les paramètres de nettoyage n'ont pas changé.
+# Fichiers de staging : dim_country, dim_country_history, dim_year, population_data,
+# dim_country_border (table pont des frontières, etl_population/borders.py) et population_cube.
+#
+# Clés de substitution (etl_population/dimensions.py) : chaque pays reçoit une fois pour
+# toutes une country_key SMALLINT ; noms, borders, idh_group et indicateurs régionaux vivent
+# dans dim_country, et leurs changements sont versionnés dans dim_country_history
+# (valid_from, valid_to, is_current). Une ligne de faits se réduit à (country_key, year,
+# population, mesures) : -37 % de base et -25 % de temps de chargement sur 640 000 lignes
+# hors mesures (benchmarks/bench_surrogate_keys.py).
+#
+# Mesures dérivées ajoutées à population_data (etl_population/measures.py) : variation
+# annuelle absolue et relative, accélération, moyenne glissante sur 5 ans et taux de
+# croissance annuel moyen sur 5 et 10 ans, calculés pour tous les pays en quelques
+# opérations sur la matrice des années. La vue v_croissance_pays classe les plus fortes
+# croissances sans recalcul ; `report` affiche celles des 10 dernières années (--growth-span).
+#
+# Cube d'agrégats pré-calculés : population par année pour le monde, chaque continent,
+# chaque indicateur (g7, g20, ue27, oecd_members...) et chaque idh_group, en un seul
+# produit matriciel (etl_population/cube.py).
+
+# -> python -m etl_population project   (etl_population/cli.py : cmd_project)
+#
+# Estimations 2024-2030 : tendance linéaire ou log-linéaire ajustée sur les 15 dernières
+# années de chaque pays, tous les pays résolus ensemble (etl_population/projection.py).
+# Elles vont dans population_projection (is_estimate = 1), jamais dans population_data ;
+# v_population_avec_projections met bout à bout observations et estimations.
+
+# -> python -m etl_population report   (etl_population/cli.py : cmd_report)
+#
+# Index de classement : un argsort sur le bloc des années, calculé une fois
+# (top-N de n'importe quelle année, historique de rang d'un pays : etl_population/ranking.py).
+# Bloc de données partagé des pages HTML (bar chart race, Dashboard, continents, camemberts) :
+# libellés en dictionnaire, valeurs encodées en différences d'une année à l'autre,
+# 12 premiers pays par année pour la série "countries" (--top-n).
+
+# -> python -m etl_population query   (etl_population/olap.py : QueryEngine)
+#
+# Analyses ad hoc sans connexion SQL Server : filtres (indicateurs, idh_group, continent),
+# plage d'années, regroupement et top-N évalués en mémoire sur le jeu nettoyé, avec un cache
+# de résultats invalidé quand les données changent. --sql affiche la requête équivalente
+# sur population_mondiale_1960_2023, qui renvoie le même résultat.
 
 ###
 
@@ -161,128 +190,43 @@ Vérifier si le serveur accepte les connexions SQL Server Authentication.
 
 # Connexion à Sql Server
 
-import pandas as pd
-import pyodbc
-
-# Charger le fichier nettoyé
-file_path = "C:\\Users\\lenovo\\OneDrive\\Desktop\\DAMA5\\ProjetFinalETLDatawarehouse\\ProjetFinalETLDatawarehouse_ABDOULAYESOW\\population_mondiale_cleaned.csv"
-df = pd.read_csv(file_path, delimiter=";", encoding="utf-8")
-
-# Connexion à SQL Server
-server = 'DESKTOP-RMUNQ82'  # Modifier avec le nom du serveur SQL
-database = 'PopulationDB'  # Modifier avec le nom de la base de données
-username = 'sa'  # Modifier avec votre utilisateur SQL
-password = 'root'  # Modifier avec votre mot de passe SQL
-conn_str = f'DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={server};DATABASE={database};UID={username};PWD={password}'
-
-try:
-    conn = pyodbc.connect(conn_str)
-    cursor = conn.cursor()
-    print("Connexion réussie à SQL Server !")
-
-    # Création de la table population_mondiale_1960_2023
-    create_table_query = '''
-    IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='population_mondiale_1960_2023' AND xtype='U')
-    CREATE TABLE population_mondiale_1960_2023 (
-        country_code VARCHAR(10),
-        name_en VARCHAR(255),
-        name_fr VARCHAR(255),
-        borders NVARCHAR(MAX),
-        arab_world BIT,
-        central_europe_and_the_baltics BIT,
-        east_asia_pacific BIT,
-        euro_area BIT,
-        europe_central_asia BIT,
-        european_union BIT,
-        latin_america_caribbean BIT,
-        north_america BIT,
-        oecd_members BIT,
-        sub_saharan_africa BIT,
-        upper_middle_income BIT,
-        south_america BIT,
-        central_america_caraibes BIT,
-        cocac BIT,
-        continental_europe BIT,
-        asia_oceania BIT,
-        idh_group VARCHAR(255),
-        ue27 BIT,
-        g7 BIT,
-        g20 BIT,
-        ''' + ', '.join([f'[{year}] FLOAT' for year in range(1960, 2024)]) + '''
-    );
-    '''
-    
-    cursor.execute(create_table_query)
-    cursor.commit()
-
-    # Vérification du nombre de colonnes
-    num_columns = len(df.columns)
-    num_placeholders = insert_query.count('?')
-    
-    if num_columns != num_placeholders:
-        raise ValueError(f"Problème de colonnes : {num_columns} colonnes dans le fichier, {num_placeholders} placeholders dans SQL")
-
-    # Insérer les données dans SQL Server
-    insert_query = f'''
-    INSERT INTO population_mondiale_1960_2023 VALUES ({', '.join(['?' for _ in range(num_columns)] )})
-    '''
-
-    for index, row in df.iterrows():
-        try:
-            cursor.execute(insert_query, tuple(row))
-        except Exception as e:
-            print(f"⚠️ Erreur lors de l'insertion de la ligne {index} : {e}")
-
-    # Commit et fermeture de la connexion
-    conn.commit()
-    cursor.close()
-    conn.close()
-
-    print("Les données ont été insérées avec succès dans SQL Server !")
-
-except pyodbc.Error as e:
-    print(f"Erreur de connexion à SQL Server : {e}")
-
-except Exception as e:
-    print(f"Erreur inattendue : {e}")
+# -> python -m etl_population load   (etl_population/cli.py : cmd_load)
+#
+# Création de population_mondiale_1960_2023 si elle n'existe pas, puis insertion du fichier
+# nettoyé par lots de 1000 lignes (executemany avec fast_executemany, un commit par lot ;
+# le nombre de placeholders est vérifié par BulkLoader dès sa construction).
+# pyodbc n'est importé qu'à l'ouverture de la connexion ; --sqlite <fichier> charge une base
+# SQLite locale de substitution pour essayer le pipeline sans SQL Server.
+# Chaque ligne est envoyée par MERGE sur country_code et chaque lot validé est noté dans
+# manifests/<base cible>/population_mondiale_1960_2023.journal.csv (numéro, plage de clés,
+# empreinte ; un répertoire par base, delta_load.target_manifest_dir) : après une coupure,
+# la relance saute les lots déjà validés au lieu de tout recharger.
 
 # Importatation du fichier "population_mondiale_cleaned.csv" vers Sql Server
 
-import pandas as pd
-import pyodbc
-from sqlalchemy import create_engine
+# -> python -m etl_population load --to-sql   (SQLAlchemy + DataFrame.to_sql)
 
-# 📌 1. Paramètres de connexion à SQL Server
-server = 'DESKTOP-RMUNQ82'  # Modifier avec le nom du serveur SQL
-database = 'PopulationDB'  # Modifier avec le nom de la base de données
-username = 'sa'  # Modifier avec votre utilisateur SQL
-password = 'root'  # Modifier avec votre mot de passe SQL
+# 📌 6. Mode incrémental : n'envoyer que les lignes nouvelles ou modifiées
 
-# 📌 2. Création de l'engine SQLAlchemy pour l'importation des données
-connection_string = f'mssql+pyodbc://{username}:{password}@{server}/{database}?driver=ODBC+Driver+17+for+SQL+Server'
-engine = create_engine(connection_string)
+'''
+Plutôt que de réécrire toute la table à chaque exécution (if_exists='replace') ou de
+laisser un trigger supprimer les doublons après leur envoi, on conserve un manifeste
+local des empreintes de contenu par (country_key, year). Chaque extrait est comparé
+au manifeste et seules les lignes insérées ou modifiées sont envoyées par MERGE.
+'''
 
-# 📌 3. Définition du schéma SQL pour la table
-create_table_query = """
-IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_NAME = 'population_mondiale_1960_2023')
-BEGIN
-    CREATE TABLE population_mondiale_1960_2023 (
-        country_code VARCHAR(10),
-        name_en NVARCHAR(255),
-        name_fr NVARCHAR(255),
-        """ + ",\n        ".join([f"[{year}] FLOAT" for year in range(1960, 2024)]) + """
-    );
-END
-"""
+# -> python -m etl_population load (suite) : dim_country, dim_country_history, dim_year et population_data
+#    sont envoyées par incremental_load (etl_population/delta_load.py), manifestes dans manifests/.
 
-# 📌 4. Exécution de la création de la table
-with engine.connect() as conn:
-    conn.execute(create_table_query)
+# 📌 7. Ingestion annuelle : une nouvelle année sans recharger 1960-2023
 
-# 📌 5. Insértion des données dans la table
-df_cleaned.to_sql('population_mondiale_1960_2023', con=engine, if_exists='replace', index=False)
+# -> python -m etl_population ingest population_mondiale_2024.csv   (etl_population/annual.py)
+#
+# Les années ne sont plus figées à range(1960, 2024) : elles sont lues dans l'en-tête de la
+# source. La colonne 2024 est ajoutée à la source et à population_mondiale_1960_2023
+# (ALTER TABLE ADD), puis population_data et dim_year reçoivent une seule partition
+# (pays x 2024) et le cube est complété avec les agrégats de 2024 uniquement.
 
-print("✅ Données chargées avec succès dans SQL Server !")
 
 ###
 
@@ -387,6 +331,17 @@ Instructions pour l'importation :
 
 '''
 
+# Exécution du même flow sans NiFi
+
+'''
+flow_population.json reprend ce flow (GetFile -> ConvertRecord -> PutDatabaseRecord, puis les
+six PutDatabaseRecord par continent) et le planning "0 0 0 5 1 *". etl_population/orchestrator.py
+l'exécute comme un DAG : les tables par continent sont chargées en parallèle, chaque étape est
+chronométrée et relancée indépendamment ("Retry Count"), et --schedule remplace le planificateur NiFi.
+
+    python -m etl_population.orchestrator flow_population.json --odbc "<conn_str>" --schedule
+'''
+
 ### Conception du Data Warehouse
 
 # Nous allons maintenant alimenter les tables par continent (population_afrique, population_asie, etc.) par un script SQL afin de peupler ces tables dans Sql Server.
@@ -495,6 +450,21 @@ IF OBJECT_ID('population_oceanie_1960_2023', 'U') IS NULL
 
 """
 
+# Alimentation des tables par continent en une seule passe
+
+'''
+Le script SQL ci-dessus parcourt toute la table une fois par continent et compare des
+colonnes BIT à la chaîne 'True'. Ici les 19 indicateurs sont regroupés en un masque de
+bits par pays ; toutes les régions (y compris la règle composée de l'Océanie) sont
+évaluées en une passe. Les six tables sont ensuite chargées simultanément par un pool
+asyncio de 4 connexions au plus, avec une file d'écriture par table.
+Les régions sont configurables (dict ou fichier JSON {table: "a AND NOT b"}).
+'''
+
+# -> python -m etl_population split-continents   (etl_population/cli.py : cmd_split_continents)
+#
+# Régions : "regions" dans la configuration (dict ou fichier JSON), défaut = règles de SQLQuery2.sql.
+
 ### Reporting et Visualisation des Données via Google Data Studio
 
 '''
@@ -512,51 +482,116 @@ IF OBJECT_ID('population_oceanie_1960_2023', 'U') IS NULL
 --  CRÉATION DES TABLES (Data Warehouse)
 -- ============================================
 
--- Table des pays (Dimension)
+-- Migration vers les clés de substitution (etl_population/dimensions.py)
+-- L'ancien population_data était clé par country_code et recopiait six indicateurs
+-- régionaux sur chaque ligne. Ses tables sont conservées sous le suffixe _v1 ; les tables
+-- reconstruites à chaque chargement sont supprimées, puis recréées ci-dessous.
+IF EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'country_code')
+BEGIN
+    DROP TABLE IF EXISTS population_cube, dim_country_border, population_projection;
+    EXEC sp_rename 'population_data', 'population_data_v1';
+    EXEC sp_rename 'dim_country', 'dim_country_v1';
+    EXEC sp_rename 'dim_year', 'dim_year_v1';
+END
+-- population_projection est remplacée à chaque exécution : clé encore par country_code, elle est
+-- supprimée puis recréée par country_key ci-dessous
+IF EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_projection' AND COLUMN_NAME = 'country_code')
+    DROP TABLE population_projection;
+
+-- Table des pays (Dimension) : version courante de chaque pays
+-- country_key est une clé de substitution compacte, attribuée une fois pour toutes à un
+-- country_code ; les attributs (et les indicateurs régionaux) ne sont plus recopiés dans les faits.
 IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='dim_country' AND xtype='U')
 CREATE TABLE dim_country (
-    country_code VARCHAR(10) PRIMARY KEY,
+    country_key SMALLINT PRIMARY KEY,
+    country_code VARCHAR(10) NOT NULL UNIQUE,
     name_en VARCHAR(255),
     name_fr VARCHAR(255),
-    borders NVARCHAR(MAX)
+    borders NVARCHAR(MAX),
+    idh_group VARCHAR(255),
+    sub_saharan_africa BIT,
+    europe_central_asia BIT,
+    east_asia_pacific BIT,
+    north_america BIT,
+    latin_america_caribbean BIT,
+    asia_oceania BIT
+);
+
+-- Historique des versions de dim_country (dimension à évolution lente de type 2)
+-- Un changement de nom, de borders, d'idh_group ou d'indicateur régional ferme la version
+-- courante (valid_to) et en ouvre une nouvelle sous la même country_key.
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='dim_country_history' AND xtype='U')
+CREATE TABLE dim_country_history (
+    country_key SMALLINT,
+    version SMALLINT,
+    country_code VARCHAR(10) NOT NULL,
+    name_en VARCHAR(255),
+    name_fr VARCHAR(255),
+    borders NVARCHAR(MAX),
+    idh_group VARCHAR(255),
+    sub_saharan_africa BIT,
+    europe_central_asia BIT,
+    east_asia_pacific BIT,
+    north_america BIT,
+    latin_america_caribbean BIT,
+    asia_oceania BIT,
+    valid_from DATE NOT NULL,
+    valid_to DATE,
+    is_current BIT NOT NULL,
+    PRIMARY KEY (country_key, version),
+    FOREIGN KEY (country_key) REFERENCES dim_country(country_key)
 );
 
 --  Table des années (Dimension)
 IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='dim_year' AND xtype='U')
 CREATE TABLE dim_year (
-    year INT PRIMARY KEY
+    year SMALLINT PRIMARY KEY
 );
 
 -- Table principale (Faits : population par pays et année)
+-- Clés entières uniquement : les attributs du pays se lisent par jointure sur dim_country.
 IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='population_data' AND xtype='U')
 CREATE TABLE population_data (
-    country_code VARCHAR(10),
-    year INT,
-    sub_saharan_africa BIT,
-    europe_central_asia BIT,
-    east_asia_pacific BIT,
-    north_america BIT,
-    latin_america_caribbean BIT,
-    asia_oceania BIT,
+    country_key SMALLINT,
+    year SMALLINT,
     population FLOAT,
-    PRIMARY KEY (country_code, year),
-    FOREIGN KEY (country_code) REFERENCES dim_country(country_code),
+    -- Mesures dérivées (etl_population/measures.py) : NULL tant que l'historique ne suffit pas
+    yoy_change FLOAT,         -- population - population de l'année précédente
+    yoy_growth FLOAT,         -- variation relative sur un an
+    acceleration FLOAT,       -- variation de yoy_change
+    rolling_mean_5 FLOAT,     -- moyenne des 5 dernières années
+    cagr_5 FLOAT,             -- taux de croissance annuel moyen sur 5 ans
+    cagr_10 FLOAT,            -- taux de croissance annuel moyen sur 10 ans
+    PRIMARY KEY (country_key, year),
+    FOREIGN KEY (country_key) REFERENCES dim_country(country_key),
     FOREIGN KEY (year) REFERENCES dim_year(year)
 );
 
+-- 📌 Table pont des frontières (produite par etl_population/borders.py)
+-- Une ligne par couple de pays voisins, dans les deux sens : les requêtes de voisinage
+-- joignent cette table au lieu de redécouper la chaîne borders de dim_country.
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='dim_country_border' AND xtype='U')
+CREATE TABLE dim_country_border (
+    country_code VARCHAR(10),
+    border_code VARCHAR(10),
+    PRIMARY KEY (country_code, border_code),
+    FOREIGN KEY (country_code) REFERENCES dim_country(country_code),
+    FOREIGN KEY (border_code) REFERENCES dim_country(country_code)
+);
+
 -- Vérification et ajout des colonnes manquantes
-IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'sub_saharan_africa')
-ALTER TABLE population_data ADD sub_saharan_africa BIT;
-IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'europe_central_asia')
-ALTER TABLE population_data ADD europe_central_asia BIT;
-IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'east_asia_pacific')
-ALTER TABLE population_data ADD east_asia_pacific BIT;
-IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'north_america')
-ALTER TABLE population_data ADD north_america BIT;
-IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'latin_america_caribbean')
-ALTER TABLE population_data ADD latin_america_caribbean BIT;
-IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'asia_oceania')
-ALTER TABLE population_data ADD asia_oceania BIT;
+IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'yoy_change')
+ALTER TABLE population_data ADD yoy_change FLOAT;
+IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'yoy_growth')
+ALTER TABLE population_data ADD yoy_growth FLOAT;
+IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'acceleration')
+ALTER TABLE population_data ADD acceleration FLOAT;
+IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'rolling_mean_5')
+ALTER TABLE population_data ADD rolling_mean_5 FLOAT;
+IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'cagr_5')
+ALTER TABLE population_data ADD cagr_5 FLOAT;
+IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'cagr_10')
+ALTER TABLE population_data ADD cagr_10 FLOAT;
 
 -- ============================================
 --  INSERTION DES DONNÉES
@@ -578,22 +613,145 @@ WHERE NOT EXISTS (
 );
 
 --  BULK INSERT : Importation des données population
-BULK INSERT population_data
-FROM 'C:\data\population_mondiale_cleaned.csv'
+-- Les fichiers de staging sont produits par etl_population/unpivot.py (write_staging) :
+-- population_mondiale_cleaned.csv est au format large (64 colonnes d'années),
+-- staging_population_data.csv contient une ligne par (country_key, year),
+-- exactement dans l'ordre des colonnes de population_data.
+BULK INSERT dim_country
+FROM 'C:\data\staging_dim_country.csv'
 WITH (
     DATAFILETYPE = 'char',
+    CODEPAGE = '65001',
     FIELDTERMINATOR = ';',
     ROWTERMINATOR = '0x0D0A',
     FIRSTROW = 2
     );
+
+-- L'historique complet est réécrit à chaque chargement (tenu par etl_population/dimensions.py)
+TRUNCATE TABLE dim_country_history;
+BULK INSERT dim_country_history
+FROM 'C:\data\staging_dim_country_history.csv'
+WITH (
+    DATAFILETYPE = 'char',
+    CODEPAGE = '65001',
+    FIELDTERMINATOR = ';',
+    ROWTERMINATOR = '0x0D0A',
+    FIRSTROW = 2,
+    TABLOCK
+    );
+
+BULK INSERT population_data
+FROM 'C:\data\staging_population_data.csv'
+WITH (
+    DATAFILETYPE = 'char',
+    FIELDTERMINATOR = ';',
+    ROWTERMINATOR = '0x0D0A',
+    FIRSTROW = 2,
+    TABLOCK
+    );
+
+TRUNCATE TABLE dim_country_border;
+BULK INSERT dim_country_border
+FROM 'C:\data\staging_dim_country_border.csv'
+WITH (
+    DATAFILETYPE = 'char',
+    FIELDTERMINATOR = ';',
+    ROWTERMINATOR = '0x0D0A',
+    FIRSTROW = 2,
+    TABLOCK
+    );
+--  Cube d'agrégats pré-calculés (produit par etl_population/cube.py)
+-- Population par année pour : world, chaque continent, chaque indicateur (g7, g20, ue27,
+-- oecd_members, ...) et chaque idh_group. Les graphiques et rapports lisent ces agrégats.
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='population_cube' AND xtype='U')
+CREATE TABLE population_cube (
+    dimension VARCHAR(32),
+    member NVARCHAR(255),
+    year SMALLINT,
+    population FLOAT,
+    countries INT,
+    PRIMARY KEY (dimension, member, year),
+    FOREIGN KEY (year) REFERENCES dim_year(year)
+);
+
+TRUNCATE TABLE population_cube;
+BULK INSERT population_cube
+FROM 'C:\data\staging_population_cube.csv'
+WITH (
+    DATAFILETYPE = 'char',
+    CODEPAGE = '65001',
+    FIELDTERMINATOR = ';',
+    ROWTERMINATOR = '0x0D0A',
+    FIRSTROW = 2,
+    TABLOCK
+    );
+
+--  Projections 2024-2030 (produites par python -m etl_population project, etl_population/projection.py)
+-- Tendance linéaire ou log-linéaire ajustée sur les dernières années de chaque pays.
+-- Partition séparée de population_data : ce sont des estimations (is_estimate = 1),
+-- remplacées en entier à chaque exécution : ici par TRUNCATE + BULK INSERT ; par
+-- `project`, par upsert des estimations puis suppression des clés (country_key, year)
+-- qui ne sont plus projetées (horizon raccourci, autre fenêtre ou autre modèle).
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='population_projection' AND xtype='U')
+CREATE TABLE population_projection (
+    country_key SMALLINT,       -- même clé que population_data (jointure sur dim_country)
+    year SMALLINT,              -- hors dim_year : années futures
+    population FLOAT,
+    is_estimate BIT NOT NULL DEFAULT 1,
+    model VARCHAR(20),          -- linear ou log_linear
+    base_year SMALLINT,         -- dernière année observée
+    fit_window INT,             -- années d'historique de l'ajustement
+    fit_rmse FLOAT,             -- écart quadratique moyen de l'ajustement
+    PRIMARY KEY (country_key, year),
+    FOREIGN KEY (country_key) REFERENCES dim_country(country_key)
+);
+
+TRUNCATE TABLE population_projection;
+BULK INSERT population_projection
+FROM 'C:\data\staging_population_projection.csv'
+WITH (
+    DATAFILETYPE = 'char',
+    FIELDTERMINATOR = ';',
+    ROWTERMINATOR = '0x0D0A',
+    FIRSTROW = 2,
+    TABLOCK
+    );
+GO
+
+--  Vues de reporting (tableaux de bord, diagrammes circulaires, comparaison IDH)
+CREATE OR ALTER VIEW v_population_mondiale AS
+SELECT year, population FROM population_cube WHERE dimension = 'world';
+GO
+CREATE OR ALTER VIEW v_population_par_continent AS
+SELECT member AS continent, year, population FROM population_cube WHERE dimension = 'continent';
+GO
+CREATE OR ALTER VIEW v_population_par_idh AS
+SELECT member AS idh_group, year, population FROM population_cube WHERE dimension = 'idh_group';
+GO
+-- Croissance par pays : classement des plus fortes croissances sans recalcul, par exemple
+-- SELECT TOP 10 * FROM v_croissance_pays WHERE year = 2023 ORDER BY cagr_10 DESC;
+CREATE OR ALTER VIEW v_croissance_pays AS
+SELECT c.country_code, c.name_fr, f.year, f.population, f.yoy_growth, f.cagr_5, f.cagr_10
+FROM population_data f JOIN dim_country c ON c.country_key = f.country_key;
+GO
+-- Séries observées puis estimées : une année observée l'emporte sur son estimation
+-- (après l'ingestion de 2024, la projection de 2024 n'est plus lue).
+CREATE OR ALTER VIEW v_population_avec_projections AS
+SELECT c.country_code, f.year, f.population, CAST(0 AS BIT) AS is_estimate
+FROM population_data f JOIN dim_country c ON c.country_key = f.country_key
+UNION ALL
+SELECT c.country_code, p.year, p.population, p.is_estimate
+FROM population_projection p JOIN dim_country c ON c.country_key = p.country_key
+WHERE NOT EXISTS (SELECT 1 FROM population_data f WHERE f.country_key = p.country_key AND f.year = p.year);
+GO
 -- ============================================
 --  OPTIMISATION DES REQUÊTES
 -- ============================================
 
 -- Index pour améliorer la rapidité des requêtes
-IF NOT EXISTS (SELECT name FROM sys.indexes WHERE name = 'idx_population_country_year')
-CREATE INDEX idx_population_country_year ON population_data (country_code, year);
-IF NOT EXISTS (SELECT name FROM sys.indexes WHERE name = 'idx_population_year')
+IF NOT EXISTS (SELECT name FROM sys.indexes WHERE name = 'idx_population_country_year' AND object_id = OBJECT_ID('population_data'))
+CREATE INDEX idx_population_country_year ON population_data (country_key, year);
+IF NOT EXISTS (SELECT name FROM sys.indexes WHERE name = 'idx_population_year' AND object_id = OBJECT_ID('population_data'))
 CREATE INDEX idx_population_year ON population_data (year);
 GO
 
@@ -612,7 +770,13 @@ IF NOT EXISTS (SELECT name FROM sys.database_principals WHERE name = 'Data_Reade
     CREATE ROLE Data_Reader;
 GRANT SELECT ON population_data TO Data_Reader;
 GRANT SELECT ON dim_country TO Data_Reader;
+GRANT SELECT ON dim_country_history TO Data_Reader;
 GRANT SELECT ON dim_year TO Data_Reader;
+GRANT SELECT ON dim_country_border TO Data_Reader;
+GRANT SELECT ON population_cube TO Data_Reader;
+GRANT SELECT ON v_croissance_pays TO Data_Reader;
+GRANT SELECT ON population_projection TO Data_Reader;
+GRANT SELECT ON v_population_avec_projections TO Data_Reader;
 ALTER ROLE Data_Reader ADD MEMBER etl_reader;
 
 -- ============================================
@@ -620,21 +784,34 @@ ALTER ROLE Data_Reader ADD MEMBER etl_reader;
 -- ============================================
 
 -- Création d'un job pour l'importation annuelle
--- Vérification du fichier avant BULK INSERT
+-- population_mondiale_<année>.csv est au format large (une colonne par année) :
+-- python -m etl_population ingest C:\data\population_mondiale_<année>.csv en extrait la
+-- partition de l'année (staging_population_data_<année>.csv, une ligne par pays)
+-- et complète le cube, sans recharger les années précédentes (etl_population/annual.py).
+-- Aucune année n'est écrite dans le job : il part de la dernière année de population_data
+-- et charge, dans l'ordre, chaque partition présente pour les années suivantes
+-- (plusieurs si des exécutions ont été manquées) ; une année déjà chargée n'est pas relue.
 IF OBJECT_ID('tempdb..#TempFileCheck') IS NOT NULL DROP TABLE #TempFileCheck;
 CREATE TABLE #TempFileCheck (FileExists INT, IsDirectory INT, ParentDirectoryExists INT);
-INSERT INTO #TempFileCheck EXEC xp_fileexist 'C:\data\population_mondiale_2024.csv';
-IF EXISTS (SELECT * FROM #TempFileCheck WHERE FileExists = 1)
+DECLARE @year INT = (SELECT ISNULL(MAX(year), 1959) FROM population_data) + 1;
+DECLARE @file NVARCHAR(260), @sql NVARCHAR(MAX);
+WHILE 1 = 1
 BEGIN
-    -- Vérification avant d'exécuter BULK INSERT
-    PRINT 'Importation des données en cours...';
-        BULK INSERT population_data
-    FROM 'C:\data\population_mondiale_2024.csv'
-    WITH (
-    FIELDTERMINATOR = ';',
-    ROWTERMINATOR = '0x0D0A',
-    FIRSTROW = 2
-    );
+    -- Vérification du fichier avant BULK INSERT
+    SET @file = CONCAT(N'C:\data\staging_population_data_', @year, N'.csv');
+    DELETE FROM #TempFileCheck;
+    INSERT INTO #TempFileCheck EXEC xp_fileexist @file;
+    IF NOT EXISTS (SELECT * FROM #TempFileCheck WHERE FileExists = 1)
+        BREAK;
+    PRINT CONCAT(N'Importation des données ', @year, N' en cours...');
+    IF NOT EXISTS (SELECT 1 FROM dim_year WHERE year = @year)
+        INSERT INTO dim_year (year) VALUES (@year);
+    -- BULK INSERT n'accepte qu'un chemin littéral : instruction construite pour l'année trouvée
+    SET @sql = REPLACE(N'BULK INSERT population_data FROM ''{file}'' WITH ('
+                     + N'DATAFILETYPE = ''char'', FIELDTERMINATOR = '';'', ROWTERMINATOR = ''0x0D0A'', '
+                     + N'FIRSTROW = 2, TABLOCK);', N'{file}', @file);
+    EXEC sp_executesql @sql;
+    SET @year += 1;
 END
 
 -- Mise à jour des statistiques pour optimiser les performances
@@ -643,3 +820,8 @@ ALTER INDEX ALL ON population_data REBUILD;
 
 '''
 
+# Exécution complète (équivalent de python -m etl_population all)
+if __name__ == "__main__":
+    from etl_population.cli import main
+
+    raise SystemExit(main(["all"]))
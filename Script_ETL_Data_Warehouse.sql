@@ -12,51 +12,116 @@
 -- 1️⃣ CRÉATION DES TABLES (Data Warehouse)
 -- ============================================
 
--- 📌 Table des pays (Dimension)
+-- 📌 Migration vers les clés de substitution (etl_population/dimensions.py)
+-- L'ancien population_data était clé par country_code et recopiait six indicateurs
+-- régionaux sur chaque ligne. Ses tables sont conservées sous le suffixe _v1 ; les tables
+-- reconstruites à chaque chargement sont supprimées, puis recréées ci-dessous.
+IF EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'country_code')
+BEGIN
+    DROP TABLE IF EXISTS population_cube, dim_country_border, population_projection;
+    EXEC sp_rename 'population_data', 'population_data_v1';
+    EXEC sp_rename 'dim_country', 'dim_country_v1';
+    EXEC sp_rename 'dim_year', 'dim_year_v1';
+END
+-- population_projection est remplacée à chaque exécution : clé encore par country_code, elle est
+-- supprimée puis recréée par country_key ci-dessous
+IF EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_projection' AND COLUMN_NAME = 'country_code')
+    DROP TABLE population_projection;
+
+-- 📌 Table des pays (Dimension) : version courante de chaque pays
+-- country_key est une clé de substitution compacte, attribuée une fois pour toutes à un
+-- country_code ; les attributs (et les indicateurs régionaux) ne sont plus recopiés dans les faits.
 IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='dim_country' AND xtype='U')
 CREATE TABLE dim_country (
-    country_code VARCHAR(10) PRIMARY KEY,
+    country_key SMALLINT PRIMARY KEY,
+    country_code VARCHAR(10) NOT NULL UNIQUE,
+    name_en VARCHAR(255),
+    name_fr VARCHAR(255),
+    borders NVARCHAR(MAX),
+    idh_group VARCHAR(255),
+    sub_saharan_africa BIT,
+    europe_central_asia BIT,
+    east_asia_pacific BIT,
+    north_america BIT,
+    latin_america_caribbean BIT,
+    asia_oceania BIT
+);
+
+-- 📌 Historique des versions de dim_country (dimension à évolution lente de type 2)
+-- Un changement de nom, de borders, d'idh_group ou d'indicateur régional ferme la version
+-- courante (valid_to) et en ouvre une nouvelle sous la même country_key.
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='dim_country_history' AND xtype='U')
+CREATE TABLE dim_country_history (
+    country_key SMALLINT,
+    version SMALLINT,
+    country_code VARCHAR(10) NOT NULL,
     name_en VARCHAR(255),
     name_fr VARCHAR(255),
-    borders NVARCHAR(MAX)
+    borders NVARCHAR(MAX),
+    idh_group VARCHAR(255),
+    sub_saharan_africa BIT,
+    europe_central_asia BIT,
+    east_asia_pacific BIT,
+    north_america BIT,
+    latin_america_caribbean BIT,
+    asia_oceania BIT,
+    valid_from DATE NOT NULL,
+    valid_to DATE,
+    is_current BIT NOT NULL,
+    PRIMARY KEY (country_key, version),
+    FOREIGN KEY (country_key) REFERENCES dim_country(country_key)
 );
 
 -- 📌 Table des années (Dimension)
 IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='dim_year' AND xtype='U')
 CREATE TABLE dim_year (
-    year INT PRIMARY KEY
+    year SMALLINT PRIMARY KEY
 );
 
 -- 📌 Table principale (Faits : population par pays et année)
+-- Clés entières uniquement : les attributs du pays se lisent par jointure sur dim_country.
 IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='population_data' AND xtype='U')
 CREATE TABLE population_data (
-    country_code VARCHAR(10),
-    year INT,
-    sub_saharan_africa BIT,
-    europe_central_asia BIT,
-    east_asia_pacific BIT,
-    north_america BIT,
-    latin_america_caribbean BIT,
-    asia_oceania BIT,
+    country_key SMALLINT,
+    year SMALLINT,
     population FLOAT,
-    PRIMARY KEY (country_code, year),
-    FOREIGN KEY (country_code) REFERENCES dim_country(country_code),
+    -- Mesures dérivées (etl_population/measures.py) : NULL tant que l'historique ne suffit pas
+    yoy_change FLOAT,         -- population - population de l'année précédente
+    yoy_growth FLOAT,         -- variation relative sur un an
+    acceleration FLOAT,       -- variation de yoy_change
+    rolling_mean_5 FLOAT,     -- moyenne des 5 dernières années
+    cagr_5 FLOAT,             -- taux de croissance annuel moyen sur 5 ans
+    cagr_10 FLOAT,            -- taux de croissance annuel moyen sur 10 ans
+    PRIMARY KEY (country_key, year),
+    FOREIGN KEY (country_key) REFERENCES dim_country(country_key),
     FOREIGN KEY (year) REFERENCES dim_year(year)
 );
 
+-- 📌 Table pont des frontières (produite par etl_population/borders.py)
+-- Une ligne par couple de pays voisins, dans les deux sens : les requêtes de voisinage
+-- joignent cette table au lieu de redécouper la chaîne borders de dim_country.
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='dim_country_border' AND xtype='U')
+CREATE TABLE dim_country_border (
+    country_code VARCHAR(10),
+    border_code VARCHAR(10),
+    PRIMARY KEY (country_code, border_code),
+    FOREIGN KEY (country_code) REFERENCES dim_country(country_code),
+    FOREIGN KEY (border_code) REFERENCES dim_country(country_code)
+);
+
 -- 📌 Vérification et ajout des colonnes manquantes
-IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'sub_saharan_africa')
-ALTER TABLE population_data ADD sub_saharan_africa BIT;
-IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'europe_central_asia')
-ALTER TABLE population_data ADD europe_central_asia BIT;
-IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'east_asia_pacific')
-ALTER TABLE population_data ADD east_asia_pacific BIT;
-IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'north_america')
-ALTER TABLE population_data ADD north_america BIT;
-IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'latin_america_caribbean')
-ALTER TABLE population_data ADD latin_america_caribbean BIT;
-IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'asia_oceania')
-ALTER TABLE population_data ADD asia_oceania BIT;
+IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'yoy_change')
+ALTER TABLE population_data ADD yoy_change FLOAT;
+IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'yoy_growth')
+ALTER TABLE population_data ADD yoy_growth FLOAT;
+IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'acceleration')
+ALTER TABLE population_data ADD acceleration FLOAT;
+IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'rolling_mean_5')
+ALTER TABLE population_data ADD rolling_mean_5 FLOAT;
+IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'cagr_5')
+ALTER TABLE population_data ADD cagr_5 FLOAT;
+IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = 'population_data' AND COLUMN_NAME = 'cagr_10')
+ALTER TABLE population_data ADD cagr_10 FLOAT;
 
 -- ============================================
 -- 2️⃣ INSERTION DES DONNÉES
@@ -78,22 +143,145 @@ WHERE NOT EXISTS (
 );
 
 -- 📌 BULK INSERT : Importation des données population
-BULK INSERT population_data
-FROM 'C:\data\population_mondiale_cleaned.csv'
+-- Les fichiers de staging sont produits par etl_population/unpivot.py (write_staging) :
+-- population_mondiale_cleaned.csv est au format large (64 colonnes d'années),
+-- staging_population_data.csv contient une ligne par (country_key, year),
+-- exactement dans l'ordre des colonnes de population_data.
+BULK INSERT dim_country
+FROM 'C:\data\staging_dim_country.csv'
 WITH (
     DATAFILETYPE = 'char',
+    CODEPAGE = '65001',
     FIELDTERMINATOR = ';',
     ROWTERMINATOR = '0x0D0A',
     FIRSTROW = 2
     );
+
+-- L'historique complet est réécrit à chaque chargement (tenu par etl_population/dimensions.py)
+TRUNCATE TABLE dim_country_history;
+BULK INSERT dim_country_history
+FROM 'C:\data\staging_dim_country_history.csv'
+WITH (
+    DATAFILETYPE = 'char',
+    CODEPAGE = '65001',
+    FIELDTERMINATOR = ';',
+    ROWTERMINATOR = '0x0D0A',
+    FIRSTROW = 2,
+    TABLOCK
+    );
+
+BULK INSERT population_data
+FROM 'C:\data\staging_population_data.csv'
+WITH (
+    DATAFILETYPE = 'char',
+    FIELDTERMINATOR = ';',
+    ROWTERMINATOR = '0x0D0A',
+    FIRSTROW = 2,
+    TABLOCK
+    );
+
+TRUNCATE TABLE dim_country_border;
+BULK INSERT dim_country_border
+FROM 'C:\data\staging_dim_country_border.csv'
+WITH (
+    DATAFILETYPE = 'char',
+    FIELDTERMINATOR = ';',
+    ROWTERMINATOR = '0x0D0A',
+    FIRSTROW = 2,
+    TABLOCK
+    );
+-- 📌 Cube d'agrégats pré-calculés (produit par etl_population/cube.py)
+-- Population par année pour : world, chaque continent, chaque indicateur (g7, g20, ue27,
+-- oecd_members, ...) et chaque idh_group. Les graphiques et rapports lisent ces agrégats.
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='population_cube' AND xtype='U')
+CREATE TABLE population_cube (
+    dimension VARCHAR(32),
+    member NVARCHAR(255),
+    year SMALLINT,
+    population FLOAT,
+    countries INT,
+    PRIMARY KEY (dimension, member, year),
+    FOREIGN KEY (year) REFERENCES dim_year(year)
+);
+
+TRUNCATE TABLE population_cube;
+BULK INSERT population_cube
+FROM 'C:\data\staging_population_cube.csv'
+WITH (
+    DATAFILETYPE = 'char',
+    CODEPAGE = '65001',
+    FIELDTERMINATOR = ';',
+    ROWTERMINATOR = '0x0D0A',
+    FIRSTROW = 2,
+    TABLOCK
+    );
+
+-- 📌 Projections 2024-2030 (produites par python -m etl_population project, etl_population/projection.py)
+-- Tendance linéaire ou log-linéaire ajustée sur les dernières années de chaque pays.
+-- Partition séparée de population_data : ce sont des estimations (is_estimate = 1),
+-- remplacées en entier à chaque exécution : ici par TRUNCATE + BULK INSERT ; par
+-- `project`, par upsert des estimations puis suppression des clés (country_key, year)
+-- qui ne sont plus projetées (horizon raccourci, autre fenêtre ou autre modèle).
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='population_projection' AND xtype='U')
+CREATE TABLE population_projection (
+    country_key SMALLINT,       -- même clé que population_data (jointure sur dim_country)
+    year SMALLINT,              -- hors dim_year : années futures
+    population FLOAT,
+    is_estimate BIT NOT NULL DEFAULT 1,
+    model VARCHAR(20),          -- linear ou log_linear
+    base_year SMALLINT,         -- dernière année observée
+    fit_window INT,             -- années d'historique de l'ajustement
+    fit_rmse FLOAT,             -- écart quadratique moyen de l'ajustement
+    PRIMARY KEY (country_key, year),
+    FOREIGN KEY (country_key) REFERENCES dim_country(country_key)
+);
+
+TRUNCATE TABLE population_projection;
+BULK INSERT population_projection
+FROM 'C:\data\staging_population_projection.csv'
+WITH (
+    DATAFILETYPE = 'char',
+    FIELDTERMINATOR = ';',
+    ROWTERMINATOR = '0x0D0A',
+    FIRSTROW = 2,
+    TABLOCK
+    );
+GO
+
+-- 📌 Vues de reporting (tableaux de bord, diagrammes circulaires, comparaison IDH)
+CREATE OR ALTER VIEW v_population_mondiale AS
+SELECT year, population FROM population_cube WHERE dimension = 'world';
+GO
+CREATE OR ALTER VIEW v_population_par_continent AS
+SELECT member AS continent, year, population FROM population_cube WHERE dimension = 'continent';
+GO
+CREATE OR ALTER VIEW v_population_par_idh AS
+SELECT member AS idh_group, year, population FROM population_cube WHERE dimension = 'idh_group';
+GO
+-- Croissance par pays : classement des plus fortes croissances sans recalcul, par exemple
+-- SELECT TOP 10 * FROM v_croissance_pays WHERE year = 2023 ORDER BY cagr_10 DESC;
+CREATE OR ALTER VIEW v_croissance_pays AS
+SELECT c.country_code, c.name_fr, f.year, f.population, f.yoy_growth, f.cagr_5, f.cagr_10
+FROM population_data f JOIN dim_country c ON c.country_key = f.country_key;
+GO
+-- Séries observées puis estimées : une année observée l'emporte sur son estimation
+-- (après l'ingestion de 2024, la projection de 2024 n'est plus lue).
+CREATE OR ALTER VIEW v_population_avec_projections AS
+SELECT c.country_code, f.year, f.population, CAST(0 AS BIT) AS is_estimate
+FROM population_data f JOIN dim_country c ON c.country_key = f.country_key
+UNION ALL
+SELECT c.country_code, p.year, p.population, p.is_estimate
+FROM population_projection p JOIN dim_country c ON c.country_key = p.country_key
+WHERE NOT EXISTS (SELECT 1 FROM population_data f WHERE f.country_key = p.country_key AND f.year = p.year);
+GO
 -- ============================================
 -- 3️⃣ OPTIMISATION DES REQUÊTES
 -- ============================================
 
 -- 📌 Index pour améliorer la rapidité des requêtes
-IF NOT EXISTS (SELECT name FROM sys.indexes WHERE name = 'idx_population_country_year')
-CREATE INDEX idx_population_country_year ON population_data (country_code, year);
-IF NOT EXISTS (SELECT name FROM sys.indexes WHERE name = 'idx_population_year')
+IF NOT EXISTS (SELECT name FROM sys.indexes WHERE name = 'idx_population_country_year' AND object_id = OBJECT_ID('population_data'))
+CREATE INDEX idx_population_country_year ON population_data (country_key, year);
+IF NOT EXISTS (SELECT name FROM sys.indexes WHERE name = 'idx_population_year' AND object_id = OBJECT_ID('population_data'))
 CREATE INDEX idx_population_year ON population_data (year);
 GO
 
@@ -112,7 +300,13 @@ IF NOT EXISTS (SELECT name FROM sys.database_principals WHERE name = 'Data_Reade
     CREATE ROLE Data_Reader;
 GRANT SELECT ON population_data TO Data_Reader;
 GRANT SELECT ON dim_country TO Data_Reader;
+GRANT SELECT ON dim_country_history TO Data_Reader;
 GRANT SELECT ON dim_year TO Data_Reader;
+GRANT SELECT ON dim_country_border TO Data_Reader;
+GRANT SELECT ON population_cube TO Data_Reader;
+GRANT SELECT ON v_croissance_pays TO Data_Reader;
+GRANT SELECT ON population_projection TO Data_Reader;
+GRANT SELECT ON v_population_avec_projections TO Data_Reader;
 ALTER ROLE Data_Reader ADD MEMBER etl_reader;
 
 -- ============================================
@@ -120,21 +314,34 @@ ALTER ROLE Data_Reader ADD MEMBER etl_reader;
 -- ============================================
 
 -- 📌 Création d'un job pour l'importation annuelle
--- Vérification du fichier avant BULK INSERT
+-- population_mondiale_<année>.csv est au format large (une colonne par année) :
+-- python -m etl_population ingest C:\data\population_mondiale_<année>.csv en extrait la
+-- partition de l'année (staging_population_data_<année>.csv, une ligne par pays)
+-- et complète le cube, sans recharger les années précédentes (etl_population/annual.py).
+-- Aucune année n'est écrite dans le job : il part de la dernière année de population_data
+-- et charge, dans l'ordre, chaque partition présente pour les années suivantes
+-- (plusieurs si des exécutions ont été manquées) ; une année déjà chargée n'est pas relue.
 IF OBJECT_ID('tempdb..#TempFileCheck') IS NOT NULL DROP TABLE #TempFileCheck;
 CREATE TABLE #TempFileCheck (FileExists INT, IsDirectory INT, ParentDirectoryExists INT);
-INSERT INTO #TempFileCheck EXEC xp_fileexist 'C:\data\population_mondiale_2024.csv';
-IF EXISTS (SELECT * FROM #TempFileCheck WHERE FileExists = 1)
+DECLARE @year INT = (SELECT ISNULL(MAX(year), 1959) FROM population_data) + 1;
+DECLARE @file NVARCHAR(260), @sql NVARCHAR(MAX);
+WHILE 1 = 1
 BEGIN
-    -- Vérification avant d'exécuter BULK INSERT
-    PRINT 'Importation des données en cours...';
-        BULK INSERT population_data
-    FROM 'C:\data\population_mondiale_2024.csv'
-    WITH (
-    FIELDTERMINATOR = ';',
-    ROWTERMINATOR = '0x0D0A',
-    FIRSTROW = 2
-    );
+    -- Vérification du fichier avant BULK INSERT
+    SET @file = CONCAT(N'C:\data\staging_population_data_', @year, N'.csv');
+    DELETE FROM #TempFileCheck;
+    INSERT INTO #TempFileCheck EXEC xp_fileexist @file;
+    IF NOT EXISTS (SELECT * FROM #TempFileCheck WHERE FileExists = 1)
+        BREAK;
+    PRINT CONCAT(N'Importation des données ', @year, N' en cours...');
+    IF NOT EXISTS (SELECT 1 FROM dim_year WHERE year = @year)
+        INSERT INTO dim_year (year) VALUES (@year);
+    -- BULK INSERT n'accepte qu'un chemin littéral : instruction construite pour l'année trouvée
+    SET @sql = REPLACE(N'BULK INSERT population_data FROM ''{file}'' WITH ('
+                     + N'DATAFILETYPE = ''char'', FIELDTERMINATOR = '';'', ROWTERMINATOR = ''0x0D0A'', '
+                     + N'FIRSTROW = 2, TABLOCK);', N'{file}', @file);
+    EXEC sp_executesql @sql;
+    SET @year += 1;
 END
 
 -- Mise à jour des statistiques pour optimiser les performances
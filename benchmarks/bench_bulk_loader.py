@@ -0,0 +1,84 @@
+"""
+Benchmark : insertion ligne par ligne (iterrows + execute) vs BulkLoader par lots.
+
+Les mesures sont faites sur la base de substitution SQLite (fichier temporaire),
+sans SQL Server. Les lignes du fichier nettoyé sont répliquées pour atteindre --rows.
+
+Usage :
+    python benchmarks/bench_bulk_loader.py --rows 50000 --batch-sizes 100 1000 10000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from etl_population.bulk_loader import (  # noqa: E402
+    BulkLoader,
+    connect_standin,
+    create_table,
+    insert_statement,
+    row_count,
+)
+from etl_population.schema import ATTRIBUTE_COLUMNS, YEAR_COLUMNS, sql_column_definitions  # noqa: E402
+from etl_population.streaming import read_population_chunks  # noqa: E402
+
+DEFAULT_SOURCE = os.path.join(os.path.dirname(__file__), "..", "population_mondiale_cleaned.csv")
+TABLE = "population_mondiale_1960_2023"
+COLUMNS = ATTRIBUTE_COLUMNS + YEAR_COLUMNS
+
+
+def fresh_database(directory, name):
+    conn = connect_standin(os.path.join(directory, f"{name}.db"))
+    create_table(conn, TABLE, sql_column_definitions(dialect="sqlite"))
+    return conn
+
+
+def row_by_row(conn, df):
+    # Reproduction de la boucle du script d'origine (un commit final)
+    cursor = conn.cursor()
+    statement = insert_statement(TABLE, COLUMNS)
+    for index, row in df.iterrows():
+        try:
+            cursor.execute(statement, tuple(None if pd.isna(v) else v for v in row))
+        except Exception as e:
+            print(f"Erreur ligne {index} : {e}")
+    conn.commit()
+    cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--source", default=DEFAULT_SOURCE)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+
+    df = pd.concat(read_population_chunks(args.source, year_dtype="float64"), ignore_index=True)
+    df = df.sample(n=args.rows, replace=True, random_state=0).reset_index(drop=True)[COLUMNS]
+    print(f"{len(df)} lignes x {len(COLUMNS)} colonnes")
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = fresh_database(directory, "row_by_row")
+        start = time.perf_counter()
+        row_by_row(conn, df)
+        baseline = time.perf_counter() - start
+        print(f"iterrows + execute       : {baseline:8.3f} s  ({len(df) / baseline:10,.0f} lignes/s)")
+        conn.close()
+
+        for batch_size in args.batch_sizes:
+            conn = fresh_database(directory, f"batch_{batch_size}")
+            report = BulkLoader(conn, TABLE, COLUMNS, batch_size=batch_size).load(df)
+            assert row_count(conn, TABLE) == len(df), report.errors
+            print(f"BulkLoader lots de {batch_size:<6}: {report.elapsed:8.3f} s  "
+                  f"({report.rows_per_second:10,.0f} lignes/s, x{baseline / report.elapsed:.1f})")
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark : traitement en un seul processus vs exécution répartie (sharding).
+
+Le même fichier synthétique passe par les deux chemins :
+
+    un processus  -> clean_chunks, validate, unpivot, build_cube
+    réparti       -> run_sharded (une partie par processus, données en mémoire partagée)
+
+pour chaque nombre de parties demandé. Les sorties sont comparées au bit près
+(jeu nettoyé, violations, faits, cube) ; le débit est donné en pays par seconde,
+avec l'accélération par rapport au chemin en un seul processus.
+La lecture du CSV, commune aux deux chemins, n'est pas chronométrée.
+
+Usage :
+    python benchmarks/bench_sharding.py --entities 100000 --shards 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from etl_population.cube import build_cube  # noqa: E402
+from etl_population.sharding import run_sharded  # noqa: E402
+from etl_population.streaming import clean_chunks, read_population_chunks  # noqa: E402
+from etl_population.unpivot import fact_frame, unpivot  # noqa: E402
+from etl_population.validation import validate  # noqa: E402
+
+from synthetic import generate  # noqa: E402
+
+
+def single_process(chunks, strategy):
+    df = pd.concat(clean_chunks(chunks, strategy=strategy), ignore_index=True)
+    years = [col for col in df.columns if col.isdigit()]
+    return df, validate(df, years), unpivot(df, years), build_cube(df, years)
+
+
+def assert_identical(reference, result):
+    df, report, fact, cube = reference
+    years = [col for col in df.columns if col.isdigit()]
+    pd.testing.assert_frame_equal(result.cleaned, df, check_exact=True)
+    pd.testing.assert_frame_equal(result.report.violations, report.violations, check_exact=True)
+    keys = np.arange(1, len(df) + 1, dtype=fact["country_key"].dtype)
+    pd.testing.assert_frame_equal(fact_frame(keys, years, result.matrices), fact, check_exact=True)
+    pd.testing.assert_frame_equal(result.cube, cube, check_exact=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entities", type=int, default=100_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--strategy", default="row_mean")
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = generate(os.path.join(directory, "synthetic.csv"), args.entities)
+        chunks = list(read_population_chunks(source, chunksize=args.chunksize, year_dtype="float64"))
+
+        start = time.perf_counter()
+        reference = single_process([chunk.copy() for chunk in chunks], args.strategy)
+        baseline = time.perf_counter() - start
+        print(f"{args.entities} pays, {os.cpu_count()} cœur(s)")
+        print(f"{'un processus':<16} {baseline:8.2f} s {args.entities / baseline:12,.0f} pays/s")
+
+        for shards in args.shards:
+            start = time.perf_counter()
+            result = run_sharded([chunk.copy() for chunk in chunks], strategy=args.strategy, shards=shards,
+                                 max_workers=shards)
+            elapsed = time.perf_counter() - start
+            assert_identical(reference, result)
+            print(f"{f'{shards} partie(s)':<16} {elapsed:8.2f} s {args.entities / elapsed:12,.0f} pays/s "
+                  f"x{baseline / elapsed:5.2f}  (sorties identiques)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark : table de faits clée par country_code (ancien schéma) vs clés de substitution.
+
+L'ancien population_data répétait country_code (VARCHAR(10)) et six indicateurs
+BIT sur chaque ligne (pays, année) ; le nouveau ne garde que country_key et
+year (SMALLINT), la population et les mesures. Pour chaque disposition on mesure
+la mémoire du DataFrame, la taille du fichier de staging, le temps de chargement
+dans la base de substitution SQLite et la taille de la base obtenue.
+--no-measures compare les seules colonnes de clés, d'attributs et de population.
+
+Usage :
+    python benchmarks/bench_surrogate_keys.py --entities 10000
+    python benchmarks/bench_surrogate_keys.py --entities 10000 --no-measures
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from etl_population.bulk_loader import BulkLoader, connect_standin, create_table  # noqa: E402
+from etl_population.imputation import impute_years  # noqa: E402
+from etl_population.schema import FACT_MEASURE_COLUMNS, REGION_FLAG_COLUMNS, SEPARATOR  # noqa: E402
+from etl_population.streaming import read_population_chunks  # noqa: E402
+from etl_population.unpivot import star_schema  # noqa: E402
+
+from synthetic import generate  # noqa: E402
+
+
+def legacy_ddl(measures):
+    return (["[country_code] VARCHAR(10)", "[year] INT"] + [f"[{flag}] BIT" for flag in REGION_FLAG_COLUMNS]
+            + ["[population] FLOAT"] + [f"[{col}] FLOAT" for col in measures]
+            + ["PRIMARY KEY (country_code, year)"])
+
+
+def surrogate_ddl(measures):
+    return (["[country_key] SMALLINT", "[year] SMALLINT", "[population] FLOAT"]
+            + [f"[{col}] FLOAT" for col in measures] + ["PRIMARY KEY (country_key, year)"])
+
+
+def legacy_fact(fact, dim, measures):
+    """Faits au format de l'ancien schéma : attributs du pays recopiés sur chaque ligne."""
+    attributes = dim.set_index("country_key")[["country_code"] + REGION_FLAG_COLUMNS]
+    legacy = attributes.reindex(fact["country_key"].to_numpy()).reset_index(drop=True)
+    legacy.insert(1, "year", fact["year"].to_numpy(dtype=np.int64))
+    return pd.concat([legacy, fact[["population"] + measures]], axis=1)
+
+
+def measure_layout(name, fact, ddl, directory, batch_size):
+    staging = os.path.join(directory, f"{name}.csv")
+    fact.to_csv(staging, sep=SEPARATOR, index=False, lineterminator="\r\n")
+    db_path = os.path.join(directory, f"{name}.db")
+    conn = connect_standin(db_path)
+    try:
+        create_table(conn, "population_data", ddl)
+        start = time.perf_counter()
+        report = BulkLoader(conn, "population_data", list(fact.columns), batch_size=batch_size).load(fact)
+        elapsed = time.perf_counter() - start
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    assert not report.errors, report.errors
+    return {
+        "memory": int(fact.memory_usage(deep=True).sum()),
+        "staging": os.path.getsize(staging),
+        "database": os.path.getsize(db_path),
+        "load": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entities", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--no-measures", action="store_true", help="sans les colonnes de mesures dérivées")
+    args = parser.parse_args()
+    measures = [] if args.no_measures else FACT_MEASURE_COLUMNS
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = generate(os.path.join(directory, "synthetic.csv"), args.entities)
+        df = pd.concat(read_population_chunks(source, year_dtype="float64"), ignore_index=True)
+        years = [col for col in df.columns if col.isdigit()]
+        df = impute_years(df, years)
+
+        star = star_schema(df, years)
+        fact = star["population_data"][["country_key", "year", "population"] + measures]
+        layouts = {
+            "country_code": measure_layout("legacy", legacy_fact(fact, star["dim_country"], measures),
+                                           legacy_ddl(measures), directory, args.batch_size),
+            "country_key": measure_layout("surrogate", fact, surrogate_ddl(measures), directory, args.batch_size),
+        }
+
+    print(f"{len(fact)} lignes de faits ({args.entities} entités x {len(years)} années)")
+    old, new = layouts["country_code"], layouts["country_key"]
+    for label, key, unit in [("mémoire DataFrame", "memory", 2**20), ("fichier de staging", "staging", 2**20),
+                             ("base SQLite", "database", 2**20), ("chargement", "load", 1)]:
+        suffix = "s  " if key == "load" else "Mio"
+        print(f"{label:<20} {old[key] / unit:10.2f} {suffix} -> {new[key] / unit:10.2f} {suffix} "
+              f"({1 - new[key] / old[key]:6.1%} de moins)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Suite de benchmarks des étapes ETL sur des données synthétiques.
+
+Pour chaque taille demandée, un fichier est généré (benchmarks/synthetic.py)
+puis chaque étape est chronométrée et son pic mémoire mesuré (tracemalloc) :
+lecture, statistiques EDA, imputation, export, dépivotage, chargement dans la
+base de substitution SQLite, répartition par continent, cube d'agrégats,
+index de classement, index des frontières, contrôle d'intégrité et projection
+de tendance (ajustement de tous les pays, puis estimations jusqu'à 2030).
+
+Les résultats sont écrits en JSON (un fichier par exécution, avec le commit
+git) et peuvent être comparés à une exécution précédente avec --baseline.
+
+Usage :
+    python benchmarks/run_suite.py --entities 10000 100000 1000000 --output benchmarks/results
+    python benchmarks/run_suite.py --entities 10000 --baseline benchmarks/results/<ancien>.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from etl_population.borders import BorderIndex  # noqa: E402
+from etl_population.bulk_loader import BulkLoader, connect_standin, create_table  # noqa: E402
+from etl_population.continents import split_by_region  # noqa: E402
+from etl_population.cube import build_cube  # noqa: E402
+from etl_population.imputation import impute_years  # noqa: E402
+from etl_population.projection import DEFAULT_HORIZON, fit_trends, projection_years  # noqa: E402
+from etl_population.ranking import RankingIndex  # noqa: E402
+from etl_population.schema import FACT_COLUMNS, FACT_MEASURE_COLUMNS  # noqa: E402
+from etl_population.streaming import (  # noqa: E402
+    clean_chunks,
+    profile_chunks,
+    read_population_chunks,
+    write_chunks,
+)
+from etl_population.unpivot import unpivot  # noqa: E402
+from etl_population.validation import validate  # noqa: E402
+
+from synthetic import generate  # noqa: E402
+
+STAGES = ["read", "eda", "imputation", "export", "unpivot", "load", "continent_split", "aggregates",
+          "ranking", "borders", "validation", "projection_fit", "projection_score"]
+
+FACT_DDL = (["country_key SMALLINT", "year SMALLINT", "population FLOAT"]
+            + [f"{col} FLOAT" for col in FACT_MEASURE_COLUMNS])
+
+
+def measure(func, memory=True):
+    """Retourne (résultat, secondes, pic mémoire Python en octets ou None).
+
+    tracemalloc ralentit fortement le code Python : le temps est mesuré sur une première
+    exécution sans traçage, le pic mémoire sur une seconde exécution tracée.
+    """
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    if not memory:
+        return result, elapsed, None
+    del result
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def border_queries(df, years):
+    """Construction du CSR, population voisins compris pour toutes les années, composantes connexes."""
+    index = BorderIndex.from_frame(df)
+    return index.neighbour_population(df, years), index.connected_components()
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(entities, first_year, last_year, workdir, stages, chunksize, memory=True):
+    source = os.path.join(workdir, f"synthetic_{entities}.csv")
+    generate(source, entities, first_year, last_year)
+    years = [c for c in pd.read_csv(source, sep=";", nrows=0).columns if c.isdigit()]
+    state, results = {}, []
+
+    def load_fact():
+        db_path = os.path.join(workdir, f"standin_{entities}.db")
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        conn = connect_standin(db_path)
+        try:
+            create_table(conn, "population_data", FACT_DDL)
+            return BulkLoader(conn, "population_data", FACT_COLUMNS, batch_size=10_000).load(state["fact"])
+        finally:
+            conn.close()
+
+    steps = {
+        "read": lambda: pd.concat(read_population_chunks(source, chunksize, "float64"), ignore_index=True),
+        "eda": lambda: profile_chunks(read_population_chunks(source, chunksize)),
+        "imputation": lambda: impute_years(state["read"], years),
+        "export": lambda: write_chunks(clean_chunks(read_population_chunks(source, chunksize, "float64")),
+                                       os.path.join(workdir, "export.csv")),
+        "unpivot": lambda: unpivot(state["imputation"], years),
+        "load": load_fact,
+        "continent_split": lambda: split_by_region(state["imputation"]),
+        "aggregates": lambda: build_cube(state["imputation"], years),
+        "ranking": lambda: RankingIndex.from_frame(state["imputation"], years),
+        "borders": lambda: border_queries(state["imputation"], years),
+        "validation": lambda: validate(state["imputation"], years),
+        "projection_fit": lambda: fit_trends(state["imputation"][years].to_numpy(dtype=np.float64), years),
+        "projection_score": lambda: state["projection_fit"].project(projection_years(years[-1], DEFAULT_HORIZON)),
+    }
+    requires = {"imputation": "read", "unpivot": "imputation", "load": "unpivot",
+                "continent_split": "imputation", "aggregates": "imputation", "ranking": "imputation",
+                "borders": "imputation", "validation": "imputation", "projection_fit": "imputation",
+                "projection_score": "projection_fit"}
+
+    # Dépendances transitives (chaque étape requise précède l'étape qui la demande dans STAGES)
+    needed = set(stages)
+    for stage in reversed(STAGES):
+        if stage in needed and stage in requires:
+            needed.add(requires[stage])
+
+    for stage in STAGES:
+        if stage not in needed:
+            continue
+        result, seconds, peak = measure(steps[stage], memory)
+        state["fact" if stage == "unpivot" else stage] = result
+        if stage in stages:
+            results.append({"entities": entities, "years": len(years), "stage": stage,
+                            "seconds": round(seconds, 6), "peak_bytes": peak,
+                            "rows_per_second": round(entities / seconds, 1) if seconds else None})
+            mib = f"{peak / 2**20:9.1f} Mio" if peak is not None else ""
+            print(f"{entities:>9} entités  {stage:<16} {seconds:9.3f} s  {mib}")
+    os.remove(source)
+    return results
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    previous = {(r["entities"], r["stage"]): r for r in baseline["results"]}
+    print(f"\nComparaison avec {baseline_path} (commit {baseline['meta'].get('commit')}) :")
+    for r in results:
+        old = previous.get((r["entities"], r["stage"]))
+        if old and old["seconds"]:
+            line = f"{r['entities']:>9} entités  {r['stage']:<16} temps x{r['seconds'] / old['seconds']:5.2f}"
+            if r["peak_bytes"] and old.get("peak_bytes"):
+                line += f"  mémoire x{r['peak_bytes'] / old['peak_bytes']:5.2f}"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entities", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--first-year", type=int, default=1960)
+    parser.add_argument("--last-year", type=int, default=2023)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(__file__), "results"))
+    parser.add_argument("--baseline", help="fichier de résultats d'une exécution précédente")
+    parser.add_argument("--no-memory", action="store_true", help="ne pas mesurer le pic mémoire (une seule exécution par étape)")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for entities in args.entities:
+            results += run_size(entities, args.first_year, args.last_year, workdir, args.stages,
+                                args.chunksize, memory=not args.no_memory)
+
+    meta = {
+        "commit": git_commit(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "first_year": args.first_year,
+        "last_year": args.last_year,
+    }
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"bench_{meta['date'][:19].replace(':', '')}_{meta['commit'] or 'local'}.json")
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump({"meta": meta, "results": results}, handle, indent=2)
+    print(f"\nRésultats : {path}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
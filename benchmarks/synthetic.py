@@ -0,0 +1,85 @@
+"""
+Générateur de fichiers synthétiques au schéma de population_mondiale.csv.
+
+Mêmes 24 colonnes d'attributs, même séparateur ';', mêmes valeurs
+"True"/"False" et libellés idh_group ; le nombre d'entités (10k à 1M et
+plus) et la plage d'années (au-delà de 1960-2023) sont libres. Les pays
+réels servent de gabarits : chaque entité synthétique reprend les
+indicateurs d'un pays tiré au hasard et une trajectoire de croissance
+bruitée, avec une petite proportion de valeurs manquantes.
+
+Le fichier est écrit par blocs, la mémoire ne dépend pas du nombre d'entités.
+
+Usage :
+    python benchmarks/synthetic.py synthetic_100k.csv --entities 100000 --first-year 1900 --last-year 2050
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from etl_population.schema import ATTRIBUTE_COLUMNS, SEPARATOR  # noqa: E402
+
+DEFAULT_TEMPLATE = os.path.join(os.path.dirname(__file__), "..", "population_mondiale.csv")
+CHUNK_ENTITIES = 50_000
+
+
+def entity_codes(numbers):
+    """Codes uniques de la forme S0000001 (préfixe S pour ne pas heurter les codes ISO)."""
+    return np.char.add("S", np.char.zfill(np.asarray(numbers).astype(str), 7))
+
+
+def generate_chunk(template, start, count, years, rng, missing_rate):
+    picks = rng.integers(0, len(template), size=count)
+    chunk = template.iloc[picks][ATTRIBUTE_COLUMNS].reset_index(drop=True)
+    codes = entity_codes(np.arange(start, start + count))
+    chunk["country_code"] = codes
+    chunk["name_en"] = np.char.add("Synthetic ", codes)
+    chunk["name_fr"] = np.char.add("Synthétique ", codes)
+
+    # Frontières : trois autres entités synthétiques déjà générées ou du bloc courant
+    neighbours = entity_codes(rng.integers(0, start + count, size=(count, 3)))
+    borders = np.char.add(np.char.add(neighbours[:, 0], ","), neighbours[:, 1])
+    chunk["borders"] = np.char.add(np.char.add(borders, ","), neighbours[:, 2])
+
+    base = rng.lognormal(mean=14.0, sigma=2.0, size=(count, 1))
+    growth = rng.normal(1.015, 0.01, size=(count, len(years))).cumprod(axis=1)
+    block = np.round(base * growth)
+    block[rng.random(block.shape) < missing_rate] = np.nan
+    return pd.concat([chunk, pd.DataFrame(block, columns=[str(y) for y in years])], axis=1)
+
+
+def generate(path, entities, first_year=1960, last_year=2023, missing_rate=0.002, seed=0,
+             template_path=DEFAULT_TEMPLATE):
+    """Écrit `entities` lignes dans `path` et retourne le chemin."""
+    template = pd.read_csv(template_path, sep=SEPARATOR, dtype=str, keep_default_na=False)
+    years = range(first_year, last_year + 1)
+    rng = np.random.default_rng(seed)
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        for start in range(0, entities, CHUNK_ENTITIES):
+            count = min(CHUNK_ENTITIES, entities - start)
+            chunk = generate_chunk(template, start, count, years, rng, missing_rate)
+            chunk.to_csv(handle, sep=SEPARATOR, index=False, header=(start == 0))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path")
+    parser.add_argument("--entities", type=int, default=10_000)
+    parser.add_argument("--first-year", type=int, default=1960)
+    parser.add_argument("--last-year", type=int, default=2023)
+    parser.add_argument("--missing-rate", type=float, default=0.002)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    generate(args.path, args.entities, args.first_year, args.last_year, args.missing_rate, args.seed)
+    print(f"{args.entities} entités ({args.first_year}-{args.last_year}) écrites dans {args.path}")
+
+
+if __name__ == "__main__":
+    main()
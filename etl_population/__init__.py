@@ -0,0 +1,6 @@
+"""
+Étapes réutilisables du pipeline ETL de la population mondiale (1960-2023).
+
+Chaque module correspond à une étape du script ProjetFinalETLDWH_ABDOULAYESOW.py
+et peut être importé indépendamment.
+"""
@@ -0,0 +1,163 @@
+"""
+Ingestion annuelle : ajout d'une année sans recharger 1960-2023.
+
+Le job SQL Server Agent attend chaque année un fichier population_mondiale_2024.csv.
+Ce fichier contient country_code et une ou plusieurs colonnes d'années (séparateur
+';'), les autres colonnes sont ignorées. Les années nouvelles sont celles de son
+en-tête qui ne figurent pas encore dans la source ; les années déjà connues ne
+sont jamais réécrites (ingestion en ajout seul).
+
+    1. la source (population_mondiale.csv) reçoit les nouvelles colonnes, une fois
+       le jeu étendu validé (jusque-là il est écrit à part, voir cli.cmd_ingest) ;
+    2. population_data reçoit la partition des nouvelles années (pays x nouvelles années) ;
+    3. dim_year reçoit les nouvelles années ;
+    4. population_mondiale_1960_2023 reçoit la colonne (ALTER TABLE ADD) et ses valeurs ;
+    5. le cube d'agrégats est complété avec les seules nouvelles années.
+
+L'imputation d'un pays incomplet dépend de toutes ses années (moyenne de la ligne
+pour row_mean) : une nouvelle colonne modifie aussi ses années déjà chargées. Ces
+lignes révisées sont renvoyées avec la partition (delta du manifeste, load_years),
+l'entrepôt reste ainsi identique à un `load` complet. Le coût en base est celui
+d'une année de données plus l'historique des seuls pays incomplets. Après l'ajout,
+toutes les étapes lisent les années dans l'en-tête de la source (schema.read_year_columns).
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from etl_population.bulk_loader import DEFAULT_BATCH_SIZE, BulkLoader, add_columns
+from etl_population.cube import CUBE_FILE, build_cube, read_cube, write_cube
+from etl_population.delta_load import (
+    TABLE_KEYS,
+    append_partition,
+    diff_against_manifest,
+    incremental_load,
+    manifest_path,
+    read_manifest,
+)
+from etl_population.schema import SEPARATOR, read_year_columns, year_columns_of
+from etl_population.unpivot import dim_year, unpivot
+
+PARTITION_FILE = "staging_population_data_{year}.csv"
+
+
+def read_annual(path, encoding="utf-8"):
+    """country_code et colonnes d'années du fichier annuel (valeurs en float64)."""
+    years = read_year_columns(path, encoding)
+    dtypes = {"country_code": "string", **{year: "float64" for year in years}}
+    annual = pd.read_csv(path, sep=SEPARATOR, encoding=encoding, usecols=list(dtypes), dtype=dtypes)
+    if annual["country_code"].duplicated().any():
+        duplicated = sorted(annual.loc[annual["country_code"].duplicated(), "country_code"].unique())
+        raise ValueError(f"country_code en double dans {path} : {duplicated}")
+    return annual
+
+
+def new_years(annual, known_years):
+    """Années du fichier annuel absentes de la source, triées."""
+    known = set(map(str, known_years))
+    return [year for year in year_columns_of(annual.columns) if year not in known]
+
+
+def loaded_years(manifest_dir):
+    """Années déjà chargées dans dim_year d'après son manifeste (None s'il n'existe pas encore)."""
+    path = manifest_path(manifest_dir, "dim_year")
+    if not os.path.exists(path):
+        return None
+    return [str(year) for year in read_manifest(path, ["year"])["year"]]
+
+
+def extend_source(source, annual, years, target=None, encoding="utf-8"):
+    """Écrit dans `target` (par défaut la source elle-même) la source complétée des colonnes `years`.
+
+    La source est relue en texte brut : les colonnes existantes sont réécrites à
+    l'identique, les pays absents du fichier annuel restent vides pour ces années.
+    L'écriture est atomique. Retourne les codes du fichier annuel inconnus de la source (ignorés).
+    """
+    raw = pd.read_csv(source, sep=SEPARATOR, encoding=encoding, dtype=str, keep_default_na=False)
+    values = annual.set_index("country_code")[years]
+    for year in years:
+        column = values[year].reindex(raw["country_code"])
+        raw[year] = np.where(column.isna(), "", column.to_numpy(dtype=object).astype(str))
+    target = target or source
+    tmp_path = f"{target}.tmp"
+    raw.to_csv(tmp_path, sep=SEPARATOR, index=False, encoding=encoding)
+    os.replace(tmp_path, target)
+    return sorted(set(annual["country_code"]) - set(raw["country_code"]))
+
+
+def add_year_columns(conn, table, years, dialect="mssql"):
+    """ALTER TABLE ADD [année] FLOAT pour chaque année absente de la table ; retourne les colonnes ajoutées."""
+    return add_columns(conn, table, {year: "FLOAT" for year in years}, dialect)
+
+
+def update_year_columns(conn, table, df, years, batch_size=DEFAULT_BATCH_SIZE):
+    """Renseigne les colonnes `years` de la table large, une ligne par country_code."""
+    sets = ", ".join(f"[{year}] = ?" for year in years)
+    statement = f"UPDATE {table} SET {sets} WHERE [country_code] = ?"
+    return BulkLoader(conn, table, list(years) + ["country_code"], batch_size=batch_size,
+                      statement=statement).load(df)
+
+
+def write_partition(df, years, directory, keys=None, encoding="utf-8"):
+    """Fichier de staging de la partition population_data d'une année (BULK INSERT du job annuel).
+
+    `keys` : country_key de chaque ligne de `df` (dimensions.country_keys), comme pour unpivot.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for year in years:
+        path = os.path.join(directory, PARTITION_FILE.format(year=year))
+        unpivot(df, [year], keys).to_csv(path, sep=SEPARATOR, index=False, encoding=encoding, lineterminator="\r\n")
+        paths[year] = path
+    return paths
+
+
+def extend_cube(df, years, directory, regions=None):
+    """Ajoute au fichier du cube les agrégats des seules années `years` (remplacés s'ils y sont déjà)."""
+    path = os.path.join(directory, CUBE_FILE)
+    rows = build_cube(df, years, regions)
+    if os.path.exists(path):
+        cube = read_cube(path)
+        cube = cube[~cube["year"].isin([int(year) for year in years])]
+        rows = pd.concat([cube, rows], ignore_index=True)
+    return write_cube(rows, directory)
+
+
+def revised_rows(facts, manifest_dir, n_years):
+    """Masque des pays dont une ligne de faits déjà chargée a changé (d'après le manifeste de population_data).
+
+    `facts` : dépivotage de toutes les années (unpivot), ordonné par pays puis par année.
+    """
+    key_columns = TABLE_KEYS["population_data"]
+    changed = diff_against_manifest(facts, read_manifest(manifest_path(manifest_dir, "population_data"), key_columns),
+                                    key_columns).changed
+    return np.isin(facts["country_key"].to_numpy()[::n_years], changed["country_key"].to_numpy())
+
+
+def load_years(conn, df, years, world_table, manifest_dir, keys=None, dialect="mssql",
+               batch_size=DEFAULT_BATCH_SIZE):
+    """Chargement en base des années `years` et des années déjà chargées qu'elles ont révisées.
+
+    population_data passe par incremental_load sur toutes les années : seules la partition
+    nouvelle et les lignes révisées par l'imputation sont envoyées. La table large reçoit
+    ses nouvelles colonnes pour tous les pays, et toutes ses années pour les pays révisés.
+    dim_year (append_partition) n'est complétée qu'une fois les faits chargés : son manifeste
+    indique ainsi les années terminées (loaded_years).
+    Retourne ([LoadReport de la table large], [DeltaReport population_data, DeltaReport dim_year]).
+    """
+    history = year_columns_of(df.columns)
+    facts = unpivot(df, history, keys)
+    revised = revised_rows(facts, manifest_dir, len(history))
+
+    add_year_columns(conn, world_table, years, dialect)
+    world = [update_year_columns(conn, world_table, df, years, batch_size=batch_size)]
+    if revised.any():
+        world.append(update_year_columns(conn, world_table, df[revised], [y for y in history if y not in years],
+                                         batch_size=batch_size))
+    fact = incremental_load(conn, facts, "population_data", manifest_dir, dialect=dialect, batch_size=batch_size)
+    if fact.load is not None and fact.load.errors:
+        return world, [fact]
+    return world, [fact, append_partition(conn, dim_year(years), "dim_year", manifest_dir,
+                                          dialect=dialect, batch_size=batch_size)]
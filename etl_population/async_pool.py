@@ -0,0 +1,166 @@
+"""
+Couche d'accès asynchrone à l'entrepôt : pool de connexions borné et
+une file d'écriture par table.
+
+Les pilotes DB-API (pyodbc, sqlite3) sont bloquants : chaque opération est
+exécutée dans un thread (asyncio.to_thread) sur une connexion empruntée au
+pool. Les chargements de tables indépendantes (tables par continent,
+dim_country, dim_year, population_data) se recouvrent ainsi au lieu de
+s'enchaîner sur une seule connexion, dans la limite de `size` connexions.
+
+    reports = run_load_tables(lambda: pyodbc.connect(conn_str),
+                              {"dim_country": dim, "dim_year": years, "population_data": fact},
+                              order=[["dim_country", "dim_year"], ["population_data"]])
+
+Avec `key_columns`, les lignes sont envoyées en upsert (delta_load.upsert_statement) :
+relancer le même chargement met les lignes à jour au lieu de les dupliquer.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pandas as pd
+
+from etl_population.bulk_loader import DEFAULT_BATCH_SIZE, BulkLoader, LoadReport
+from etl_population.delta_load import upsert_statement
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_QUEUE_SIZE = 2
+
+
+class AsyncConnectionPool:
+    """Au plus `size` connexions, créées à la demande et réutilisées."""
+
+    def __init__(self, connect, size=DEFAULT_POOL_SIZE):
+        if size < 1:
+            raise ValueError("size doit être >= 1")
+        self._connect = connect
+        self.size = size
+        self._idle = asyncio.Queue()
+        self._created = 0
+        self._all = []
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            if self._idle.empty() and self._created < self.size:
+                self._created += 1
+                try:
+                    conn = await asyncio.to_thread(self._connect)
+                except Exception:
+                    self._created -= 1
+                    raise
+                self._all.append(conn)
+                return conn
+        return await self._idle.get()
+
+    async def release(self, conn):
+        await self._idle.put(conn)
+
+    @asynccontextmanager
+    async def connection(self):
+        conn = await self.acquire()
+        try:
+            yield conn
+        finally:
+            await self.release(conn)
+
+    async def run(self, func, *args):
+        """Exécute func(conn, *args) dans un thread avec une connexion du pool."""
+        async with self.connection() as conn:
+            return await asyncio.to_thread(func, conn, *args)
+
+    async def close(self):
+        for conn in self._all:
+            await asyncio.to_thread(conn.close)
+        self._all.clear()
+        self._created = 0
+
+
+class TableWriter:
+    """File d'écriture d'une table : les blocs mis en file sont chargés dans l'ordre.
+
+    La file est bornée (`queue_size`) : le producteur attend quand l'écriture prend du retard.
+    `key_columns` : clé de l'upsert ; sans clé, INSERT simple.
+    """
+
+    def __init__(self, pool, table, batch_size=DEFAULT_BATCH_SIZE, queue_size=DEFAULT_QUEUE_SIZE,
+                 key_columns=None, dialect="mssql"):
+        self.pool = pool
+        self.table = table
+        self.batch_size = batch_size
+        self.key_columns = list(key_columns or [])
+        self.dialect = dialect
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.report = LoadReport(table)
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._consume())
+        return self
+
+    async def put(self, frame):
+        await self._enqueue(frame)
+
+    async def close(self):
+        await self._enqueue(None)
+        await self._task
+        return self.report
+
+    async def _enqueue(self, item):
+        # Si l'écriture a échoué, la file pleine ne se videra plus : on lève son erreur au lieu d'attendre
+        put = asyncio.ensure_future(self.queue.put(item))
+        await asyncio.wait({put, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            await self._task
+
+    def _write(self, conn, frame):
+        columns = list(frame.columns)
+        statement = upsert_statement(self.table, self.key_columns, columns, self.dialect) if self.key_columns else None
+        BulkLoader(conn, self.table, columns, batch_size=self.batch_size, statement=statement).load(frame, self.report)
+
+    async def _consume(self):
+        while True:
+            frame = await self.queue.get()
+            if frame is None:
+                return
+            await self.pool.run(self._write, frame)
+
+
+async def _load_one(pool, table, frames, batch_size, queue_size, key_columns, dialect):
+    writer = TableWriter(pool, table, batch_size, queue_size, key_columns, dialect).start()
+    if isinstance(frames, pd.DataFrame):
+        frames = [frames]
+    for frame in frames:
+        await writer.put(frame)
+    return await writer.close()
+
+
+async def load_tables(pool, frames_by_table, order=None, batch_size=DEFAULT_BATCH_SIZE,
+                      queue_size=DEFAULT_QUEUE_SIZE, key_columns=None, dialect="mssql"):
+    """Charge chaque table (DataFrame ou itérable de blocs) et retourne {table: LoadReport}.
+
+    `order` est une liste de groupes de tables : les groupes s'enchaînent (clés étrangères),
+    les tables d'un même groupe sont chargées simultanément. Par défaut : un seul groupe.
+    """
+    order = order or [list(frames_by_table)]
+    reports = {}
+    for group in order:
+        results = await asyncio.gather(*(
+            _load_one(pool, table, frames_by_table[table], batch_size, queue_size, key_columns, dialect)
+            for table in group))
+        reports.update(zip(group, results))
+    return reports
+
+
+def run_load_tables(connect, frames_by_table, order=None, pool_size=DEFAULT_POOL_SIZE,
+                    batch_size=DEFAULT_BATCH_SIZE, queue_size=DEFAULT_QUEUE_SIZE, key_columns=None, dialect="mssql"):
+    """Point d'entrée synchrone : crée le pool, charge les tables puis ferme les connexions."""
+    async def main():
+        pool = AsyncConnectionPool(connect, size=pool_size)
+        try:
+            return await load_tables(pool, frames_by_table, order, batch_size, queue_size, key_columns, dialect)
+        finally:
+            await pool.close()
+    return asyncio.run(main())
@@ -0,0 +1,161 @@
+"""
+Index d'adjacence des frontières (colonne `borders`) au format CSR.
+
+`borders` est une chaîne "FRA,DEU,LUX,NLD" ('No Borders' après nettoyage).
+Elle est découpée une seule fois et convertie en deux tableaux d'entiers,
+indexés par la position de ligne du pays :
+
+    indptr  (n + 1) -> les voisins du pays i sont indices[indptr[i]:indptr[i + 1]]
+    indices (arêtes) -> positions de ligne des voisins
+
+Le graphe est rendu symétrique (si A cite B, B est voisin de A) et les codes
+absents du jeu de données sont écartés (voir `unknown`). Les requêtes
+travaillent directement sur ces tableaux :
+
+    - population d'un pays et de ses voisins, pour toutes les années ;
+    - composantes connexes terrestres ;
+    - régions à k sauts d'un pays ;
+    - table pont dim_country_border pour l'entrepôt (voir unpivot.star_schema).
+"""
+
+import numpy as np
+import pandas as pd
+
+from etl_population.schema import DIM_COUNTRY_BORDER_COLUMNS, YEAR_COLUMNS
+
+NO_BORDERS = "No Borders"
+
+
+def parse_borders(df):
+    """Codes cités dans `borders` : (position du pays, position du voisin ou -1 s'il est absent, code).
+
+    Les codes pays de `df` doivent être uniques.
+    """
+    codes = df["country_code"].to_numpy(dtype=object)
+    borders = df["borders"].fillna("").replace(NO_BORDERS, "").str.replace(" ", "", regex=False)
+    # Un seul découpage pour tout le fichier : les listes sont concaténées puis coupées aux virgules
+    counts = np.where(borders != "", borders.str.count(",") + 1, 0)
+    listed = borders[borders != ""].to_numpy(dtype=object)
+    tokens = np.array(",".join(listed).split(",") if counts.any() else [], dtype=object)
+    source = np.repeat(np.arange(len(df)), counts)          # position de ligne du pays qui cite la frontière
+    valid = tokens != ""
+    source, tokens = source[valid], tokens[valid]
+    return source, pd.Index(codes).get_indexer(tokens), tokens
+
+
+class BorderIndex:
+    """Graphe non orienté des frontières, en CSR (indptr / indices, positions de ligne)."""
+
+    def __init__(self, codes, indptr, indices, unknown=None):
+        self.codes = np.asarray(codes, dtype=object)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.unknown = unknown if unknown is not None else pd.DataFrame(columns=DIM_COUNTRY_BORDER_COLUMNS)
+        self.position = {code: i for i, code in enumerate(self.codes)}
+
+    @classmethod
+    def from_frame(cls, df):
+        codes = df["country_code"].to_numpy(dtype=object)
+        source, target, tokens = parse_borders(df)
+        known = target >= 0
+        unknown = pd.DataFrame({"country_code": codes[source[~known]],
+                                "border_code": tokens[~known]}, columns=DIM_COUNTRY_BORDER_COLUMNS)
+        return cls.from_edges(codes, source[known], target[known], unknown)
+
+    @classmethod
+    def from_edges(cls, codes, source, target, unknown=None):
+        """Construit le CSR symétrique (sans boucle ni doublon) à partir de paires de positions."""
+        n = len(codes)
+        source, target = np.asarray(source, dtype=np.int64), np.asarray(target, dtype=np.int64)
+        edges = np.unique(np.concatenate([source * n + target, target * n + source]))
+        rows, cols = np.divmod(edges, n)
+        keep = rows != cols
+        rows, cols = rows[keep], cols[keep]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return cls(codes, indptr, cols, unknown)
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def degree(self):
+        return np.diff(self.indptr)
+
+    @property
+    def edge_rows(self):
+        """Position de ligne de l'origine de chaque arête (même ordre que indices)."""
+        return np.repeat(np.arange(len(self.codes)), self.degree)
+
+    def _positions(self, codes):
+        codes = [codes] if isinstance(codes, str) else list(codes)
+        try:
+            return np.array([self.position[code] for code in codes], dtype=np.int64)
+        except KeyError as e:
+            raise KeyError(f"Code pays absent de l'index : {e.args[0]}") from None
+
+    def neighbours(self, code):
+        i = self.position[code]
+        return self.codes[self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    def neighbour_sum(self, block, include_self=True):
+        """Somme, pour chaque pays, des lignes de `block` de ses voisins (et de la sienne).
+
+        block : matrice (pays x colonnes), par exemple le bloc des années. Les NaN comptent 0.
+        Chaque colonne est un produit CSR x vecteur (np.bincount pondéré sur les arêtes) :
+        aucune boucle par pays.
+        """
+        values = np.nan_to_num(np.asarray(block, dtype=np.float64)).reshape(len(self.codes), -1)
+        columns = np.ascontiguousarray(values.T)
+        rows = self.edge_rows
+        sums = np.empty_like(columns)
+        for j, column in enumerate(columns):
+            sums[j] = np.bincount(rows, weights=column[self.indices], minlength=len(self.codes))
+        sums = sums.T
+        if include_self:
+            sums = sums + values
+        return sums.reshape(np.shape(block))
+
+    def neighbour_population(self, df, year_columns=YEAR_COLUMNS, include_self=True):
+        """Population de chaque pays et de ses voisins, par année (DataFrame pays x années)."""
+        block = df[year_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        return pd.DataFrame(self.neighbour_sum(block, include_self),
+                            index=pd.Index(self.codes, name="country_code"), columns=year_columns)
+
+    def connected_components(self):
+        """Numéro de composante connexe (0..k-1) de chaque pays ; une île sans frontière est seule."""
+        labels = np.arange(len(self.codes))
+        rows = self.edge_rows
+        while True:
+            updated = labels.copy()
+            np.minimum.at(updated, rows, labels[self.indices])
+            updated = updated[updated]      # saut de pointeurs : convergence en O(log diamètre)
+            if np.array_equal(updated, labels):
+                break
+            labels = updated
+        return np.unique(labels, return_inverse=True)[1]
+
+    def hop_distances(self, codes, max_hops=None):
+        """Nombre de sauts depuis les pays `codes` (-1 si non atteint en max_hops sauts)."""
+        distance = np.full(len(self.codes), -1, dtype=np.int64)
+        frontier = np.zeros(len(self.codes), dtype=bool)
+        frontier[self._positions(codes)] = True
+        distance[frontier] = 0
+        rows, hop = self.edge_rows, 0
+        while frontier.any() and (max_hops is None or hop < max_hops):
+            hop += 1
+            reached = np.zeros(len(self.codes), dtype=bool)
+            reached[self.indices[frontier[rows]]] = True
+            frontier = reached & (distance < 0)
+            distance[frontier] = hop
+        return distance
+
+    def k_hop_region(self, code, k):
+        """Codes des pays à k sauts au plus de `code` (le pays lui-même inclus)."""
+        distance = self.hop_distances(code, max_hops=k)
+        return self.codes[distance >= 0]
+
+    def bridge_table(self):
+        """Lignes de la table pont dim_country_border (une par couple de voisins, dans les deux sens)."""
+        return pd.DataFrame({"country_code": self.codes[self.edge_rows],
+                             "border_code": self.codes[self.indices]}, columns=DIM_COUNTRY_BORDER_COLUMNS)
@@ -0,0 +1,226 @@
+"""
+Chargement en masse par lots (remplace iterrows + cursor.execute).
+
+Les lignes sont envoyées par tableaux de paramètres avec cursor.executemany
+(fast_executemany activé quand le pilote le propose, comme pyodbc), avec un
+commit par lot. Une erreur annule uniquement le lot concerné et est
+rapportée au niveau du lot, pas de la ligne.
+
+Avec un journal (checkpoint.BatchJournal), chaque lot validé est consigné et
+une relance saute les lots déjà validés : un chargement interrompu reprend au
+premier lot manquant au lieu de tout renvoyer.
+
+Toute connexion DB-API avec le style de paramètres "?" convient : pyodbc vers
+SQL Server en production, sqlite3 (connect_standin) pour les tests et les
+mesures de débit sans SQL Server.
+"""
+
+import sqlite3
+import time
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from etl_population.checkpoint import batch_checksum, row_hashes
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+@dataclass
+class BatchError:
+    batch: int
+    first_row: int
+    last_row: int
+    error: str
+
+
+@dataclass
+class LoadReport:
+    table: str
+    batches: int = 0
+    rows_sent: int = 0
+    rows_loaded: int = 0
+    batches_skipped: int = 0
+    rows_skipped: int = 0
+    elapsed: float = 0.0
+    errors: list = field(default_factory=list)
+
+    @property
+    def rows_per_second(self):
+        return self.rows_loaded / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        text = (f"{self.table} : {self.rows_loaded}/{self.rows_sent} lignes chargées en "
+                f"{self.batches} lots ({self.elapsed:.2f} s, {self.rows_per_second:,.0f} lignes/s), "
+                f"{len(self.errors)} lot(s) en erreur")
+        if self.batches_skipped:
+            text += f", {self.batches_skipped} lot(s) déjà validé(s) repris du journal ({self.rows_skipped} lignes)"
+        return text
+
+
+def insert_statement(table, columns):
+    """INSERT paramétré avec la liste explicite des colonnes."""
+    cols = ", ".join(f"[{col}]" for col in columns)
+    placeholders = ", ".join("?" for _ in columns)
+    return f"INSERT INTO {table} ({cols}) VALUES ({placeholders})"
+
+
+def frame_rows(df, columns=None):
+    """Lignes du DataFrame en tuples de types Python natifs (NaN/<NA> -> None)."""
+    if columns is not None:
+        df = df[columns]
+    values = df.astype(object).where(df.notna(), None)
+    return list(values.itertuples(index=False, name=None))
+
+
+def _batches(rows, batch_size):
+    for start in range(0, len(rows), batch_size):
+        yield start, rows[start:start + batch_size]
+
+
+class BulkLoader:
+    """Insère des DataFrames dans `table` par lots de `batch_size` lignes.
+
+    `journal` (BatchJournal) : lots validés à sauter et à consigner ; `statement` doit alors
+    être un upsert, un lot validé mais pas encore consigné étant rejoué à la reprise.
+    """
+
+    def __init__(self, conn, table, columns, batch_size=DEFAULT_BATCH_SIZE, statement=None,
+                 fast_executemany=True, journal=None):
+        if batch_size < 1:
+            raise ValueError("batch_size doit être >= 1")
+        self.conn = conn
+        self.table = table
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.statement = statement or insert_statement(table, self.columns)
+        self.fast_executemany = fast_executemany
+        self.journal = journal
+
+        num_placeholders = self.statement.count("?")
+        if num_placeholders != len(self.columns):
+            raise ValueError(f"Problème de colonnes : {len(self.columns)} colonnes, "
+                             f"{num_placeholders} placeholders dans SQL")
+
+    def _cursor(self):
+        cursor = self.conn.cursor()
+        if self.fast_executemany and hasattr(cursor, "fast_executemany"):
+            cursor.fast_executemany = True
+        return cursor
+
+    def load(self, frames, report=None):
+        """Charge un DataFrame ou un itérable de DataFrames et retourne un LoadReport."""
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+        report = report or LoadReport(self.table)
+        start = time.perf_counter()
+        cursor = self._cursor()
+        try:
+            for frame in frames:
+                rows = frame_rows(frame, self.columns)
+                offset = report.rows_sent
+                hashes = row_hashes(frame[self.columns]) if self.journal is not None else None
+                for first, batch in _batches(rows, self.batch_size):
+                    if hashes is None:
+                        self._send(cursor, batch, offset + first, report)
+                    else:
+                        self._send_journaled(cursor, batch, offset + first, report,
+                                             frame.iloc[first:first + len(batch)],
+                                             batch_checksum(hashes[first:first + len(batch)]))
+                report.rows_sent += len(rows)
+        finally:
+            cursor.close()
+            report.elapsed += time.perf_counter() - start
+        return report
+
+    def _send(self, cursor, batch, first_row, report):
+        report.batches += 1
+        try:
+            cursor.executemany(self.statement, batch)
+            self.conn.commit()
+            report.rows_loaded += len(batch)
+            return True
+        except Exception as e:
+            self.conn.rollback()
+            report.errors.append(BatchError(report.batches, first_row, first_row + len(batch) - 1, str(e)))
+            return False
+
+    def _send_journaled(self, cursor, batch, first_row, report, frame, checksum):
+        number = report.batches + 1
+        if self.journal.is_committed(number, checksum):
+            report.batches += 1
+            report.batches_skipped += 1
+            report.rows_skipped += len(batch)
+            return
+        if self._send(cursor, batch, first_row, report):
+            self.journal.record(number, first_row, frame, checksum)
+
+
+def connect_standin(path=":memory:"):
+    """Base SQLite locale qui parle la même interface DB-API ("?") que pyodbc."""
+    return sqlite3.connect(path, check_same_thread=False)
+
+
+def create_table(conn, table, column_definitions):
+    """Crée la table dans la base de substitution (syntaxe CREATE TABLE IF NOT EXISTS de SQLite)."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(column_definitions)})")
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def unique_key_index(conn, table, column="country_code"):
+    """Index unique sur `column`, cible de l'upsert sous SQLite (doublons des anciens chargements supprimés).
+
+    Sous SQL Server, MERGE n'a pas besoin de cet index : les tables sont créées par le script SQL.
+    """
+    index = f"ux_{table}_{column}"
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index,))
+        if cursor.fetchone() is None:
+            cursor.execute(f"DELETE FROM {table} WHERE rowid NOT IN "
+                           f"(SELECT MAX(rowid) FROM {table} GROUP BY [{column}])")
+            cursor.execute(f"CREATE UNIQUE INDEX {index} ON {table} ([{column}])")
+            conn.commit()
+    finally:
+        cursor.close()
+
+
+def table_columns(conn, table, dialect="mssql"):
+    """Noms des colonnes de la table (PRAGMA table_info sous SQLite, INFORMATION_SCHEMA sinon)."""
+    cursor = conn.cursor()
+    try:
+        if dialect == "sqlite":
+            cursor.execute(f"PRAGMA table_info({table})")
+            return [row[1] for row in cursor.fetchall()]
+        cursor.execute("SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = ?", (table,))
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def add_columns(conn, table, definitions, dialect="mssql"):
+    """ALTER TABLE ADD pour chaque colonne de {nom: type} absente de la table ; retourne les colonnes ajoutées."""
+    existing = set(table_columns(conn, table, dialect))
+    missing = [name for name in definitions if name not in existing]
+    cursor = conn.cursor()
+    try:
+        for name in missing:
+            cursor.execute(f"ALTER TABLE {table} ADD [{name}] {definitions[name]}")
+        conn.commit()
+    finally:
+        cursor.close()
+    return missing
+
+
+def row_count(conn, table):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
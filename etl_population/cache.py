@@ -0,0 +1,135 @@
+"""
+Cache colonnaire du jeu de données nettoyé, adressé par son contenu.
+
+Le DataFrame typé et nettoyé est stocké au format Arrow IPC (non compressé,
+projetable en mémoire). La clé est l'empreinte SHA-256 du fichier source et
+des paramètres de nettoyage : tant que la source ne change pas, les étapes
+suivantes rechargent le cache sans analyser le CSV.
+
+Invalidation : l'écriture d'une nouvelle entrée supprime les entrées plus
+anciennes de la même source. Éviction : au-delà de `max_bytes`, les entrées
+les moins récemment utilisées sont supprimées.
+
+Nécessite pyarrow (pip install pyarrow).
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from etl_population.streaming import clean_chunks, read_population_chunks
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "etl_population")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+CACHE_SUFFIX = ".arrow"
+
+# À incrémenter si le schéma ou la logique de nettoyage change
+CACHE_VERSION = 1
+
+
+def _feather():
+    try:
+        import pyarrow.feather as feather
+    except ImportError as e:
+        raise ImportError("Le cache colonnaire nécessite pyarrow : pip install pyarrow") from e
+    return feather
+
+
+def file_digest(path, block_size=1 << 20):
+    """SHA-256 du contenu du fichier, lu par blocs."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(source, params):
+    """Clé de cache : empreinte de la source + paramètres de nettoyage."""
+    payload = json.dumps({"source": file_digest(source), "params": params, "version": CACHE_VERSION},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class ColumnarCache:
+    """Répertoire d'entrées Arrow IPC nommées <source>-<clé>.arrow."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path_for(self, source, key):
+        stem = os.path.splitext(os.path.basename(source))[0]
+        return os.path.join(self.directory, f"{stem}-{key}{CACHE_SUFFIX}")
+
+    def entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                if name.endswith(CACHE_SUFFIX)]
+
+    def get(self, source, key):
+        """DataFrame en cache, ou None. Les colonnes numériques sans valeur nulle ne sont pas copiées."""
+        path = self.path_for(source, key)
+        if not os.path.exists(path):
+            return None
+        table = _feather().read_table(path, memory_map=True)
+        os.utime(path)  # date d'accès utilisée pour l'éviction LRU
+        return table.to_pandas(split_blocks=True)
+
+    def put(self, source, key, df):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(source, key)
+        tmp_path = f"{path}.tmp"
+        _feather().write_feather(df.reset_index(drop=True), tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+        self.invalidate(source, keep=path)
+        self.evict(keep=path)
+        return path
+
+    def invalidate(self, source, keep=None):
+        """Supprime les entrées de `source` autres que `keep` (source ou paramètres modifiés)."""
+        prefix = os.path.splitext(os.path.basename(source))[0] + "-"
+        for path in self.entries():
+            if os.path.basename(path).startswith(prefix) and path != keep:
+                os.remove(path)
+
+    def evict(self, keep=None):
+        """Supprime les entrées les moins récemment utilisées tant que le cache dépasse max_bytes."""
+        entries = sorted(self.entries(), key=os.path.getmtime)
+        total = sum(os.path.getsize(path) for path in entries)
+        for path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            total -= os.path.getsize(path)
+            os.remove(path)
+
+    def load_or_build(self, source, params, build):
+        """Retourne le DataFrame en cache pour (source, params), sinon build() puis mise en cache."""
+        key = cache_key(source, params)
+        df = self.get(source, key)
+        if df is None:
+            df = build()
+            self.put(source, key, df)
+        return df
+
+
+def clean_params(strategy="row_mean"):
+    """Paramètres de nettoyage qui entrent dans la clé de cache du jeu nettoyé."""
+    return {"stage": "clean", "strategy": strategy, "year_dtype": "float64"}
+
+
+def load_cleaned(source, strategy="row_mean", chunksize=50_000, cache=None):
+    """Jeu de données nettoyé de `source`, depuis le cache si la source n'a pas changé."""
+    cache = cache or ColumnarCache()
+    params = clean_params(strategy)
+
+    def build():
+        chunks = read_population_chunks(source, chunksize=chunksize, year_dtype="float64")
+        return pd.concat(clean_chunks(chunks, strategy=strategy), ignore_index=True)
+
+    return cache.load_or_build(source, params, build)
@@ -0,0 +1,119 @@
+"""
+Journal des lots validés : reprise d'un chargement interrompu.
+
+BulkLoader valide (commit) chaque lot séparément. Avec un journal, chaque lot
+validé y est aussitôt consigné :
+
+    batch ; first_row ; last_row ; first_key ; last_key ; rows ; checksum ; committed_at
+
+checksum est l'empreinte du contenu du lot (empreintes 64 bits des lignes,
+dans l'ordre, condensées par blake2b). Si le chargement s'arrête (connexion
+perdue, serveur redémarré), la relance recalcule les mêmes lots : un lot dont
+le numéro et l'empreinte figurent au journal est sauté, seuls les suivants sont
+envoyés. Un lot dont le contenu a changé entre-temps n'a plus la même
+empreinte et est renvoyé.
+
+Le journal est écrit après le commit : un arrêt entre les deux fait renvoyer
+ce seul lot. Les instructions journalisées sont donc des upserts (MERGE,
+INSERT ... ON CONFLICT), qu'un lot rejoué laisse inchangées. Le journal est
+supprimé une fois la table entièrement chargée.
+
+Un journal décrit ce qu'a reçu une base précise : il est rangé avec les
+manifestes de la base cible (delta_load.target_manifest_dir). Si la table
+cible contient moins de lignes que les lots consignés (table vidée, base
+restaurée), le journal est ignoré et tous les lots sont renvoyés (verify).
+
+    journal = BatchJournal(journal_path(target_dir, "population_data"), ["country_key", "year"])
+    journal.verify(row_count(conn, "population_data"))
+    BulkLoader(conn, "population_data", columns, statement=upsert, journal=journal).load(df)
+    journal.clear()
+"""
+
+import csv
+import hashlib
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from etl_population.schema import SEPARATOR
+
+JOURNAL_COLUMNS = ["batch", "first_row", "last_row", "first_key", "last_key", "rows", "checksum", "committed_at"]
+
+
+def journal_path(directory, table):
+    return os.path.join(directory, f"{table}.journal.csv")
+
+
+def row_hashes(frame):
+    """Empreinte uint64 de chaque ligne (toutes colonnes, clés comprises)."""
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy(dtype=np.uint64)
+
+
+def batch_checksum(hashes):
+    """Empreinte d'un lot à partir des empreintes de ses lignes, dans l'ordre."""
+    return hashlib.blake2b(np.ascontiguousarray(hashes, dtype=np.uint64).tobytes(), digest_size=8).hexdigest()
+
+
+class BatchJournal:
+    """Lots validés d'un chargement ({numéro de lot: empreinte}), relus depuis `path` s'il existe."""
+
+    def __init__(self, path, key_columns=None):
+        self.path = path
+        self.key_columns = list(key_columns or [])
+        self.committed, self.rows = self._read()
+
+    def _read(self):
+        committed, rows = {}, {}
+        if not os.path.exists(self.path):
+            return committed, rows
+        with open(self.path, newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle, delimiter=SEPARATOR):
+                # Une ligne tronquée par un arrêt brutal est ignorée : son lot sera rejoué
+                if row.get("committed_at") and row["batch"].isdigit():
+                    committed[int(row["batch"])] = row["checksum"]
+                    rows[int(row["batch"])] = int(row["rows"])
+        return committed, rows
+
+    def __len__(self):
+        return len(self.committed)
+
+    def is_committed(self, batch, checksum):
+        return self.committed.get(batch) == checksum
+
+    def verify(self, target_rows):
+        """Garde le journal si la table cible contient au moins les lignes des lots consignés, sinon l'efface."""
+        if target_rows >= sum(self.rows.values()):
+            return True
+        self.clear()
+        return False
+
+    def key_range(self, frame):
+        """Clés de la première et de la dernière ligne du lot ("" sans colonnes de clé)."""
+        if not self.key_columns or not len(frame):
+            return "", ""
+        keys = frame[self.key_columns]
+        return tuple("|".join(str(value) for value in keys.iloc[i]) for i in (0, -1))
+
+    def record(self, batch, first_row, frame, checksum):
+        """Consigne un lot validé (ligne ajoutée et forcée sur disque)."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        first_key, last_key = self.key_range(frame)
+        new_file = not os.path.exists(self.path)
+        with open(self.path, "a", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle, delimiter=SEPARATOR)
+            if new_file:
+                writer.writerow(JOURNAL_COLUMNS)
+            writer.writerow([batch, first_row, first_row + len(frame) - 1, first_key, last_key, len(frame),
+                             checksum, datetime.now().isoformat(timespec="seconds")])
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.committed[batch] = checksum
+        self.rows[batch] = len(frame)
+
+    def clear(self):
+        """Chargement terminé : le journal n'a plus lieu d'être."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.committed, self.rows = {}, {}
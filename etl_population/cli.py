@@ -0,0 +1,593 @@
+"""
+Interface en ligne de commande du pipeline population mondiale.
+
+    python -m etl_population eda               # profil statistique + figures
+    python -m etl_population clean             # fichier nettoyé, staging du schéma en étoile et du cube
+    python -m etl_population clean --shards 8  # idem, réparti par code pays sur 8 processus
+    python -m etl_population validate          # contrôle d'intégrité, rapport et fichier de quarantaine
+    python -m etl_population load              # population_mondiale_1960_2023 + chargement incrémental
+    python -m etl_population load --to-sql     # population_mondiale_1960_2023 par SQLAlchemy
+    python -m etl_population split-continents  # six tables par continent
+    python -m etl_population project           # estimations 2024-2030 (population_projection)
+    python -m etl_population report            # classement + données des pages HTML
+    python -m etl_population query --where g20=1 --group-by idh_group --years 2000 2023 --top 3
+    python -m etl_population ingest population_mondiale_2024.csv   # ajout d'une année, sans recharger le reste
+    python -m etl_population all               # toutes les étapes, dans l'ordre
+
+Chemins et identifiants viennent de la configuration (etl_population/config.py).
+Les années ne sont pas figées : elles sont lues dans l'en-tête de la source.
+Chaque sous-commande n'importe que ce dont elle a besoin : `load` ne charge ni
+matplotlib ni seaborn, et pandas n'est importé qu'au lancement d'une étape.
+Mémoire : seules `eda` et `clean` lisent la source par blocs, en mémoire bornée.
+`validate`, `load`, `split-continents`, `project`, `report` et `ingest` partent du
+jeu nettoyé entier (cache.load_cleaned) : les règles sur les codes en double et les
+frontières, les clés de substitution et le delta du manifeste portent sur tout le
+jeu. Un extrait plus grand que la mémoire n'est donc pas chargeable en l'état.
+Le rapport d'exécution (JSON + Prometheus) est écrit dans reports_dir.
+`load` et `split-continents` commencent par le contrôle d'intégrité : en cas
+de violation bloquante, rien n'est écrit en base.
+Un `load` interrompu reprend au premier lot non validé : les lots validés sont
+consignés dans des journaux propres à la base cible
+(manifest_dir/<base>/<table>.journal.csv) et rejouer un lot ne crée pas de doublon.
+"""
+
+import argparse
+import os
+import tempfile
+
+from etl_population.config import load_config
+from etl_population.instrumentation import RunRecorder, file_size
+
+WORLD_TABLE = "population_mondiale_1960_2023"
+VALIDATION_REPORT = "validation_report.json"
+QUARANTINE_FILE = "quarantine.csv"
+STAR_TABLES = ["dim_country", "dim_country_history", "dim_year", "population_data", "dim_country_border"]
+
+
+def cmd_eda(config, run, args):
+    from etl_population.schema import read_year_columns
+    from etl_population.streaming import profile_chunks, read_population_chunks
+
+    # Année de référence (histogramme, pays les plus peuplés) : la dernière de l'en-tête
+    reference_year = read_year_columns(config.source)[-1]
+    with run.stage("read", bytes_read=file_size(config.source)) as stage:
+        profile = profile_chunks(read_population_chunks(config.source, chunksize=config.chunksize),
+                                 reference_year=reference_year, top_k=5)
+        stage.rows_out = profile.rows
+
+    print("\nRésumé statistique des données :")
+    print(profile.describe())
+    print("\nValeurs manquantes par colonne :")
+    print(profile.missing[profile.missing > 0])
+
+    if not args.no_figures:
+        from etl_population.figures import figure_inputs, render_all
+
+        with run.stage("charts") as stage:
+            status = render_all(figure_inputs(profile), directory=config.figures_dir, force=args.force)
+            stage.rows_out = sum(value == "rendered" for value in status.values())
+        print(status)
+    return 0
+
+
+def cmd_clean(config, run, args):
+    from etl_population.cache import load_cleaned
+    from etl_population.cube import build_cube, write_cube
+    from etl_population.streaming import clean_chunks, read_population_chunks, write_chunks
+    from etl_population.schema import year_columns_of
+    from etl_population.unpivot import write_staging
+
+    shards = getattr(args, "shards", None) or config.shards
+    if shards > 1:
+        return _clean_sharded(config, run, shards)
+
+    chunks = read_population_chunks(config.source, chunksize=config.chunksize, year_dtype="float64")
+    with run.stage("clean_export", bytes_read=file_size(config.source)) as stage:
+        stage.rows_out = write_chunks(clean_chunks(chunks, strategy=config.strategy), config.cleaned)
+        stage.bytes_written = file_size(config.cleaned)
+    print(f"Fichier nettoyé exporté : {config.cleaned}")
+
+    df = load_cleaned(config.source, strategy=config.strategy, chunksize=config.chunksize)
+    years = year_columns_of(df.columns)
+    with run.stage("unpivot", rows_in=len(df)) as stage:
+        paths = write_staging(df, config.staging_dir, years, history=_country_history(config, df))
+        paths["population_cube"] = write_cube(build_cube(df, years, _regions(config)), config.staging_dir)
+        stage.bytes_written = sum(file_size(path) for path in paths.values())
+    for table, path in paths.items():
+        print(f"Fichier de staging {table} : {path}")
+    return 0
+
+
+def _clean_sharded(config, run, shards):
+    """cmd_clean en mode réparti (sharding.run_sharded) : mêmes fichiers, au bit près."""
+    from etl_population.cache import ColumnarCache, clean_params
+    from etl_population.cube import write_cube
+    from etl_population.sharding import run_sharded
+    from etl_population.streaming import read_population_chunks, write_chunks
+    from etl_population.schema import year_columns_of
+    from etl_population.unpivot import write_staging
+
+    chunks = read_population_chunks(config.source, chunksize=config.chunksize, year_dtype="float64")
+    with run.stage("clean_sharded", bytes_read=file_size(config.source)) as stage:
+        result = run_sharded(chunks, strategy=config.strategy, shards=shards, regions=_regions(config),
+                             max_jump=config.max_jump)
+        stage.rows_out = len(result.cleaned)
+    with run.stage("clean_export", rows_in=len(result.cleaned)) as stage:
+        stage.rows_out = write_chunks([result.cleaned], config.cleaned)
+        stage.bytes_written = file_size(config.cleaned)
+    print(f"Fichier nettoyé exporté : {config.cleaned} ({shards} parties)")
+
+    df = ColumnarCache().load_or_build(config.source, clean_params(config.strategy), lambda: result.cleaned)
+    years = year_columns_of(df.columns)
+    with run.stage("unpivot", rows_in=len(df)) as stage:
+        paths = write_staging(df, config.staging_dir, years, history=_country_history(config, df),
+                              matrices=result.matrices)
+        paths["population_cube"] = write_cube(result.cube, config.staging_dir)
+        stage.bytes_written = sum(file_size(path) for path in paths.values())
+    for table, path in paths.items():
+        print(f"Fichier de staging {table} : {path}")
+    return 0
+
+
+def _regions(config):
+    from etl_population.continents import regions_from_config
+    return regions_from_config(config.regions)
+
+
+def _target_dir(config):
+    """Manifestes et journaux de la base cible : une autre base a les siens (delta_load.target_manifest_dir)."""
+    from etl_population.delta_load import target_manifest_dir
+    return target_manifest_dir(config.manifest_dir, config.database.identity)
+
+
+def _country_history(config, df):
+    """Historique de dim_country mis à jour avec `df` (clés de substitution stables d'une exécution à l'autre)."""
+    from etl_population.dimensions import HISTORY_FILE, read_history, update_history, write_history
+
+    path = os.path.join(config.manifest_dir, HISTORY_FILE)
+    history, added, versioned = update_history(df, read_history(path))
+    if added or versioned:
+        write_history(history, path)
+        print(f"dim_country : {added} nouveau(x) pays, {versioned} nouvelle(s) version(s)")
+    return history
+
+
+def _validated(config, run, args=None, source=None):
+    """Jeu nettoyé et rapport de contrôle d'intégrité ; si report.ok est faux, l'appelant n'écrit rien en base.
+
+    Sous `all`, le contrôle est fait une seule fois (args.validated) pour load, split-continents et project.
+    `source` : fichier à nettoyer à la place de config.source (source étendue par `ingest`, pas encore en place).
+    """
+    from etl_population.cache import load_cleaned
+    from etl_population.schema import year_columns_of
+    from etl_population.validation import validate
+
+    validated = getattr(args, "validated", None)
+    if validated is not None:
+        return validated
+    df = load_cleaned(source or config.source, strategy=config.strategy, chunksize=config.chunksize)
+    with run.stage("validate", rows_in=len(df)) as stage:
+        report = validate(df, year_columns_of(df.columns), max_jump=config.max_jump, regions=_regions(config))
+        report.write_json(os.path.join(config.reports_dir, VALIDATION_REPORT))
+        report.write_quarantine(df, os.path.join(config.reports_dir, QUARANTINE_FILE))
+        stage.rows_out = len(df) - len(report.quarantined_rows)
+        stage.rows_rejected = len(report.quarantined_rows)
+    print(report.summary())
+    if not report.ok:
+        print(f"Violations bloquantes, aucune écriture en base. Lignes en quarantaine : "
+              f"{os.path.join(config.reports_dir, QUARANTINE_FILE)}")
+    return df, report
+
+
+def cmd_validate(config, run, args):
+    _, report = _validated(config, run, args)
+    for rule, count in report.counts().items():
+        print(f"  {rule:<20} {count}")
+    print(f"Rapport : {os.path.join(config.reports_dir, VALIDATION_REPORT)}")
+    return 0 if report.ok else 1
+
+
+def _create_world_table(conn, dialect, years):
+    """Crée population_mondiale_1960_2023 si besoin, puis ajoute les colonnes d'années qui lui manquent."""
+    from etl_population.annual import add_year_columns
+    from etl_population.bulk_loader import create_table, unique_key_index
+    from etl_population.schema import sql_column_definitions
+
+    if dialect == "sqlite":
+        create_table(conn, WORLD_TABLE, sql_column_definitions("sqlite", years))
+        unique_key_index(conn, WORLD_TABLE)
+    else:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='{WORLD_TABLE}' AND xtype='U') "
+                           f"CREATE TABLE {WORLD_TABLE} ({', '.join(sql_column_definitions('mssql', years))})")
+            conn.commit()
+        finally:
+            cursor.close()
+    return add_year_columns(conn, WORLD_TABLE, years, dialect)
+
+
+def _load_with_sqlalchemy(config, run, args):
+    df, report = _validated(config, run, args)
+    if not report.ok:
+        return 1
+
+    from sqlalchemy import bindparam, create_engine, text
+
+    from etl_population.checkpoint import BatchJournal, batch_checksum, journal_path, row_hashes
+
+    journal = BatchJournal(journal_path(_target_dir(config), WORLD_TABLE), ["country_code"])
+    delete = text(f"DELETE FROM {WORLD_TABLE} WHERE country_code IN :codes").bindparams(
+        bindparam("codes", expanding=True))
+    hashes = row_hashes(df)
+    skipped = 0
+    engine = create_engine(config.database.sqlalchemy_url)
+    try:
+        with run.stage("to_sql", rows_in=len(df)) as stage:
+            # Crée la table si besoin sans la vider : les lots déjà validés restent en place
+            df.head(0).to_sql(WORLD_TABLE, con=engine, if_exists="append", index=False)
+            with engine.connect() as conn:
+                journal.verify(conn.execute(text(f"SELECT COUNT(*) FROM {WORLD_TABLE}")).scalar())
+            for number, first in enumerate(range(0, len(df), config.batch_size), start=1):
+                batch = df.iloc[first:first + config.batch_size]
+                checksum = batch_checksum(hashes[first:first + len(batch)])
+                if journal.is_committed(number, checksum):
+                    skipped += len(batch)
+                    continue
+                # Suppression puis ajout dans la même transaction : rejouer le lot ne crée pas de doublon
+                with engine.begin() as conn:
+                    conn.execute(delete, {"codes": batch["country_code"].astype(str).tolist()})
+                    batch.to_sql(WORLD_TABLE, con=conn, if_exists="append", index=False)
+                journal.record(number, first, batch, checksum)
+            stage.rows_out = len(df)
+    finally:
+        engine.dispose()
+    journal.clear()
+    print(f"{WORLD_TABLE} : {len(df) - skipped} lignes chargées par to_sql"
+          + (f", {skipped} déjà validées reprises du journal" if skipped else ""))
+    return 0
+
+
+def cmd_load(config, run, args):
+    if getattr(args, "to_sql", False):
+        return _load_with_sqlalchemy(config, run, args)
+
+    from etl_population.bulk_loader import BulkLoader, create_table, row_count
+    from etl_population.checkpoint import BatchJournal, journal_path
+    from etl_population.delta_load import incremental_load, upsert_statement
+    from etl_population.dimensions import migrate_legacy_tables
+    from etl_population.schema import ATTRIBUTE_COLUMNS, star_table_definitions, year_columns_of
+    from etl_population.unpivot import star_schema
+
+    df, report = _validated(config, run, args)
+    if not report.ok:
+        return 1
+    years = year_columns_of(df.columns)
+    db = config.database
+    failed = False
+    conn = db.connect()
+    try:
+        with run.stage("table_create"):
+            _create_world_table(conn, db.dialect, years)
+            renamed = migrate_legacy_tables(conn, _target_dir(config), db.dialect)
+            if renamed:
+                print(f"Ancien schéma en étoile renommé en {', '.join(f'{t}_v1' for t in renamed)} : "
+                      f"rechargement complet")
+            if db.dialect == "sqlite":
+                for table in STAR_TABLES:
+                    create_table(conn, table, star_table_definitions(table, "sqlite"))
+
+        # Le jeu validé lui-même, et non une relecture de config.cleaned (export qui peut dater d'un autre nettoyage)
+        columns = ATTRIBUTE_COLUMNS + years
+        journal = BatchJournal(journal_path(_target_dir(config), WORLD_TABLE), ["country_code"])
+        journal.verify(row_count(conn, WORLD_TABLE))
+        loader = BulkLoader(conn, WORLD_TABLE, columns, batch_size=config.batch_size, journal=journal,
+                            statement=upsert_statement(WORLD_TABLE, ["country_code"], columns, db.dialect))
+        with run.stage("insert") as stage:
+            report = loader.load(df)
+            stage.rows_in, stage.rows_out = report.rows_sent, report.rows_loaded
+            stage.rows_rejected = report.rows_sent - report.rows_loaded - report.rows_skipped
+        if not report.errors:
+            journal.clear()
+        for batch_error in report.errors:
+            print(f"Erreur lors de l'insertion du lot {batch_error.batch} "
+                  f"(lignes {batch_error.first_row} à {batch_error.last_row}) : {batch_error.error}")
+        print(report.summary())
+        failed |= bool(report.errors)
+
+        star = star_schema(df, years, _country_history(config, df))
+        with run.stage("incremental") as stage:
+            stage.rows_in = sum(len(star[table]) for table in STAR_TABLES)
+            stage.rows_out = 0
+            for table in STAR_TABLES:
+                delta_report = incremental_load(conn, star[table], table, manifest_dir=_target_dir(config),
+                                                dialect=db.dialect, batch_size=config.batch_size)
+                print(delta_report.summary())
+                if delta_report.load is not None:
+                    stage.rows_out += delta_report.load.rows_loaded
+                    failed |= bool(delta_report.load.errors)
+    finally:
+        conn.close()
+    return 1 if failed else 0
+
+
+def cmd_split_continents(config, run, args):
+    from etl_population.async_pool import run_load_tables
+    from etl_population.bulk_loader import create_table, unique_key_index
+    from etl_population.continents import split_by_region
+    from etl_population.schema import sql_column_definitions, year_columns_of
+
+    df, report = _validated(config, run, args)
+    if not report.ok:
+        return 1
+    db = config.database
+    regions = _regions(config)
+    if db.dialect == "sqlite":
+        conn = db.connect()
+        try:
+            for region in regions:
+                create_table(conn, region.table, sql_column_definitions("sqlite", year_columns_of(df.columns)))
+                unique_key_index(conn, region.table)
+        finally:
+            conn.close()
+
+    with run.stage("continent_split", rows_in=len(df)) as stage:
+        partitions = split_by_region(df, regions)
+        # Upsert par country_code : une nouvelle exécution met les tables à jour sans dupliquer les pays
+        results = run_load_tables(db.connect, partitions, pool_size=config.pool_size,
+                                  batch_size=config.batch_size, key_columns=["country_code"], dialect=db.dialect)
+        stage.rows_out = sum(r.rows_loaded for r in results.values())
+        stage.rows_rejected = sum(r.rows_sent - r.rows_loaded for r in results.values())
+    for load_report in results.values():
+        print(load_report.summary())
+    return 1 if any(r.errors for r in results.values()) else 0
+
+
+def cmd_project(config, run, args):
+    import numpy as np
+
+    from etl_population.bulk_loader import create_table
+    from etl_population.delta_load import incremental_load
+    from etl_population.dimensions import country_keys, migrate_legacy_projection
+    from etl_population.projection import backtest, projection_frame, write_projection
+    from etl_population.schema import star_table_definitions, year_columns_of
+
+    df, report = _validated(config, run, args)
+    if not report.ok:
+        return 1
+    years = year_columns_of(df.columns)
+    model = getattr(args, "model", None) or config.projection_model
+    window = getattr(args, "window", None) or config.projection_window
+    horizon = getattr(args, "horizon", None) or config.projection_horizon
+    with run.stage("projection", rows_in=len(df)) as stage:
+        keys = country_keys(_country_history(config, df), df["country_code"])
+        frame = projection_frame(df, years, horizon=horizon, window=window, model=model, keys=keys)
+        path = write_projection(frame, config.staging_dir)
+        stage.rows_out = len(frame)
+        stage.bytes_written = file_size(path)
+    error = backtest(df[years].to_numpy(dtype=np.float64, na_value=np.nan), years, window=window, model=model)
+    print(f"Projection {model} (fenêtre {window} ans) jusqu'à {horizon} : {len(frame)} estimation(s), "
+          f"erreur médiane à 5 ans sur l'historique {np.nanmedian(error):.2%}")
+    print(f"Fichier de staging population_projection : {path}")
+
+    db = config.database
+    conn = db.connect()
+    try:
+        if migrate_legacy_projection(conn, _target_dir(config), db.dialect):
+            print("population_projection était clé par country_code : recréée par country_key")
+        if db.dialect == "sqlite":
+            create_table(conn, "population_projection", star_table_definitions("population_projection", "sqlite"))
+        with run.stage("projection_load", rows_in=len(frame)) as stage:
+            # Estimations remplacées en entier : les clés qui ne sont plus projetées sont supprimées
+            delta_report = incremental_load(conn, frame, "population_projection", manifest_dir=_target_dir(config),
+                                            dialect=db.dialect, batch_size=config.batch_size, delete_missing=True)
+            stage.rows_out = delta_report.load.rows_loaded if delta_report.load is not None else 0
+    finally:
+        conn.close()
+    print(delta_report.summary())
+    failed = [r for r in (delta_report.load, delta_report.purge) if r is not None and r.errors]
+    return 1 if failed else 0
+
+
+def cmd_report(config, run, args):
+    from etl_population.cache import load_cleaned
+    from etl_population.cube import build_cube
+    from etl_population.measures import fastest_growing
+    from etl_population.ranking import RankingIndex
+    from etl_population.report_data import build_report, write_report_data
+    from etl_population.schema import year_columns_of
+
+    df = load_cleaned(config.source, strategy=config.strategy, chunksize=config.chunksize)
+    years = year_columns_of(df.columns)
+    with run.stage("report", rows_in=len(df)) as stage:
+        cube = build_cube(df, years, _regions(config))
+        print(RankingIndex.from_frame(df, years).top(int(years[-1]), k=5))
+        print(fastest_growing(df, years[-1 - args.growth_span], years[-1], k=5))
+        path = write_report_data(build_report(df, cube, years, top_n=args.top_n), config.report_data)
+        stage.bytes_written = file_size(path)
+    print(f"Données des pages HTML : {path}")
+    return 0
+
+
+def _parse_where(items):
+    from etl_population.schema import FLAG_COLUMNS
+
+    where = {}
+    for item in items or []:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise SystemExit(f"Filtre invalide (attendu cle=valeur) : {item!r}")
+        values = value.split(",")
+        if key in FLAG_COLUMNS:
+            values = [v.strip().lower() in ("1", "true", "vrai") for v in values]
+        where[key] = values
+    return where
+
+
+def cmd_query(config, run, args):
+    import pandas as pd
+
+    from etl_population.olap import QueryEngine
+
+    engine = QueryEngine.from_source(config.source, strategy=config.strategy, regions=_regions(config))
+    request = dict(where=_parse_where(args.where), years=args.years, group_by=args.group_by, top=args.top)
+    if args.sql:
+        sql, params = engine.to_sql(**request, dialect=config.database.dialect)
+        print(sql)
+        print(params)
+        return 0
+    with pd.option_context("display.width", 200, "display.max_columns", 12):
+        print(engine.query(**request))
+    return 0
+
+
+def cmd_ingest(config, run, args):
+    from etl_population.annual import (
+        extend_cube,
+        extend_source,
+        load_years,
+        loaded_years,
+        new_years,
+        read_annual,
+        write_partition,
+    )
+    from etl_population.bulk_loader import table_columns
+    from etl_population.dimensions import country_keys
+    from etl_population.schema import read_year_columns
+    from etl_population.streaming import write_chunks
+
+    annual = read_annual(args.file)
+    added = new_years(annual, read_year_columns(config.source))
+    # Années à charger : celles du fichier annuel que dim_year n'a pas encore reçues
+    # (une exécution interrompue reprend ainsi là où elle s'était arrêtée)
+    done = loaded_years(_target_dir(config))
+    years = added if done is None else new_years(annual, done)
+    if not years:
+        print("Aucune nouvelle année à charger.")
+        return 0
+
+    # La source étendue est écrite à part, sous le même nom (même entrée de cache) ;
+    # elle ne remplace population_mondiale.csv qu'une fois le jeu étendu validé
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(config.source))) as pending:
+        source = config.source
+        if added:
+            source = os.path.join(pending, os.path.basename(config.source))
+            with run.stage("extend_source", rows_in=len(annual)) as stage:
+                unknown = extend_source(config.source, annual, added, target=source)
+                stage.rows_rejected = len(unknown)
+        df, report = _validated(config, run, args, source=source)
+        if not report.ok:
+            print(f"{config.source} inchangé.")
+            return 1
+        if added:
+            os.replace(source, config.source)
+            print(f"{config.source} : année(s) {', '.join(added)} ajoutée(s)"
+                  + (f", codes inconnus ignorés : {unknown}" if unknown else ""))
+
+    keys = country_keys(_country_history(config, df), df["country_code"])
+    with run.stage("partition", rows_in=len(df)) as stage:
+        write_chunks([df], config.cleaned)
+        paths = write_partition(df, years, config.staging_dir, keys)
+        paths["population_cube"] = extend_cube(df, years, config.staging_dir, _regions(config))
+        stage.rows_out = len(df) * len(years)
+        stage.bytes_written = sum(file_size(path) for path in paths.values())
+    for name, path in paths.items():
+        print(f"Fichier de staging {name} : {path}")
+
+    db = config.database
+    conn = db.connect()
+    try:
+        if "country_code" in table_columns(conn, "population_data", db.dialect):
+            print("population_data est encore à l'ancien schéma (clé country_code) : lancer d'abord `load`.")
+            return 1
+        with run.stage("append", rows_in=len(df) * len(years)) as stage:
+            _create_world_table(conn, db.dialect, read_year_columns(config.source))
+            world, delta_reports = load_years(conn, df, years, WORLD_TABLE, _target_dir(config), keys,
+                                              dialect=db.dialect, batch_size=config.batch_size)
+            stage.rows_out = sum(r.load.rows_loaded for r in delta_reports if r.load is not None)
+    finally:
+        conn.close()
+    for load_report in world:
+        print(load_report.summary())
+    for delta_report in delta_reports:
+        print(delta_report.summary())
+    failed = any(r.errors for r in world) or any(r.load is not None and r.load.errors for r in delta_reports)
+    return 1 if failed else 0
+
+
+def cmd_all(config, run, args):
+    status = 0
+    for command in (cmd_eda, cmd_clean):
+        status |= command(config, run, args)
+    # Un seul contrôle d'intégrité, sur le jeu que `clean` vient de produire
+    args.validated = _validated(config, run)
+    for command in (cmd_load, cmd_split_continents, cmd_project, cmd_report):
+        status |= command(config, run, args)
+    return status
+
+
+COMMANDS = {
+    "eda": (cmd_eda, "profil statistique du fichier source et figures"),
+    "clean": (cmd_clean, "fichier nettoyé et fichiers de staging"),
+    "validate": (cmd_validate, "contrôle d'intégrité du jeu nettoyé (rapport + quarantaine)"),
+    "load": (cmd_load, "chargement de population_mondiale_1960_2023 et du schéma en étoile"),
+    "split-continents": (cmd_split_continents, "alimentation des tables par continent"),
+    "project": (cmd_project, "projection de tendance jusqu'à 2030 (partition population_projection)"),
+    "report": (cmd_report, "données partagées des pages HTML"),
+    "ingest": (cmd_ingest, "ajout d'une nouvelle année (fichier annuel) sans recharger les autres"),
+    "query": (cmd_query, "requête en mémoire (filtres, regroupement, top-N) sans base de données"),
+    "all": (cmd_all, "toutes les étapes dans l'ordre"),
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m etl_population",
+                                     description="ETL de la population mondiale vers l'entrepôt SQL Server.")
+    parser.add_argument("--config", help="fichier JSON de configuration (défaut : etl_config.json)")
+    parser.add_argument("--sqlite", help="base SQLite de substitution au lieu de SQL Server")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (_, description) in COMMANDS.items():
+        sub = subparsers.add_parser(name, help=description)
+        if name in ("eda", "all"):
+            sub.add_argument("--no-figures", action="store_true", help="ne pas rendre les figures")
+            sub.add_argument("--force", action="store_true", help="redessiner même si les données n'ont pas changé")
+        if name in ("clean", "all"):
+            sub.add_argument("--shards", type=int,
+                             help="nettoyage et transformations répartis sur N processus (défaut : configuration)")
+        if name == "load":
+            sub.add_argument("--to-sql", action="store_true",
+                             help="charger population_mondiale_1960_2023 par SQLAlchemy (DataFrame.to_sql)")
+        if name == "ingest":
+            sub.add_argument("file", help="fichier annuel : country_code;2024 (autres colonnes ignorées)")
+        if name == "query":
+            sub.add_argument("--where", action="append", metavar="CLE=VALEUR",
+                             help="filtre, répétable : g20=1, idh_group=..., continent=europe,afrique")
+            sub.add_argument("--years", type=int, nargs=2, metavar=("DEBUT", "FIN"))
+            sub.add_argument("--group-by")
+            sub.add_argument("--top", type=int)
+            sub.add_argument("--sql", action="store_true", help="afficher la requête SQL équivalente")
+        if name == "project":
+            sub.add_argument("--model", choices=["linear", "log_linear"],
+                             help="modèle de tendance (défaut : configuration)")
+            sub.add_argument("--window", type=int, help="années d'historique de l'ajustement")
+            sub.add_argument("--horizon", type=int, help="dernière année projetée")
+        if name in ("report", "all"):
+            sub.add_argument("--top-n", type=int, default=12, help="pays gardés par année dans le bar chart race")
+            sub.add_argument("--growth-span", type=int, default=10,
+                             help="période (en années) du classement des plus fortes croissances")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    config = load_config(args.config)
+    if args.sqlite:
+        config.database.sqlite = args.sqlite
+
+    run = RunRecorder("population_etl")
+    try:
+        return COMMANDS[args.command][0](config, run, args)
+    finally:
+        if run.stages:
+            run.write_json(os.path.join(config.reports_dir, "run_report.json"))
+            run.write_prometheus(os.path.join(config.reports_dir, "etl_metrics.prom"))
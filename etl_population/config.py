@@ -0,0 +1,130 @@
+"""
+Configuration du pipeline : chemins, paramètres de chargement et connexion.
+
+Les valeurs par défaut sont relatives au répertoire courant. Elles peuvent être
+remplacées par un fichier JSON (etl_config.json, ou le chemin donné dans la
+variable ETL_POPULATION_CONFIG, ou --config) :
+
+    {
+      "source": "C:/data/population_mondiale.csv",
+      "database": {"server": "DESKTOP-RMUNQ82", "database": "PopulationDB", "username": "sa"}
+    }
+
+Le mot de passe n'a pas à figurer dans le fichier : les variables ETL_DB_SERVER,
+ETL_DB_NAME, ETL_DB_USER, ETL_DB_PASSWORD et ETL_DB_SQLITE l'emportent sur le
+fichier. Avec "sqlite" (ou ETL_DB_SQLITE), le chargement vise une base SQLite
+locale de substitution au lieu de SQL Server.
+
+Ce module n'importe que la bibliothèque standard : pyodbc n'est chargé qu'à la
+première connexion.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field, fields
+from urllib.parse import quote_plus
+
+DEFAULT_CONFIG_FILE = "etl_config.json"
+CONFIG_ENV = "ETL_POPULATION_CONFIG"
+
+DATABASE_ENV = {
+    "server": "ETL_DB_SERVER",
+    "database": "ETL_DB_NAME",
+    "username": "ETL_DB_USER",
+    "password": "ETL_DB_PASSWORD",
+    "sqlite": "ETL_DB_SQLITE",
+}
+
+
+@dataclass
+class DatabaseConfig:
+    server: str = "localhost"
+    database: str = "PopulationDB"
+    username: str = None
+    password: str = None
+    driver: str = "ODBC Driver 17 for SQL Server"
+    sqlite: str = None
+
+    @property
+    def dialect(self):
+        return "sqlite" if self.sqlite else "mssql"
+
+    @property
+    def identity(self):
+        """Base cible (fichier SQLite absolu, ou serveur/base) : les manifestes de chargement lui sont propres."""
+        if self.sqlite:
+            return f"sqlite:{os.path.abspath(self.sqlite)}"
+        return f"mssql:{self.server.lower()}/{self.database.lower()}"
+
+    @property
+    def connection_string(self):
+        conn_str = f"DRIVER={{{self.driver}}};SERVER={self.server};DATABASE={self.database}"
+        if self.username:
+            return conn_str + f";UID={self.username};PWD={self.password or ''}"
+        return conn_str + ";Trusted_Connection=yes"
+
+    @property
+    def sqlalchemy_url(self):
+        if self.sqlite:
+            return f"sqlite:///{self.sqlite}"
+        return f"mssql+pyodbc:///?odbc_connect={quote_plus(self.connection_string)}"
+
+    def connect(self):
+        """Nouvelle connexion DB-API (pyodbc vers SQL Server, ou SQLite de substitution)."""
+        if self.sqlite:
+            from etl_population.bulk_loader import connect_standin
+            return connect_standin(self.sqlite)
+        import pyodbc
+        return pyodbc.connect(self.connection_string)
+
+
+@dataclass
+class Config:
+    source: str = "population_mondiale.csv"
+    cleaned: str = "population_mondiale_cleaned.csv"
+    staging_dir: str = "staging"
+    manifest_dir: str = "manifests"
+    reports_dir: str = "reports"
+    figures_dir: str = "."
+    report_data: str = "population_report_data.js"
+    regions: object = None
+    strategy: str = "row_mean"
+    max_jump: float = 0.5
+    projection_model: str = "log_linear"
+    projection_window: int = 15
+    projection_horizon: int = 2030
+    chunksize: int = 50_000
+    batch_size: int = 1000
+    pool_size: int = 4
+    shards: int = 1
+    database: DatabaseConfig = field(default_factory=DatabaseConfig)
+
+
+def _check_keys(section, values, cls):
+    unknown = set(values) - {f.name for f in fields(cls)}
+    if unknown:
+        raise ValueError(f"Clé(s) inconnue(s) dans la section {section} de la configuration : {sorted(unknown)}")
+
+
+def load_config(path=None, environ=None):
+    """Configuration par défaut, complétée par le fichier JSON puis par les variables d'environnement.
+
+    Sans `path`, lit ETL_POPULATION_CONFIG ou etl_config.json s'ils existent.
+    """
+    environ = os.environ if environ is None else environ
+    path = path or environ.get(CONFIG_ENV)
+    if path is None and os.path.exists(DEFAULT_CONFIG_FILE):
+        path = DEFAULT_CONFIG_FILE
+
+    values = {}
+    if path is not None:
+        with open(path, encoding="utf-8") as handle:
+            values = json.load(handle)
+    database = dict(values.pop("database", {}))
+    _check_keys("principale", values, Config)
+    _check_keys("database", database, DatabaseConfig)
+
+    for key, variable in DATABASE_ENV.items():
+        if environ.get(variable):
+            database[key] = environ[variable]
+    return Config(**values, database=DatabaseConfig(**database))
@@ -0,0 +1,107 @@
+"""
+Répartition par continent en une seule passe, par masque de bits.
+
+Les 19 indicateurs d'appartenance (arab_world ... g20) sont regroupés en un
+entier par pays (bit i = FLAG_COLUMNS[i]). Chaque région est définie par
+les bits requis et les bits interdits, ce qui couvre les règles composées
+comme celle de l'Océanie : asia_oceania AND NOT sub_saharan_africa.
+
+Toutes les régions sont évaluées en une seule opération vectorisée sur le
+tableau des masques, au lieu d'un SELECT ... WHERE par table. Les partitions
+sont ensuite chargées en parallèle, par upsert sur country_code
+(async_pool.run_load_tables, voir cli.cmd_split_continents).
+"""
+
+import json
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from etl_population.schema import FLAG_COLUMNS
+
+FLAG_BITS = {flag: bit for bit, flag in enumerate(FLAG_COLUMNS)}
+
+# Règles de SQLQuery2.sql (table cible -> expression)
+DEFAULT_REGIONS = {
+    "population_afrique_1960_2023": "sub_saharan_africa",
+    "population_asie_1960_2023": "asia_oceania",
+    "population_amerique_du_nord_1960_2023": "north_america",
+    "population_amerique_du_sud_1960_2023": "south_america",
+    "population_europe_1960_2023": "europe_central_asia",
+    "population_oceanie_1960_2023": "asia_oceania AND NOT sub_saharan_africa",
+}
+
+
+@dataclass(frozen=True)
+class Region:
+    table: str
+    all_of: tuple = ()
+    none_of: tuple = ()
+
+    @property
+    def required_mask(self):
+        return _mask(self.all_of)
+
+    @property
+    def forbidden_mask(self):
+        return _mask(self.none_of)
+
+
+def _mask(flags):
+    mask = 0
+    for flag in flags:
+        if flag not in FLAG_BITS:
+            raise ValueError(f"Indicateur inconnu : {flag!r}")
+        mask |= 1 << FLAG_BITS[flag]
+    return mask
+
+
+def parse_region(table, expression):
+    """Construit une Region à partir d'une conjonction "a AND b AND NOT c"."""
+    all_of, none_of = [], []
+    for term in expression.split(" AND "):
+        words = term.split()
+        if len(words) == 2 and words[0].upper() == "NOT":
+            none_of.append(words[1])
+        elif len(words) == 1:
+            all_of.append(words[0])
+        else:
+            raise ValueError(f"Terme de région invalide dans {table!r} : {term!r}")
+    for flag in all_of + none_of:
+        if flag not in FLAG_BITS:
+            raise ValueError(f"Indicateur inconnu dans {table!r} : {flag!r}")
+    return Region(table, tuple(all_of), tuple(none_of))
+
+
+def regions_from_config(config=None):
+    """Régions à partir d'un dict {table: expression} ou d'un fichier JSON (défaut : DEFAULT_REGIONS)."""
+    if config is None:
+        config = DEFAULT_REGIONS
+    elif isinstance(config, (str, os.PathLike)):
+        with open(config, encoding="utf-8") as handle:
+            config = json.load(handle)
+    return [parse_region(table, expression) for table, expression in config.items()]
+
+
+def pack_flags(df):
+    """Un entier uint32 par ligne regroupant les indicateurs d'appartenance."""
+    flags = df[FLAG_COLUMNS].fillna(False).to_numpy(dtype=np.uint32)
+    weights = np.left_shift(np.uint32(1), np.arange(len(FLAG_COLUMNS), dtype=np.uint32))
+    return flags @ weights
+
+
+def route(bitmask, regions):
+    """Matrice booléenne (lignes x régions) : appartenance de chaque ligne à chaque région."""
+    required = np.array([r.required_mask for r in regions], dtype=np.uint32)
+    forbidden = np.array([r.forbidden_mask for r in regions], dtype=np.uint32)
+    bits = bitmask[:, None]
+    return ((bits & required) == required) & ((bits & forbidden) == 0)
+
+
+def split_by_region(df, regions=None):
+    """Retourne {table: DataFrame} pour chaque région, calculé en une passe."""
+    regions = regions or regions_from_config()
+    membership = route(pack_flags(df), regions)
+    return {region.table: df[membership[:, i]] for i, region in enumerate(regions)}
+
@@ -0,0 +1,108 @@
+"""
+Expressions cron à 6 champs du planificateur NiFi / Quartz.
+
+    secondes minutes heures jour_du_mois mois jour_de_semaine
+    "0 0 0 5 1 *"  ->  chaque 5 janvier à 00:00:00
+
+Chaque champ accepte *, ?, une valeur, une liste (1,15), un intervalle
+(1-5) et un pas (*/10, 0-30/5). Jour de semaine : 1 = dimanche ... 7 = samedi
+(convention Quartz) ; les noms SUN..SAT et JAN..DEC sont acceptés.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+_FIELDS = [
+    ("second", 0, 59),
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 1, 7),
+]
+_NAMES = {
+    "month": {name: i + 1 for i, name in enumerate(
+        ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"])},
+    "weekday": {name: i + 1 for i, name in enumerate(["SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT"])},
+}
+
+# Horizon de recherche : au-delà, l'expression est considérée comme impossible (ex. 30 février)
+_MAX_LOOKAHEAD = timedelta(days=366 * 5)
+
+
+def _value(token, field):
+    return _NAMES.get(field, {}).get(token.upper()) or int(token)
+
+
+def _parse_field(text, field, low, high):
+    if text in ("*", "?"):
+        return None  # pas de contrainte
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+        if part in ("*", "?"):
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start, end = _value(start_text, field), _value(end_text, field)
+        else:
+            start = _value(part, field)
+            end = high if step > 1 else start
+        if not (low <= start <= high and low <= end <= high):
+            raise ValueError(f"Valeur hors limites pour le champ {field} : {part!r}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronExpression:
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != len(_FIELDS):
+            raise ValueError(f"Expression cron à 6 champs attendue : {expression!r}")
+        self.expression = expression
+        self.fields = {name: _parse_field(text, name, low, high)
+                       for text, (name, low, high) in zip(parts, _FIELDS)}
+
+    def _matches(self, name, value):
+        allowed = self.fields[name]
+        return allowed is None or value in allowed
+
+    def _day_matches(self, moment):
+        quartz_weekday = (moment.weekday() + 1) % 7 + 1
+        day, weekday = self.fields["day"], self.fields["weekday"]
+        if day is not None and weekday is not None:
+            return moment.day in day or quartz_weekday in weekday
+        return self._matches("day", moment.day) and self._matches("weekday", quartz_weekday)
+
+    def next_after(self, moment):
+        """Prochaine date de déclenchement strictement après `moment`."""
+        t = moment.replace(microsecond=0) + timedelta(seconds=1)
+        limit = moment + _MAX_LOOKAHEAD
+        while t <= limit:
+            if not self._matches("month", t.month):
+                t = (t.replace(day=1, hour=0, minute=0, second=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0, second=0) + timedelta(days=1)
+            elif not self._matches("hour", t.hour):
+                t = t.replace(minute=0, second=0) + timedelta(hours=1)
+            elif not self._matches("minute", t.minute):
+                t = t.replace(second=0) + timedelta(minutes=1)
+            elif not self._matches("second", t.second):
+                t += timedelta(seconds=1)
+            else:
+                return t
+        raise ValueError(f"Aucune date de déclenchement pour {self.expression!r}")
+
+
+def run_on_schedule(expression, job, now=datetime.now, sleep=time.sleep, max_runs=None):
+    """Exécute job() à chaque déclenchement de l'expression cron (indéfiniment par défaut)."""
+    cron = CronExpression(expression)
+    runs = 0
+    while max_runs is None or runs < max_runs:
+        fire_at = cron.next_after(now())
+        sleep(max(0.0, (fire_at - now()).total_seconds()))
+        job()
+        runs += 1
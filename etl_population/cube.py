@@ -0,0 +1,139 @@
+"""
+Cube d'agrégats pré-calculés pour les tableaux de bord.
+
+Population par année pour chaque membre des dimensions :
+
+    world      -> "world"
+    continent  -> régions de etl_population.continents (afrique, asie, ..., oceanie)
+    flag       -> chacun des 19 indicateurs (g7, g20, ue27, oecd_members, ...)
+    idh_group  -> chaque groupe d'IDH
+
+Toutes les appartenances sont rassemblées dans une matrice (pays x membres) ;
+le cube complet est alors un produit matriciel avec le bloc des années.
+
+Les sommes sont exactes : chaque population est convertie en virgule fixe
+(2**-32 habitant près) et découpée en trois tranches de 26 bits, portées par
+des float64 entiers. Les produits matriciels de ces tranches ne font que des
+additions d'entiers inférieurs à 2**53, donc sans arrondi, quel que soit
+l'ordre. Des sommes partielles calculées sur des parties du jeu (mode
+réparti, etl_population/sharding.py) s'additionnent ainsi en un cube
+identique au bit près à celui du jeu entier.
+
+Le résultat est stocké au format long dans population_cube, à côté des
+tables de l'entrepôt, et les graphiques lisent ces agrégats au lieu de
+reparcourir les données par pays.
+"""
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from etl_population.continents import pack_flags, regions_from_config, route
+from etl_population.schema import FLAG_COLUMNS, IDH_CATEGORIES, IDH_COLUMN, SEPARATOR, YEAR_COLUMNS
+
+CUBE_COLUMNS = ["dimension", "member", "year", "population", "countries"]
+CUBE_FILE = "staging_population_cube.csv"
+
+FIXED_POINT_BITS = 32
+LIMB_BITS = 26
+
+
+def region_label(table):
+    """population_afrique_1960_2023 -> afrique"""
+    return re.sub(r"^population_|_\d{4}_\d{4}$", "", table)
+
+
+def idh_codes(df):
+    """Position de l'idh_group de chaque pays dans IDH_CATEGORIES (-1 si inconnu)."""
+    return pd.Categorical(df[IDH_COLUMN], categories=IDH_CATEGORIES).codes
+
+
+def cube_members(regions=None):
+    """(dimension, membre) de chaque colonne de la matrice d'appartenance."""
+    regions = regions or regions_from_config()
+    return ([("world", "world")]
+            + [("continent", region_label(region.table)) for region in regions]
+            + [("flag", flag) for flag in FLAG_COLUMNS]
+            + [(IDH_COLUMN, group) for group in IDH_CATEGORIES])
+
+
+def membership_from_codes(bits, idh, regions=None):
+    """Matrice d'appartenance à partir des masques d'indicateurs (pack_flags) et des codes d'IDH (idh_codes)."""
+    regions = regions or regions_from_config()
+    flags = (bits[:, None] >> np.arange(len(FLAG_COLUMNS), dtype=np.uint32)[None, :]) & np.uint32(1)
+    return np.hstack([
+        np.ones((len(bits), 1), dtype=bool),
+        route(bits, regions),
+        flags.astype(bool),
+        np.asarray(idh)[:, None] == np.arange(len(IDH_CATEGORIES))[None, :],
+    ])
+
+
+def membership_matrix(df, regions=None):
+    """Matrice booléenne (pays x membres) et liste des (dimension, membre) correspondants."""
+    return membership_from_codes(pack_flags(df), idh_codes(df), regions), cube_members(regions)
+
+
+def _limbs(values):
+    """Tranches (haute, moyenne, basse) de la valeur en virgule fixe, chacune entière et < 2**26 en valeur absolue."""
+    fixed = np.floor(np.ldexp(values, FIXED_POINT_BITS))
+    high = np.floor(np.ldexp(fixed, -2 * LIMB_BITS))
+    rest = fixed - np.ldexp(high, 2 * LIMB_BITS)
+    middle = np.floor(np.ldexp(rest, -LIMB_BITS))
+    return high, middle, rest - np.ldexp(middle, LIMB_BITS)
+
+
+def partial_sums(block, membership):
+    """Sommes exactes (tranches, effectifs) d'un bloc (pays x années), à additionner entre parties."""
+    valid = ~np.isnan(block)
+    weights = membership.astype(np.float64)
+    limbs = np.stack([weights.T @ limb for limb in _limbs(np.where(valid, block, 0.0))])
+    return limbs, weights.T @ valid.astype(np.float64)
+
+
+def cube_frame(limbs, countries, members, year_columns=YEAR_COLUMNS):
+    """Cube au format long à partir des sommes exactes (partial_sums, éventuellement additionnées)."""
+    high, middle, low = limbs
+    population = (np.ldexp(high, 2 * LIMB_BITS - FIXED_POINT_BITS) + np.ldexp(middle, LIMB_BITS - FIXED_POINT_BITS)
+                  + np.ldexp(low, -FIXED_POINT_BITS))
+    n_members, n_years = population.shape
+    dimension, member = (np.array(values, dtype=object) for values in zip(*members))
+    return pd.DataFrame({
+        "dimension": np.repeat(dimension, n_years),
+        "member": np.repeat(member, n_years),
+        "year": np.tile(np.asarray(year_columns, dtype=np.int64), n_members),
+        "population": population.ravel(),
+        "countries": countries.ravel().astype(np.int64),
+    }, columns=CUBE_COLUMNS)
+
+
+def build_cube(df, year_columns=YEAR_COLUMNS, regions=None):
+    """Cube au format long (dimension, member, year, population, countries)."""
+    membership, members = membership_matrix(df, regions)
+    block = df[year_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    return cube_frame(*partial_sums(block, membership), members, year_columns)
+
+
+def write_cube(cube, directory, encoding="utf-8"):
+    """Fichier de staging de population_cube (même format que unpivot.write_staging)."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, CUBE_FILE)
+    cube.to_csv(path, sep=SEPARATOR, index=False, encoding=encoding, lineterminator="\r\n")
+    return path
+
+
+def read_cube(path):
+    return pd.read_csv(path, sep=SEPARATOR, keep_default_na=False,
+                       dtype={"dimension": str, "member": str, "year": np.int64})
+
+
+def rollup(cube, dimension, member=None):
+    """Population par année : Series pour un membre, DataFrame (années x membres) sinon."""
+    rows = cube[cube["dimension"] == dimension]
+    if member is not None:
+        rows = rows[rows["member"] == member]
+        return rows.set_index("year")["population"]
+    return rows.pivot(index="year", columns="member", values="population")
+
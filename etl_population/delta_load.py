@@ -0,0 +1,284 @@
+"""
+Chargement incrémental par empreintes de contenu.
+
+Au lieu de réécrire toute la table (to_sql if_exists='replace') ou de laisser
+un trigger supprimer les doublons déjà envoyés, chaque ligne reçoit une
+empreinte de contenu (hash 64 bits vectorisé). Un manifeste local conserve
+l'empreinte de chaque clé (par exemple (country_key, year) pour
+population_data) lors du dernier chargement réussi.
+
+À chaque exécution, l'extrait est comparé au manifeste et seules les lignes
+nouvelles ou modifiées sont envoyées, sous forme d'upsert (MERGE pour SQL
+Server, INSERT ... ON CONFLICT pour la base de substitution SQLite).
+
+Un manifeste décrit le contenu d'une base précise : il est rangé dans un
+sous-répertoire propre à la base cible (target_manifest_dir, d'après
+DatabaseConfig.identity). Avant de s'y fier, le chargement vérifie que la
+table cible contient au moins autant de lignes que le manifeste (le delta n'en
+supprime jamais) ; sinon (base neuve, table vidée) le manifeste est ignoré et
+toute la table est renvoyée.
+
+Les lots validés sont consignés dans un journal (checkpoint.BatchJournal,
+<table>.journal.csv à côté du manifeste) : après une interruption, la relance
+calcule le même delta et ne renvoie que les lots absents du journal. Le
+journal est supprimé quand le manifeste est mis à jour.
+"""
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from etl_population.bulk_loader import DEFAULT_BATCH_SIZE, BulkLoader, LoadReport, row_count
+from etl_population.checkpoint import BatchJournal, journal_path
+from etl_population.schema import SEPARATOR
+
+HASH_COLUMN = "row_hash"
+
+# Clés métier des tables du schéma en étoile
+TABLE_KEYS = {
+    "population_data": ["country_key", "year"],
+    "dim_country": ["country_key"],
+    "dim_country_history": ["country_key", "version"],
+    "dim_year": ["year"],
+    "dim_country_border": ["country_code", "border_code"],
+    "population_projection": ["country_key", "year"],
+}
+
+
+def content_hashes(df, key_columns):
+    """Empreinte uint64 de chaque ligne, calculée sur les colonnes hors clé."""
+    values = df.drop(columns=key_columns)
+    if values.shape[1] == 0:
+        # Table réduite à sa clé (dim_year) : une ligne existe ou non, elle ne change jamais
+        return np.zeros(len(df), dtype=np.uint64)
+    return pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+
+
+def target_manifest_dir(manifest_dir, target):
+    """Répertoire des manifestes et journaux propres à la base `target` (DatabaseConfig.identity)."""
+    slug = re.sub(r"[^0-9A-Za-z]+", "_", target).strip("_")[-48:]
+    digest = hashlib.blake2b(target.encode("utf-8"), digest_size=4).hexdigest()
+    return os.path.join(manifest_dir, f"{slug}-{digest}")
+
+
+def manifest_path(directory, table):
+    return os.path.join(directory, f"{table}.manifest.csv")
+
+
+def read_manifest(path, key_columns):
+    """Manifeste du dernier chargement réussi.
+
+    Vide s'il n'existe pas encore, ou s'il a été écrit avec d'autres clés (ancien schéma) :
+    toute la table est alors renvoyée, l'upsert étant idempotent.
+    """
+    empty = pd.DataFrame({**{col: pd.Series(dtype=object) for col in key_columns},
+                          HASH_COLUMN: pd.Series(dtype=np.uint64)})
+    if not os.path.exists(path):
+        return empty
+    dtypes = {HASH_COLUMN: np.uint64}
+    if "year" in key_columns:
+        dtypes["year"] = np.int64
+    manifest = pd.read_csv(path, sep=SEPARATOR, dtype=dtypes, keep_default_na=False)
+    if list(manifest.columns) != key_columns + [HASH_COLUMN]:
+        return empty
+    return manifest
+
+
+def trusted_manifest(conn, table, manifest):
+    """(manifeste, False) si la table cible contient au moins ses lignes, sinon (manifeste vide, True)."""
+    if len(manifest) and row_count(conn, table) < len(manifest):
+        return manifest.iloc[:0], True
+    return manifest, False
+
+
+def write_manifest(manifest, path):
+    """Écriture atomique : le manifeste n'est jamais laissé à moitié écrit."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    manifest.to_csv(tmp_path, sep=SEPARATOR, index=False)
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class Delta:
+    inserted: pd.DataFrame
+    changed: pd.DataFrame
+    deleted: pd.DataFrame
+    unchanged: int
+    manifest: pd.DataFrame
+
+    @property
+    def to_ship(self):
+        return pd.concat([self.inserted, self.changed], ignore_index=True)
+
+
+def diff_against_manifest(df, manifest, key_columns):
+    """Compare l'extrait au manifeste : lignes insérées, modifiées, supprimées et inchangées."""
+    current = df[key_columns].copy()
+    current[HASH_COLUMN] = content_hashes(df, key_columns)
+
+    merged = current.merge(manifest, on=key_columns, how="left", suffixes=("", "_previous"),
+                           indicator=True)
+    is_new = (merged["_merge"] == "left_only").to_numpy()
+    previous = merged[f"{HASH_COLUMN}_previous"].to_numpy()
+    is_changed = ~is_new & (previous != merged[HASH_COLUMN].to_numpy())
+
+    deleted = manifest.merge(current[key_columns], on=key_columns, how="left", indicator=True)
+    deleted = deleted.loc[deleted["_merge"] == "left_only", key_columns].reset_index(drop=True)
+
+    return Delta(
+        inserted=df[is_new].reset_index(drop=True),
+        changed=df[is_changed].reset_index(drop=True),
+        deleted=deleted,
+        unchanged=int((~is_new & ~is_changed).sum()),
+        manifest=current,
+    )
+
+
+def upsert_statement(table, key_columns, columns, dialect="mssql"):
+    """Upsert paramétré d'une ligne ("?" par colonne, dans l'ordre de `columns`)."""
+    quoted = [f"[{col}]" for col in columns]
+    updates = [col for col in columns if col not in key_columns]
+    if dialect == "sqlite":
+        keys = ", ".join(f"[{col}]" for col in key_columns)
+        sets = ", ".join(f"[{col}] = excluded.[{col}]" for col in updates)
+        action = f"DO UPDATE SET {sets}" if updates else "DO NOTHING"
+        return (f"INSERT INTO {table} ({', '.join(quoted)}) VALUES ({', '.join('?' for _ in columns)}) "
+                f"ON CONFLICT ({keys}) {action}")
+    if dialect == "mssql":
+        on = " AND ".join(f"target.[{col}] = source.[{col}]" for col in key_columns)
+        sets = ", ".join(f"target.[{col}] = source.[{col}]" for col in updates)
+        source_cols = ", ".join(f"source.[{col}]" for col in columns)
+        matched = f"WHEN MATCHED THEN UPDATE SET {sets} " if updates else ""
+        return (f"MERGE {table} AS target "
+                f"USING (VALUES ({', '.join('?' for _ in columns)})) AS source ({', '.join(quoted)}) "
+                f"ON {on} "
+                f"{matched}"
+                f"WHEN NOT MATCHED THEN INSERT ({', '.join(quoted)}) VALUES ({source_cols});")
+    raise ValueError(f"Dialecte SQL inconnu : {dialect!r}")
+
+
+def delete_statement(table, key_columns):
+    """DELETE paramétré d'une ligne par sa clé ("?" par colonne de clé, dans l'ordre de `key_columns`)."""
+    return f"DELETE FROM {table} WHERE {' AND '.join(f'[{col}] = ?' for col in key_columns)}"
+
+
+def stale_keys(conn, df, table, key_columns):
+    """Clés présentes dans la table cible mais absentes de `df` (lues en base, pas dans le manifeste)."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT {', '.join(f'[{col}]' for col in key_columns)} FROM {table}")
+        target = pd.DataFrame.from_records(cursor.fetchall(), columns=key_columns)
+    finally:
+        cursor.close()
+    target = target.astype(df[key_columns].dtypes.to_dict())
+    stale = target.merge(df[key_columns].drop_duplicates(), on=key_columns, how="left", indicator=True)
+    return stale.loc[stale["_merge"] == "left_only", key_columns].reset_index(drop=True)
+
+
+def ship_delta(conn, to_ship, table, key_columns, journal=None, dialect="mssql", batch_size=DEFAULT_BATCH_SIZE):
+    """Upsert des lignes `to_ship` par lots journalisés ; None s'il n'y a rien à envoyer."""
+    if not len(to_ship):
+        return None
+    if journal is not None:
+        journal.verify(row_count(conn, table))
+    columns = list(to_ship.columns)
+    statement = upsert_statement(table, key_columns, columns, dialect=dialect)
+    return BulkLoader(conn, table, columns, batch_size=batch_size, statement=statement,
+                      journal=journal).load(to_ship)
+
+
+@dataclass
+class DeltaReport:
+    table: str
+    inserted: int
+    changed: int
+    deleted: int
+    unchanged: int
+    load: LoadReport = field(default=None)
+    reloaded: bool = False
+    purge: LoadReport = field(default=None)
+
+    def summary(self):
+        missing = "supprimée(s) de la table cible" if self.purge is not None else "absente(s) de l'extrait"
+        text = (f"{self.table} : {self.inserted} insérée(s), {self.changed} modifiée(s), "
+                f"{self.unchanged} inchangée(s), {self.deleted} {missing}")
+        if self.purge is not None and self.purge.errors:
+            text += f" ({len(self.purge.errors)} lot(s) de suppression en erreur)"
+        if self.reloaded:
+            text += " (la table cible ne contient pas les lignes du manifeste : rechargement complet)"
+        if self.load is not None:
+            text += f" -- {self.load.summary()}"
+        return text
+
+
+def append_partition(conn, df, table, manifest_dir, key_columns=None, dialect="mssql",
+                     batch_size=DEFAULT_BATCH_SIZE):
+    """Ajoute une partition (par exemple une nouvelle année) sans relire le reste de la table.
+
+    Contrairement à incremental_load, `df` ne contient que la partition : les clés du
+    manifeste absentes de `df` ne sont pas signalées, et les empreintes de la partition
+    sont fusionnées au manifeste existant. Comme pour incremental_load, seules les lignes
+    nouvelles ou modifiées sont envoyées (upsert) : une nouvelle exécution n'envoie rien.
+    """
+    key_columns = key_columns or TABLE_KEYS[table]
+    path = manifest_path(manifest_dir, table)
+    manifest, reloaded = trusted_manifest(conn, table, read_manifest(path, key_columns))
+    delta = diff_against_manifest(df, manifest, key_columns)
+    report = DeltaReport(table, len(delta.inserted), len(delta.changed), 0, delta.unchanged, reloaded=reloaded)
+
+    journal = BatchJournal(journal_path(manifest_dir, table), key_columns)
+    if reloaded:
+        journal.clear()
+    report.load = ship_delta(conn, delta.to_ship, table, key_columns, journal, dialect, batch_size)
+    if report.load is not None and report.load.errors:
+        return report
+
+    kept = manifest.merge(delta.manifest[key_columns], on=key_columns, how="left", indicator=True)
+    kept = kept.loc[kept["_merge"] == "left_only", key_columns + [HASH_COLUMN]]
+    write_manifest(pd.concat([kept, delta.manifest], ignore_index=True), path)
+    journal.clear()
+    return report
+
+
+def incremental_load(conn, df, table, manifest_dir, key_columns=None, dialect="mssql",
+                     batch_size=DEFAULT_BATCH_SIZE, delete_missing=False):
+    """Envoie uniquement les lignes nouvelles ou modifiées de `df` dans `table`.
+
+    `manifest_dir` doit être propre à la base cible (target_manifest_dir).
+    Le manifeste n'est mis à jour que si tous les lots ont été chargés : après un
+    échec, la prochaine exécution recalcule le même delta et n'en renvoie que les
+    lots absents du journal (l'upsert est idempotent).
+    Les lignes absentes de l'extrait sont signalées mais jamais supprimées de l'entrepôt,
+    sauf avec `delete_missing` (table remplacée par l'extrait, comme population_projection) :
+    les clés de la table cible absentes de `df` sont alors supprimées après l'upsert.
+    """
+    key_columns = key_columns or TABLE_KEYS[table]
+    path = manifest_path(manifest_dir, table)
+    manifest, reloaded = trusted_manifest(conn, table, read_manifest(path, key_columns))
+    delta = diff_against_manifest(df, manifest, key_columns)
+    report = DeltaReport(table, len(delta.inserted), len(delta.changed), len(delta.deleted),
+                         delta.unchanged, reloaded=reloaded)
+
+    journal = BatchJournal(journal_path(manifest_dir, table), key_columns)
+    if reloaded:
+        journal.clear()
+    report.load = ship_delta(conn, delta.to_ship, table, key_columns, journal, dialect, batch_size)
+    if report.load is not None and report.load.errors:
+        return report
+
+    if delete_missing:
+        stale = stale_keys(conn, df, table, key_columns)
+        report.deleted = len(stale)
+        report.purge = BulkLoader(conn, table, key_columns, batch_size=batch_size,
+                                  statement=delete_statement(table, key_columns)).load(stale)
+        if report.purge.errors:
+            return report
+
+    write_manifest(delta.manifest, path)
+    journal.clear()
+    return report
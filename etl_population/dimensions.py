@@ -0,0 +1,205 @@
+"""
+Dimension pays à clés de substitution, avec l'historique de ses versions.
+
+population_data ne répète plus country_code (VARCHAR(10)) ni les six
+indicateurs régionaux sur chacune des 64 lignes d'un pays : chaque pays reçoit
+une clé entière compacte, country_key (SMALLINT), et les attributs vivent dans
+la dimension.
+
+    dim_country          -> version courante de chaque pays, clé de jointure des faits
+    dim_country_history  -> toutes les versions : valid_from, valid_to, is_current
+
+Une clé est attribuée une fois pour toutes, dans l'ordre d'arrivée des pays,
+et n'est jamais réutilisée. Quand un attribut suivi (noms, borders, idh_group,
+indicateurs régionaux) change, la version courante est fermée (valid_to = date
+du chargement) et une nouvelle version s'ouvre sous la même country_key : les
+faits déjà chargés ne bougent pas, et l'historique dit quelle valeur avait
+cours à quelle date.
+
+L'historique est conservé dans manifest_dir (dim_country_history.csv) : c'est
+lui qui garantit qu'un pays garde sa clé d'une exécution à l'autre.
+
+    history, added, versioned = update_history(df, read_history(path))
+    write_history(history, path)
+    keys = country_keys(history, df["country_code"])
+"""
+
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from etl_population.bulk_loader import table_columns
+from etl_population.delta_load import manifest_path
+from etl_population.schema import (
+    DIM_COUNTRY_COLUMNS,
+    DIM_COUNTRY_HISTORY_COLUMNS,
+    IDH_COLUMN,
+    REGION_FLAG_COLUMNS,
+    SEPARATOR,
+)
+
+HISTORY_FILE = "dim_country_history.csv"
+TRACKED_COLUMNS = ["name_en", "name_fr", "borders", IDH_COLUMN] + REGION_FLAG_COLUMNS
+SMALLINT_MAX = 32767
+
+# Tables de l'ancien schéma (faits clés par country_code, indicateurs dans les faits)
+LEGACY_RENAMED = ["population_data", "dim_country", "dim_year"]
+LEGACY_REBUILT = ["population_cube", "dim_country_border", "population_projection"]
+
+
+def key_dtype(max_key):
+    """int16 (SMALLINT) tant que les clés y tiennent, int32 au-delà (jeux synthétiques)."""
+    return np.int16 if max_key <= SMALLINT_MAX else np.int32
+
+
+def _attributes(frame):
+    """country_code et attributs suivis, dans des types comparables d'une exécution à l'autre."""
+    attributes = pd.DataFrame({"country_code": frame["country_code"].astype(str).to_numpy(dtype=object)})
+    for col in TRACKED_COLUMNS:
+        if col in REGION_FLAG_COLUMNS:
+            values = frame[col].astype("boolean").fillna(False).to_numpy(dtype=np.uint8)
+        else:
+            values = frame[col].astype(object).where(frame[col].notna(), "").astype(str).to_numpy(dtype=object)
+        attributes[col] = values
+    return attributes
+
+
+def _hashes(attributes):
+    return pd.util.hash_pandas_object(attributes[TRACKED_COLUMNS], index=False).to_numpy(dtype=np.uint64)
+
+
+def empty_history():
+    integers = ["country_key", "version", "is_current"] + REGION_FLAG_COLUMNS
+    return pd.DataFrame({col: pd.Series(dtype=np.int64 if col in integers else object)
+                         for col in DIM_COUNTRY_HISTORY_COLUMNS})
+
+
+def read_history(path):
+    """Historique des versions (vide s'il n'existe pas encore)."""
+    if not os.path.exists(path):
+        return empty_history()
+    history = pd.read_csv(path, sep=SEPARATOR, dtype=str, keep_default_na=False)
+    for col in ["country_key", "version", "is_current"] + REGION_FLAG_COLUMNS:
+        history[col] = history[col].astype(np.int64)
+    history["valid_to"] = history["valid_to"].where(history["valid_to"] != "", None)
+    return history[DIM_COUNTRY_HISTORY_COLUMNS]
+
+
+def write_history(history, path):
+    """Écriture atomique, comme les manifestes de delta_load."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    history.to_csv(tmp_path, sep=SEPARATOR, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def update_history(df, history=None, as_of=None):
+    """Historique complété avec les attributs de `df` ; retourne (historique, pays ajoutés, versions ouvertes).
+
+    Les pays absents de `df` gardent leur version courante (rien n'est supprimé de la dimension).
+    """
+    history = empty_history() if history is None else history.copy()
+    as_of = (as_of or date.today()).isoformat()
+    rows = _attributes(df.drop_duplicates(subset="country_code"))
+
+    current = history[history["is_current"] == 1].set_index("country_code")
+    known = rows["country_code"].isin(current.index).to_numpy()
+    previous = current.reindex(rows["country_code"])
+    changed = known.copy()
+    changed[known] = _hashes(rows[known]) != _hashes(_attributes(previous[known].reset_index()))
+
+    next_key = int(history["country_key"].max()) + 1 if len(history) else 1
+    keys = previous["country_key"].to_numpy(dtype=np.float64, copy=True)
+    keys[~known] = np.arange(next_key, next_key + int((~known).sum()))
+    versions = np.where(known, previous["version"].to_numpy(dtype=np.float64) + 1, 1)
+
+    closing = (history["is_current"] == 1) & history["country_code"].isin(rows.loc[changed, "country_code"])
+    history.loc[closing, "valid_to"] = as_of
+    history.loc[closing, "is_current"] = 0
+
+    opened = rows[~known | changed].copy()
+    opened.insert(0, "country_key", keys[~known | changed].astype(np.int64))
+    opened.insert(1, "version", versions[~known | changed].astype(np.int64))
+    opened["valid_from"] = as_of
+    opened["valid_to"] = None
+    opened["is_current"] = 1
+
+    if len(opened):
+        history = pd.concat([history, opened[DIM_COUNTRY_HISTORY_COLUMNS]], ignore_index=True)
+    history = history.sort_values(["country_key", "version"], kind="stable").reset_index(drop=True)
+    return history, int((~known).sum()), int(changed.sum())
+
+
+def current_dimension(history):
+    """Lignes de dim_country : la version courante de chaque pays, par country_key."""
+    current = history[history["is_current"] == 1]
+    dim = current[DIM_COUNTRY_COLUMNS].reset_index(drop=True)
+    dim["country_key"] = dim["country_key"].astype(key_dtype(int(dim["country_key"].max()) if len(dim) else 0))
+    for col in REGION_FLAG_COLUMNS:
+        dim[col] = dim[col].astype(np.uint8)
+    return dim
+
+
+def country_keys(history, codes):
+    """country_key courante de chaque code (ValueError si un code n'a pas de clé)."""
+    current = history[history["is_current"] == 1]
+    lookup = pd.Series(current["country_key"].to_numpy(), index=current["country_code"].to_numpy())
+    keys = lookup.reindex(np.asarray(codes, dtype=object))
+    if keys.isna().any():
+        missing = sorted(keys.index[keys.isna()].astype(str))
+        raise ValueError(f"country_code sans clé de substitution : {missing[:10]}")
+    max_key = int(keys.max()) if len(keys) else 0
+    return keys.to_numpy(dtype=np.int64).astype(key_dtype(max_key))
+
+
+def migrate_legacy_tables(conn, manifest_dir, dialect="mssql"):
+    """Met de côté l'ancien schéma (faits clés par country_code) ; retourne les tables renommées.
+
+    population_data, dim_country et dim_year deviennent <table>_v1 ; les tables reconstruites
+    à chaque chargement (cube, table pont, projections) sont supprimées. Leurs manifestes
+    sont effacés : le chargement suivant remplit entièrement le nouveau schéma.
+    Même opération que le bloc de migration de Script_ETL_Data_Warehouse.sql.
+    """
+    if "country_code" not in table_columns(conn, "population_data", dialect):
+        return []
+    renamed = [table for table in LEGACY_RENAMED if table_columns(conn, table, dialect)]
+    cursor = conn.cursor()
+    try:
+        for table in LEGACY_REBUILT:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        for table in renamed:
+            if dialect == "sqlite":
+                cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_v1")
+            else:
+                cursor.execute(f"EXEC sp_rename '{table}', '{table}_v1'")
+        conn.commit()
+    finally:
+        cursor.close()
+    for table in LEGACY_RENAMED + LEGACY_REBUILT:
+        path = manifest_path(manifest_dir, table)
+        if os.path.exists(path):
+            os.remove(path)
+    return renamed
+
+
+def migrate_legacy_projection(conn, manifest_dir, dialect="mssql"):
+    """Supprime population_projection si elle est encore clé par country_code ; retourne True si c'est le cas.
+
+    La table est remplacée en entier à chaque `project` : elle est recréée par country_key
+    et remplie par le chargement qui suit (même bloc dans Script_ETL_Data_Warehouse.sql).
+    """
+    if "country_code" not in table_columns(conn, "population_projection", dialect):
+        return False
+    cursor = conn.cursor()
+    try:
+        cursor.execute("DROP TABLE population_projection")
+        conn.commit()
+    finally:
+        cursor.close()
+    path = manifest_path(manifest_dir, "population_projection")
+    if os.path.exists(path):
+        os.remove(path)
+    return True
@@ -0,0 +1,160 @@
+"""
+Rendu des figures de l'EDA en mode batch, sans affichage.
+
+Les trois figures (Figure_1 ... Figure_3) sont produites avec le backend
+non interactif Agg, dans des processus séparés (une figure par worker) :
+aucun plt.show() bloquant, exécutable sur un serveur.
+
+Chaque figure a une empreinte calculée sur ses données d'entrée. Un manifeste
+(figures_manifest.json) conserve l'empreinte du dernier rendu : une figure dont
+les données n'ont pas changé et dont le PNG existe n'est pas redessinée.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+FIGURES = {}
+MANIFEST_FILE = "figures_manifest.json"
+
+# À incrémenter quand le code de rendu change, pour forcer un nouveau rendu
+RENDER_VERSION = 1
+
+
+def figure(name, filename):
+    """Enregistre une fonction de rendu render(data, ax) -> None pour le fichier PNG donné."""
+    def decorator(func):
+        FIGURES[name] = (filename, func)
+        return func
+    return decorator
+
+
+@figure("distribution", "Figure_1 Distribution de la population par pays en 2023.png")
+def render_distribution(data, ax):
+    import seaborn as sns
+
+    sns.histplot(data["values"], bins=30, kde=True, ax=ax)
+    ax.set_xlabel(f"Population en {data['year']}")
+    ax.set_ylabel("Nombre de pays")
+    ax.set_title(f"Distribution de la population par pays en {data['year']}")
+
+
+@figure("world_population", "Figure_2 Evolution de la population mondiale entre 1960 et 2023.png")
+def render_world_population(data, ax):
+    ax.plot(data["years"], data["population"], marker="o", linestyle="-")
+    ax.set_xlabel("Année")
+    ax.set_ylabel("Population mondiale")
+    ax.set_title(f"Évolution de la population mondiale ({data['years'][0]}-{data['years'][-1]})")
+    ax.tick_params(axis="x", rotation=45)
+    ax.grid()
+
+
+@figure("top_countries", "Figure_3 Evolution de la population des cinq pays les plus peuplés.png")
+def render_top_countries(data, ax):
+    for code, values in data["series"].items():
+        ax.plot(data["years"], values, label=code)
+    ax.set_xlabel("Année")
+    ax.set_ylabel("Population")
+    ax.set_title(f"Évolution de la population des {len(data['series'])} pays les plus peuplés")
+    ax.legend()
+    ax.tick_params(axis="x", rotation=45)
+    ax.grid()
+
+
+def figure_inputs(profile):
+    """Données d'entrée de chaque figure à partir d'un PopulationProfile (streaming.profile_chunks)."""
+    world = profile.world_population()
+    years = list(world.index)
+    top = profile.top
+    return {
+        "distribution": {"year": profile.reference_year, "values": profile.reference_distribution()},
+        "world_population": {"years": years, "population": world.to_numpy()},
+        "top_countries": {
+            "years": years,
+            "series": {row["country_code"]: row[years].to_numpy(dtype=np.float64) for _, row in top.iterrows()},
+        },
+    }
+
+
+def _update_digest(digest, value):
+    if isinstance(value, np.ndarray):
+        digest.update(f"ndarray{value.dtype}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (pd.Series, pd.DataFrame)):
+        _update_digest(digest, pd.util.hash_pandas_object(value).to_numpy())
+    elif isinstance(value, dict):
+        for key in sorted(value):
+            digest.update(repr(key).encode())
+            _update_digest(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"seq{len(value)}".encode())
+        for item in value:
+            _update_digest(digest, item)
+    else:
+        digest.update(repr(value).encode())
+
+
+def fingerprint(name, data):
+    """Empreinte SHA-256 des données d'une figure (et de la version du rendu)."""
+    digest = hashlib.sha256(f"{name}:{RENDER_VERSION}".encode())
+    _update_digest(digest, data)
+    return digest.hexdigest()
+
+
+def _render(name, data, path, dpi):
+    # Exécuté dans un processus worker : backend Agg choisi avant l'import de pyplot
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    try:
+        FIGURES[name][1](data, ax)
+        fig.tight_layout()
+        tmp_path = f"{path}.tmp.png"
+        fig.savefig(tmp_path, dpi=dpi)
+        os.replace(tmp_path, path)
+    finally:
+        plt.close(fig)
+    return path
+
+
+def _read_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def render_all(inputs, directory=".", max_workers=None, force=False, dpi=100):
+    """Rend les figures dont les données ont changé ; retourne {nom: "rendered" | "unchanged"}."""
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    manifest = _read_manifest(manifest_path)
+
+    status, pending = {}, {}
+    for name, data in inputs.items():
+        path = os.path.join(directory, FIGURES[name][0])
+        digest = fingerprint(name, data)
+        if not force and manifest.get(name) == digest and os.path.exists(path):
+            status[name] = "unchanged"
+        else:
+            pending[name] = (data, path, digest)
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=max_workers or min(len(pending), os.cpu_count() or 1)) as pool:
+            futures = {name: pool.submit(_render, name, data, path, dpi)
+                       for name, (data, path, _) in pending.items()}
+            for name, future in futures.items():
+                future.result()
+                manifest[name] = pending[name][2]
+                status[name] = "rendered"
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, indent=2, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+    return status
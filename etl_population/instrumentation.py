@@ -0,0 +1,188 @@
+"""
+Instrumentation des étapes du pipeline.
+
+Chaque étape (lecture, nettoyage, export, création de table, insertion,
+répartition par continent, graphiques...) est enveloppée dans
+RunRecorder.stage(), qui mesure la durée, le pic de mémoire résidente (RSS)
+et reçoit les compteurs de l'étape : lignes en entrée / en sortie / rejetées,
+octets lus / écrits.
+
+    run = RunRecorder()
+    with run.stage("read", bytes_read=file_size(path)) as stage:
+        df = ...
+        stage.rows_out = len(df)
+    run.write_json("run_report.json")
+    run.write_prometheus("etl_metrics.prom")
+
+Le rapport JSON conserve l'historique d'une exécution ; le fichier au format
+texte Prometheus peut être exposé par le textfile collector de node_exporter.
+Une étape exécutée plusieurs fois dans la même exécution (par exemple `insert`
+sous `all`) n'y a qu'un échantillon par métrique : durées et compteurs sont
+additionnés, le pic de mémoire est le maximum, etl_stage_runs compte les passages
+et etl_stage_success vaut 0 si l'un d'eux a échoué.
+"""
+
+import json
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METRIC_PREFIX = "etl_stage"
+
+# (nom du champ, nom de la métrique, description)
+_METRICS = [
+    ("wall_seconds", "duration_seconds", "Durée de l'étape en secondes"),
+    ("rows_in", "rows_in", "Lignes reçues par l'étape"),
+    ("rows_out", "rows_out", "Lignes produites par l'étape"),
+    ("rows_rejected", "rows_rejected", "Lignes rejetées par l'étape"),
+    ("bytes_read", "bytes_read", "Octets lus par l'étape"),
+    ("bytes_written", "bytes_written", "Octets écrits par l'étape"),
+    ("peak_rss_bytes", "peak_rss_bytes", "Pic de mémoire résidente pendant l'étape"),
+]
+
+
+def file_size(path):
+    """Taille du fichier en octets (None s'il n'existe pas)."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def _reset_peak_rss():
+    # Linux : remet VmHWM à la RSS courante pour mesurer le pic propre à l'étape
+    try:
+        with open("/proc/self/clear_refs", "w") as handle:
+            handle.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_bytes():
+    """Pic de RSS du processus (VmHWM sous Linux, ru_maxrss ailleurs, None sous Windows)."""
+    try:
+        with open("/proc/self/status") as handle:
+            for line in handle:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    status: str = "running"
+    started_at: str = None
+    wall_seconds: float = None
+    rows_in: int = None
+    rows_out: int = None
+    rows_rejected: int = 0
+    bytes_read: int = None
+    bytes_written: int = None
+    peak_rss_bytes: int = None
+    error: str = None
+
+
+class RunRecorder:
+    """Collecte les métriques de chaque étape d'une exécution du pipeline."""
+
+    def __init__(self, pipeline="population_etl", run_id=None):
+        self.pipeline = pipeline
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name, rows_in=None, bytes_read=None):
+        metrics = StageMetrics(name, started_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                               rows_in=rows_in, bytes_read=bytes_read)
+        self.stages.append(metrics)
+        _reset_peak_rss()
+        start = time.perf_counter()
+        try:
+            yield metrics
+            metrics.status = "success"
+        except BaseException as e:
+            metrics.status, metrics.error = "failed", f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            metrics.wall_seconds = round(time.perf_counter() - start, 6)
+            metrics.peak_rss_bytes = peak_rss_bytes()
+
+    def report(self):
+        return {
+            "pipeline": self.pipeline,
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "stages": [asdict(stage) for stage in self.stages],
+        }
+
+    def write_json(self, path):
+        _atomic_write(path, json.dumps(self.report(), indent=2, ensure_ascii=False))
+        return path
+
+    def aggregated(self):
+        """{nom d'étape: (passages, {champ: valeur}, réussie)} : une entrée par nom, dans l'ordre d'apparition."""
+        merged = {}
+        for stage in self.stages:
+            runs, values, success = merged.get(stage.name, (0, {}, True))
+            for field_name, _, _ in _METRICS:
+                value, previous = getattr(stage, field_name), values.get(field_name)
+                if value is None or previous is None:
+                    values[field_name] = value if previous is None else previous
+                elif field_name == "peak_rss_bytes":
+                    values[field_name] = max(previous, value)
+                elif field_name == "wall_seconds":
+                    values[field_name] = round(previous + value, 6)
+                else:
+                    values[field_name] = previous + value
+            merged[stage.name] = (runs + 1, values, success and stage.status == "success")
+        return merged
+
+    def prometheus_text(self):
+        stages = self.aggregated()
+        lines = []
+
+        def family(full_name, description, samples):
+            lines.append(f"# HELP {full_name} {description}")
+            lines.append(f"# TYPE {full_name} gauge")
+            for name, value in samples:
+                if value is not None:
+                    lines.append(f'{full_name}{{pipeline="{self.pipeline}",stage="{name}"}} {value}')
+
+        for field_name, metric, description in _METRICS:
+            family(f"{METRIC_PREFIX}_{metric}", description,
+                   [(name, values[field_name]) for name, (_, values, _) in stages.items()])
+        family(f"{METRIC_PREFIX}_runs", "Passages dans l'étape pendant l'exécution",
+               [(name, runs) for name, (runs, _, _) in stages.items()])
+        family(f"{METRIC_PREFIX}_success", "1 si l'étape a réussi (tous ses passages), 0 sinon",
+               [(name, int(success)) for name, (_, _, success) in stages.items()])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        _atomic_write(path, self.prometheus_text())
+        return path
+
+
+def _atomic_write(path, text):
+    # Le textfile collector ne doit jamais lire un fichier à moitié écrit
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(text)
+    os.replace(tmp_path, path)
@@ -0,0 +1,91 @@
+"""
+Mesures dérivées de la population, calculées pour tous les pays à la fois.
+
+Le bloc des années (pays x années) est traité comme une seule matrice ; chaque
+mesure est une opération sur des tranches décalées de cette matrice :
+
+    yoy_change      -> x[t] - x[t-1]
+    yoy_growth      -> x[t] / x[t-1] - 1
+    acceleration    -> yoy_change[t] - yoy_change[t-1]
+    rolling_mean_w  -> moyenne des w dernières années (t incluse)
+    cagr_s          -> (x[t] / x[t-s]) ** (1 / s) - 1, taux de croissance annuel moyen sur s ans
+
+Une mesure vaut NaN quand l'historique ne suffit pas (premières années) ou que
+la population de référence est nulle ou manquante. Les mesures par défaut
+(FACT_MEASURE_COLUMNS) sont matérialisées dans population_data par
+unpivot.unpivot ; fastest_growing classe les pays sur une période quelconque
+à partir de deux colonnes du bloc.
+"""
+
+import numpy as np
+import pandas as pd
+
+from etl_population.schema import CAGR_SPANS, ROLLING_WINDOW
+
+
+def _shifted(block, lag):
+    """Bloc décalé de `lag` années vers la droite (NaN sur les `lag` premières colonnes)."""
+    shifted = np.full_like(block, np.nan)
+    if lag < block.shape[1]:
+        shifted[:, lag:] = block[:, :block.shape[1] - lag]
+    return shifted
+
+
+def _ratio(block, lag):
+    previous = _shifted(block, lag)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(previous > 0, block / previous, np.nan)
+
+
+def derived_measures(block, spans=CAGR_SPANS, window=ROLLING_WINDOW):
+    """{mesure: matrice (pays x années)} pour le bloc des années.
+
+    Avec les paramètres par défaut, les mesures sont exactement schema.FACT_MEASURE_COLUMNS, dans cet ordre.
+    """
+    block = np.asarray(block, dtype=np.float64)
+    change = block - _shifted(block, 1)
+    measures = {
+        "yoy_change": change,
+        "yoy_growth": _ratio(block, 1) - 1.0,
+        "acceleration": change - _shifted(change, 1),
+    }
+
+    # Somme de `window` tranches décalées (sans l'erreur d'arrondi d'une différence de cumsum)
+    rolling = np.full_like(block, np.nan)
+    n_years = block.shape[1]
+    if window <= n_years:
+        rolling[:, window - 1:] = sum(block[:, k:n_years - window + 1 + k] for k in range(window)) / window
+    measures[f"rolling_mean_{window}"] = rolling
+
+    for span in spans:
+        with np.errstate(invalid="ignore"):
+            measures[f"cagr_{span}"] = _ratio(block, span) ** (1.0 / span) - 1.0
+    return measures
+
+
+def cagr(df, start, end):
+    """Taux de croissance annuel moyen de chaque pays entre deux années (Series par country_code)."""
+    start, end = int(start), int(end)
+    if end <= start:
+        raise ValueError(f"Période invalide : {start}-{end}")
+    first = df[str(start)].to_numpy(dtype=np.float64, na_value=np.nan)
+    last = df[str(end)].to_numpy(dtype=np.float64, na_value=np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(first > 0, (last / first) ** (1.0 / (end - start)) - 1.0, np.nan)
+    return pd.Series(rate, index=pd.Index(df["country_code"].to_numpy(dtype=object), name="country_code"),
+                     name=f"cagr_{start}_{end}")
+
+
+def fastest_growing(df, start, end, k=10, label_column="name_en"):
+    """Les k pays à la plus forte croissance annuelle moyenne entre `start` et `end`."""
+    rate = cagr(df, start, end)
+    order = np.argsort(np.where(np.isnan(rate.to_numpy()), np.inf, -rate.to_numpy()), kind="stable")[:k]
+    rows = df.iloc[order]
+    return pd.DataFrame({
+        "rank": np.arange(1, len(order) + 1),
+        "country_code": rows["country_code"].to_numpy(),
+        label_column: rows[label_column].to_numpy(),
+        str(start): rows[str(start)].to_numpy(dtype=np.float64),
+        str(end): rows[str(end)].to_numpy(dtype=np.float64),
+        "cagr": rate.to_numpy()[order],
+    })
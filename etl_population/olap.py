@@ -0,0 +1,259 @@
+"""
+Moteur de requêtes OLAP en mémoire sur le jeu nettoyé.
+
+Le modèle complet (pays x années, indicateurs, idh_group, continents) tient en
+mémoire : les requêtes des tableaux de bord et les analyses ponctuelles sont
+évaluées sur des tableaux NumPy, sans connexion à SQL Server.
+
+    engine = QueryEngine.from_source("population_mondiale.csv")
+    engine.query(where={"g20": True}, group_by="idh_group", years=(2000, 2023), top=3)
+
+Une requête filtre les pays (indicateurs, idh_group, continent, country_code),
+restreint les années, regroupe (country_code, idh_group, continent ou un
+indicateur) et garde éventuellement les `top` groupes les plus peuplés la
+dernière année. Le résultat a une ligne par groupe et une colonne par année
+(somme des populations, NaN si aucune valeur), comme le résultat de
+`QueryEngine.to_sql` exécuté sur population_mondiale_1960_2023.
+
+Les résultats sont gardés dans un cache LRU dont la clé contient l'empreinte
+du jeu de données : un nouveau jeu (refresh) invalide tout le cache.
+"""
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from etl_population.continents import pack_flags, regions_from_config, route
+from etl_population.cube import region_label
+from etl_population.schema import FLAG_COLUMNS, IDH_COLUMN, YEAR_COLUMNS, year_columns_of
+
+TOTAL = "total"
+GROUPS = ("country_code", IDH_COLUMN, "continent") + tuple(FLAG_COLUMNS)
+DEFAULT_CACHE_SIZE = 128
+
+
+def dataset_hash(df):
+    """Empreinte SHA-256 du contenu du DataFrame (indépendante de l'index)."""
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64)
+    digest = hashlib.sha256(",".join(map(str, df.columns)).encode())
+    digest.update(hashes.tobytes())
+    return digest.hexdigest()
+
+
+def _values(value):
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(sorted(value, key=str))
+    return (value,)
+
+
+@dataclass(frozen=True)
+class Query:
+    """Requête normalisée (hashable : sert de clé du cache de résultats)."""
+    where: tuple = ()
+    years: tuple = None
+    group_by: str = None
+    top: int = None
+
+    @classmethod
+    def build(cls, where=None, years=None, group_by=None, top=None):
+        where = where or {}
+        for key in where:
+            if key not in GROUPS:
+                raise ValueError(f"Filtre inconnu : {key!r}")
+        if group_by is not None and group_by not in GROUPS:
+            raise ValueError(f"Regroupement inconnu : {group_by!r}")
+        if top is not None and top < 1:
+            raise ValueError(f"top doit être positif : {top}")
+        normalized = tuple(sorted((key, _values(value)) for key, value in where.items()))
+        return cls(normalized, tuple(int(year) for year in years) if years else None, group_by, top)
+
+
+class QueryEngine:
+    """Index colonnaire du jeu nettoyé + cache LRU des résultats."""
+
+    def __init__(self, df, year_columns=YEAR_COLUMNS, regions=None, cache_size=DEFAULT_CACHE_SIZE,
+                 digest=None):
+        self.year_columns = list(year_columns)
+        self.regions = regions or regions_from_config()
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.hits = self.misses = 0
+        self.refresh(df, digest)
+
+    @classmethod
+    def from_source(cls, source, strategy="row_mean", cache=None, **kwargs):
+        """Moteur sur le jeu nettoyé du cache colonnaire ; l'empreinte est la clé de ce cache."""
+        from etl_population.cache import cache_key, clean_params, load_cleaned
+
+        df = load_cleaned(source, strategy=strategy, cache=cache)
+        kwargs.setdefault("year_columns", year_columns_of(df.columns))
+        return cls(df, digest=cache_key(source, clean_params(strategy)), **kwargs)
+
+    def refresh(self, df, digest=None):
+        """Recharge les tableaux ; le cache est vidé si l'empreinte du jeu a changé."""
+        digest = digest or dataset_hash(df)
+        if digest == getattr(self, "digest", None):
+            return
+        self.digest = digest
+        self._cache.clear()
+
+        self.codes = df["country_code"].to_numpy(dtype=object)
+        self.block = df[self.year_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.years = np.array([int(year) for year in self.year_columns])
+        self.flags = {flag: df[flag].fillna(False).to_numpy(dtype=bool) for flag in FLAG_COLUMNS}
+        self.idh = df[IDH_COLUMN].to_numpy(dtype=object)
+        self.continent_labels = [region_label(region.table) for region in self.regions]
+        self.continents = route(pack_flags(df), self.regions)
+
+    def cache_info(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache), "maxsize": self.cache_size}
+
+    # Évaluation
+
+    def _member_mask(self, key, values):
+        if key in self.flags:
+            return np.isin(self.flags[key], [bool(value) for value in values])
+        if key == "continent":
+            unknown = set(values) - set(self.continent_labels)
+            if unknown:
+                raise ValueError(f"Continent inconnu : {sorted(unknown)}")
+            columns = [self.continent_labels.index(value) for value in values]
+            return self.continents[:, columns].any(axis=1)
+        column = self.codes if key == "country_code" else self.idh
+        return np.isin(column, list(values))
+
+    def _year_slice(self, years):
+        if years is None:
+            return slice(None)
+        start, end = years
+        positions = np.flatnonzero((self.years >= start) & (self.years <= end))
+        if not len(positions):
+            raise ValueError(f"Aucune année entre {start} et {end}")
+        return slice(positions[0], positions[-1] + 1)
+
+    def _membership(self, group_by, rows):
+        """Matrice (pays retenus x groupes) et libellés des groupes."""
+        if group_by is None:
+            return np.ones((len(rows), 1), dtype=bool), [TOTAL]
+        if group_by == "continent":
+            return self.continents[rows], list(self.continent_labels)
+        if group_by in self.flags:
+            values = self.flags[group_by][rows]
+            return np.column_stack([~values, values]), [0, 1]
+        column = (self.codes if group_by == "country_code" else self.idh)[rows]
+        labels, inverse = np.unique(column.astype(str), return_inverse=True)
+        return inverse[:, None] == np.arange(len(labels))[None, :], list(labels)
+
+    def _evaluate(self, query):
+        rows = np.ones(len(self.codes), dtype=bool)
+        for key, values in query.where:
+            rows &= self._member_mask(key, values)
+        rows = np.flatnonzero(rows)
+
+        block = self.block[rows, self._year_slice(query.years)]
+        membership, labels = self._membership(query.group_by, rows)
+        weights = membership.astype(np.float64)
+        valid = ~np.isnan(block)
+        population = weights.T @ np.where(valid, block, 0.0)
+        counts = weights.T @ valid.astype(np.float64)
+        population[counts == 0] = np.nan
+
+        years = self.years[self._year_slice(query.years)]
+        result = pd.DataFrame(population, index=pd.Index(labels, name=query.group_by or "group"),
+                              columns=years)
+        if query.group_by is not None:
+            # Groupes sans pays retenu écartés, libellés triés : même résultat qu'un GROUP BY ... ORDER BY
+            result = result[membership.any(axis=0)].sort_index()
+        if query.top is not None:
+            order = np.lexsort((np.arange(len(result)), np.nan_to_num(-result[years[-1]].to_numpy(), nan=np.inf)))
+            result = result.iloc[order[:query.top]]
+        return result
+
+    def query(self, where=None, years=None, group_by=None, top=None):
+        """Population par groupe (lignes) et par année (colonnes), depuis le cache si possible."""
+        query = Query.build(where, years, group_by, top)
+        key = (self.digest, query)
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key].copy()
+        self.misses += 1
+        result = self._evaluate(query)
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result.copy()
+
+    # Équivalent SQL (table population_mondiale_1960_2023)
+
+    def _region_predicate(self, label):
+        region = self.regions[self.continent_labels.index(label)]
+        terms = [f"COALESCE([{flag}], 0) = 1" for flag in region.all_of]
+        terms += [f"COALESCE([{flag}], 0) = 0" for flag in region.none_of]
+        return "(" + " AND ".join(terms) + ")"
+
+    def to_sql(self, where=None, years=None, group_by=None, top=None, table="population_mondiale_1960_2023",
+               dialect="mssql"):
+        """Requête SQL paramétrée ("?") qui produit le même résultat que query()."""
+        query = Query.build(where, years, group_by, top)
+        year_range = self.years[self._year_slice(query.years)]
+        sums = ", ".join(f"SUM([{year}]) AS [{year}]" for year in year_range)
+
+        conditions, params = [], []
+        for key, values in query.where:
+            if key in self.flags:
+                conditions.append(f"COALESCE([{key}], 0) IN ({', '.join('?' for _ in values)})")
+                params += [int(bool(value)) for value in values]
+            elif key == "continent":
+                conditions.append("(" + " OR ".join(self._region_predicate(value) for value in values) + ")")
+            else:
+                conditions.append(f"[{key}] IN ({', '.join('?' for _ in values)})")
+                params += list(values)
+
+        def select(group_expr, extra=None):
+            filters = conditions + ([extra] if extra else [])
+            where_sql = f" WHERE {' AND '.join(filters)}" if filters else ""
+            if query.group_by is None:
+                group_sql = ""
+            elif query.group_by == "continent":
+                # Un continent sans pays retenu n'apparaît pas dans le résultat (comme un GROUP BY)
+                group_sql = " HAVING COUNT(*) > 0"
+            else:
+                group_sql = f" GROUP BY {group_expr}"
+            return f"SELECT {group_expr} AS grp, {sums} FROM {table}{where_sql}{group_sql}"
+
+        if query.group_by is None:
+            sql, select_params = select(f"'{TOTAL}'"), params
+        elif query.group_by == "continent":
+            parts = [select(f"'{label}'", self._region_predicate(label)) for label in self.continent_labels]
+            sql = " UNION ALL ".join(parts)
+            select_params = params * len(parts)
+        elif query.group_by in self.flags:
+            sql, select_params = select(f"COALESCE([{query.group_by}], 0)"), params
+        else:
+            sql, select_params = select(f"[{query.group_by}]"), params
+
+        order = f"[{year_range[-1]}] DESC, grp" if query.top is not None else "grp"
+        if query.top is not None and dialect == "mssql":
+            return f"SELECT TOP {query.top} * FROM ({sql}) AS q ORDER BY {order}", select_params
+        limit = f" LIMIT {query.top}" if query.top is not None else ""
+        return f"SELECT * FROM ({sql}) AS q ORDER BY {order}{limit}", select_params
+
+    def read_sql(self, conn, where=None, years=None, group_by=None, top=None,
+                 table="population_mondiale_1960_2023", dialect="mssql"):
+        """Exécute to_sql() sur une connexion DB-API et retourne le résultat au format de query()."""
+        sql, params = self.to_sql(where, years, group_by, top, table, dialect)
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            columns = [description[0] for description in cursor.description]
+        finally:
+            cursor.close()
+        result = pd.DataFrame.from_records(rows, columns=columns).set_index("grp")
+        result.index.name = group_by or "group"
+        result.columns = [int(column) for column in result.columns]
+        return result.astype(np.float64)
@@ -0,0 +1,311 @@
+"""
+Exécution native du flow NiFi INGESTION_POPULATION_MONDIALE, sous forme de DAG.
+
+Le flow est décrit dans le même format JSON que l'export NiFi
+(processors / connections / scheduling, voir flow_population.json). Chaque
+type de processeur NiFi est associé à une étape Python :
+
+    GetFile            -> chemin du fichier source
+    ConvertRecord      -> DataFrame nettoyé (cache colonnaire)
+    PutDatabaseRecord  -> chargement par lots ; la propriété "Region" filtre
+                          d'abord les lignes (tables par continent)
+
+Les branches indépendantes (les six tables par continent) s'exécutent en
+parallèle dans un pool de threads ou de processus. Le nombre d'étapes en
+cours est borné (contre-pression) et la sortie d'une étape est libérée dès
+que toutes les étapes suivantes l'ont consommée. Chaque étape est chronométrée
+et relancée indépendamment ("Retry Count").
+
+PutDatabaseRecord fait un upsert par country_code après le contrôle d'intégrité
+(etl_population/validation.py) : relancer le flow, à la main ou à chaque
+déclenchement du "Run Schedule", met les tables à jour sans les dupliquer.
+
+    python -m etl_population.orchestrator flow_population.json --sqlite warehouse.db
+    python -m etl_population.orchestrator flow_population.json --odbc "DRIVER=...;" --schedule
+"""
+
+import argparse
+import functools
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+PROCESSORS = {}
+
+NIFI_STANDARD = "org.apache.nifi.processors.standard."
+
+
+def processor(type_name):
+    """Associe une fonction Python (context, inputs, properties) -> sortie à un type de processeur."""
+    def decorator(func):
+        PROCESSORS[type_name] = func
+        return func
+    return decorator
+
+
+@dataclass
+class FlowContext:
+    """Paramètres communs aux étapes. `connect` doit être picklable en mode processus."""
+    connect: object = None
+    dialect: str = "mssql"
+    create_tables: bool = False
+
+
+@dataclass
+class StageResult:
+    id: str
+    name: str
+    status: str = "pending"
+    attempts: int = 0
+    elapsed: float = 0.0
+    error: str = None
+
+
+@dataclass
+class Flow:
+    name: str
+    processors: dict
+    upstream: dict
+    downstream: dict
+    schedule: str = None
+
+    @classmethod
+    def from_dict(cls, document):
+        flow = document["flow"]
+        processors = {p["id"]: p for p in flow["processors"]}
+        upstream = {pid: [] for pid in processors}
+        downstream = {pid: [] for pid in processors}
+        for connection in flow.get("connections", []):
+            source, destination = connection["sourceId"], connection["destinationId"]
+            if source not in processors or destination not in processors:
+                raise ValueError(f"Connexion vers un processeur inconnu : {source} -> {destination}")
+            upstream[destination].append(source)
+            downstream[source].append(destination)
+        for p in processors.values():
+            if p["type"] not in PROCESSORS:
+                raise ValueError(f"Type de processeur non supporté : {p['type']} ({p['name']})")
+        instance = cls(flow.get("name", "flow"), processors, upstream, downstream,
+                       flow.get("scheduling", {}).get("Run Schedule"))
+        instance.topological_order()
+        return instance
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path, encoding="utf-8") as handle:
+            return cls.from_dict(json.load(handle))
+
+    def topological_order(self):
+        remaining = {pid: len(preds) for pid, preds in self.upstream.items()}
+        ready = [pid for pid, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            pid = ready.pop(0)
+            order.append(pid)
+            for nxt in self.downstream[pid]:
+                remaining[nxt] -= 1
+                if remaining[nxt] == 0:
+                    ready.append(nxt)
+        if len(order) != len(self.processors):
+            raise ValueError("Le flow contient un cycle")
+        return order
+
+
+def _run_stage(type_name, context, inputs, properties, retries, retry_delay):
+    # Exécuté dans le worker : tentatives successives, durée totale mesurée
+    func = PROCESSORS[type_name]
+    start = time.perf_counter()
+    for attempt in range(1, retries + 2):
+        try:
+            return func(context, inputs, properties), attempt, time.perf_counter() - start
+        except Exception as e:
+            # Un échec déterministe (jeu invalide) ne se corrige pas en relançant
+            if attempt > retries or not getattr(e, "retryable", True):
+                raise StageFailed(str(e), attempt, time.perf_counter() - start) from e
+            time.sleep(retry_delay * attempt)
+
+
+class StageFailed(Exception):
+    def __init__(self, message, attempts, elapsed):
+        super().__init__(message)
+        self.attempts = attempts
+        self.elapsed = elapsed
+
+    def __reduce__(self):
+        return (StageFailed, (str(self), self.attempts, self.elapsed))
+
+
+class DagRunner:
+    """Exécute un Flow : une étape démarre dès que toutes ses étapes amont ont réussi."""
+
+    def __init__(self, flow, context=None, max_workers=4, max_in_flight=None, executor="thread",
+                 default_retries=0, retry_delay=1.0):
+        if executor not in ("thread", "process"):
+            raise ValueError("executor doit valoir 'thread' ou 'process'")
+        self.flow = flow
+        self.context = context or FlowContext()
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight or max_workers
+        self.executor = executor
+        self.default_retries = default_retries
+        self.retry_delay = retry_delay
+
+    def run(self):
+        flow = self.flow
+        results = {pid: StageResult(pid, p["name"]) for pid, p in flow.processors.items()}
+        waiting = {pid: len(preds) for pid, preds in flow.upstream.items()}
+        consumers = {pid: len(nexts) for pid, nexts in flow.downstream.items()}
+        outputs = {}
+        ready = [pid for pid in flow.topological_order() if waiting[pid] == 0]
+        running = {}
+
+        pool_class = ThreadPoolExecutor if self.executor == "thread" else ProcessPoolExecutor
+        with pool_class(max_workers=self.max_workers) as pool:
+            while ready or running:
+                # Contre-pression : pas plus de max_in_flight étapes soumises à la fois
+                while ready and len(running) < self.max_in_flight:
+                    pid = ready.pop(0)
+                    running[self._submit(pool, pid, outputs)] = pid
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pid = running.pop(future)
+                    result = results[pid]
+                    try:
+                        outputs[pid], result.attempts, result.elapsed = future.result()
+                        result.status = "success"
+                    except Exception as e:
+                        result.status, result.error = "failed", str(e)
+                        result.attempts = getattr(e, "attempts", result.attempts)
+                        result.elapsed = getattr(e, "elapsed", result.elapsed)
+                        self._skip_downstream(pid, results)
+
+                    for upstream in flow.upstream[pid]:
+                        consumers[upstream] -= 1
+                        if consumers[upstream] == 0:
+                            outputs.pop(upstream, None)  # sortie libérée dès qu'elle n'est plus utile
+                    if result.status == "success":
+                        for nxt in flow.downstream[pid]:
+                            waiting[nxt] -= 1
+                            if waiting[nxt] == 0 and results[nxt].status == "pending":
+                                ready.append(nxt)
+        return list(results.values())
+
+    def _submit(self, pool, pid, outputs):
+        spec = self.flow.processors[pid]
+        properties = spec.get("properties", {})
+        retries = int(properties.get("Retry Count", self.default_retries))
+        inputs = [outputs[upstream] for upstream in self.flow.upstream[pid]]
+        return pool.submit(_run_stage, spec["type"], self.context, inputs, properties,
+                           retries, self.retry_delay)
+
+    def _skip_downstream(self, pid, results):
+        for nxt in self.flow.downstream[pid]:
+            if results[nxt].status == "pending":
+                results[nxt].status = "skipped"
+                results[nxt].error = f"étape amont en échec : {results[pid].name}"
+                self._skip_downstream(nxt, results)
+
+
+# Étapes du flow
+
+@processor(NIFI_STANDARD + "GetFile")
+def get_file(context, inputs, properties):
+    path = os.path.join(properties.get("Input Directory", "."), properties["File Filter"])
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    return path
+
+
+@processor(NIFI_STANDARD + "ConvertRecord")
+def convert_record(context, inputs, properties):
+    from etl_population.cache import load_cleaned
+
+    (path,) = inputs
+    return load_cleaned(path, strategy=properties.get("Imputation Strategy", "row_mean"))
+
+
+@processor(NIFI_STANDARD + "PutDatabaseRecord")
+def put_database_record(context, inputs, properties):
+    """Upsert par "Update Keys" (country_code) : ni une exécution planifiée ni une relance ("Retry Count")
+    ne duplique un pays.
+
+    Comme `load` en ligne de commande, le jeu entier passe d'abord le contrôle d'intégrité :
+    une violation bloquante fait échouer l'étape sans rien écrire. Les colonnes d'années
+    viennent de l'en-tête du jeu (une année ajoutée par `ingest` est créée dans la table).
+    """
+    from etl_population.annual import add_year_columns
+    from etl_population.bulk_loader import BulkLoader, create_table, unique_key_index
+    from etl_population.continents import parse_region, split_by_region
+    from etl_population.delta_load import upsert_statement
+    from etl_population.schema import sql_column_definitions, year_columns_of
+    from etl_population.validation import validate
+
+    (df,) = inputs
+    table = properties["Table Name"]
+    years = year_columns_of(df.columns)
+    validate(df, years).raise_for_errors()
+    if "Region" in properties:
+        df = split_by_region(df, [parse_region(table, properties["Region"])])[table]
+
+    columns = list(df.columns)
+    key = properties.get("Update Keys", "country_code")
+    conn = context.connect()
+    try:
+        if context.create_tables:
+            create_table(conn, table, sql_column_definitions(context.dialect, years))
+            if context.dialect == "sqlite":
+                unique_key_index(conn, table, key)
+        add_year_columns(conn, table, years, context.dialect)
+        loader = BulkLoader(conn, table, columns, batch_size=int(properties.get("Batch Size", 1000)),
+                            statement=upsert_statement(table, [key], columns, context.dialect))
+        report = loader.load(df)
+    finally:
+        conn.close()
+    if report.errors:
+        first = report.errors[0]
+        raise RuntimeError(f"{len(report.errors)} lot(s) en erreur dans {table}, "
+                           f"premier : lignes {first.first_row}-{first.last_row} : {first.error}")
+    return df
+
+
+def print_results(results):
+    for result in results:
+        line = f"[{result.status:<7}] {result.name:<35} {result.elapsed:7.2f} s  ({result.attempts} tentative(s))"
+        print(line + (f" -- {result.error}" if result.error else ""))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exécute le flow INGESTION_POPULATION_MONDIALE sans NiFi.")
+    parser.add_argument("flow", help="fichier JSON du flow (format NiFi)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", help="base SQLite de substitution (tables créées si besoin)")
+    target.add_argument("--odbc", help="chaîne de connexion pyodbc vers SQL Server")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--schedule", action="store_true",
+                        help="attendre chaque déclenchement du 'Run Schedule' du flow au lieu d'exécuter une fois")
+    args = parser.parse_args(argv)
+
+    flow = Flow.from_json(args.flow)
+    if args.sqlite:
+        from etl_population.bulk_loader import connect_standin
+        context = FlowContext(functools.partial(connect_standin, args.sqlite), "sqlite", create_tables=True)
+    else:
+        import pyodbc
+        context = FlowContext(functools.partial(pyodbc.connect, args.odbc), "mssql")
+    runner = DagRunner(flow, context, max_workers=args.workers, executor=args.executor)
+
+    if args.schedule:
+        from etl_population.cron import run_on_schedule
+        run_on_schedule(flow.schedule, lambda: print_results(runner.run()))
+    else:
+        results = runner.run()
+        print_results(results)
+        return 0 if all(r.status == "success" for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
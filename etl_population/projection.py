@@ -0,0 +1,159 @@
+"""
+Projection de tendance de la population de tous les pays, jusqu'à 2030.
+
+L'entrepôt s'arrête à la dernière année observée (2023) ; ce module estime les
+années suivantes par une tendance ajustée sur les `window` dernières années :
+
+    linear      -> population = a + b * t
+    log_linear  -> log(population) = a + b * t   (croissance à taux constant)
+
+Tous les pays sont ajustés ensemble. Les moindres carrés d'un pays se
+ramènent aux équations normales G [a, b] = r, où G (2 x 2) et r ne dépendent
+que de sommes sur ses années valides. Ces sommes sont des produits
+matriciels sur le bloc (pays x années) ; les n systèmes sont ensuite résolus
+par un seul appel à np.linalg.solve sur la pile (n, 2, 2). Un pays avec des
+années manquantes garde ainsi son propre ajustement, sans boucle Python.
+
+t est compté depuis la dernière année observée (base_year) : a est la valeur
+ajustée de cette année. fit_rmse est l'écart quadratique moyen de
+l'ajustement (en habitants pour linear, en écart relatif pour log_linear).
+Un pays ayant moins de deux années valides dans la fenêtre n'est pas projeté.
+
+Les estimations forment une partition séparée, population_projection
+(is_estimate = 1, clé (country_key, year) comme les faits), jamais mélangée
+aux faits observés de population_data :
+
+    fit = fit_trends(block, years, window=15, model="log_linear")
+    projection_frame(df, years, horizon=2030)
+"""
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from etl_population.dimensions import key_dtype
+from etl_population.schema import PROJECTION_COLUMNS, SEPARATOR, YEAR_COLUMNS
+
+MODELS = ("linear", "log_linear")
+DEFAULT_MODEL = "log_linear"
+DEFAULT_WINDOW = 15
+DEFAULT_HORIZON = 2030
+PROJECTION_FILE = "staging_population_projection.csv"
+
+
+@dataclass
+class TrendFit:
+    """Coefficients de tous les pays (tableaux de longueur n, NaN si non projetable)."""
+    model: str
+    base_year: int
+    window: int
+    intercept: np.ndarray
+    slope: np.ndarray
+    rmse: np.ndarray
+    points: np.ndarray
+
+    @property
+    def fitted(self):
+        return ~np.isnan(self.slope)
+
+    def project(self, years):
+        """Matrice (pays x années) des estimations pour `years` (populations négatives ramenées à 0)."""
+        t = np.asarray(years, dtype=np.float64) - self.base_year
+        values = self.intercept[:, None] + self.slope[:, None] * t[None, :]
+        if self.model == "log_linear":
+            return np.exp(values)
+        return np.maximum(values, 0.0)
+
+
+def fit_trends(block, year_columns=YEAR_COLUMNS, window=DEFAULT_WINDOW, model=DEFAULT_MODEL):
+    """Ajuste la tendance de chaque ligne du bloc sur ses `window` dernières années."""
+    if model not in MODELS:
+        raise ValueError(f"Modèle de projection inconnu : {model!r} (attendu : {', '.join(MODELS)})")
+    if window < 2:
+        raise ValueError(f"La fenêtre d'ajustement doit couvrir au moins deux années : {window}")
+    years = np.asarray([int(year) for year in year_columns], dtype=np.int64)
+    window = min(window, len(years))
+    t = (years[-window:] - years[-1]).astype(np.float64)
+
+    y = np.asarray(block, dtype=np.float64)[:, -window:]
+    if model == "log_linear":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            y = np.where(y > 0, np.log(y), np.nan)
+    valid = ~np.isnan(y)
+    weights = valid.astype(np.float64)
+    y = np.where(valid, y, 0.0)
+
+    # Équations normales de tous les pays : sommes par produits matriciels, puis une résolution groupée
+    points = weights.sum(axis=1)
+    sum_t = weights @ t
+    gram = np.empty((len(y), 2, 2))
+    gram[:, 0, 0] = points
+    gram[:, 0, 1] = gram[:, 1, 0] = sum_t
+    gram[:, 1, 1] = weights @ (t * t)
+    rhs = np.column_stack([y.sum(axis=1), y @ t])
+
+    solvable = (points >= 2) & (gram[:, 0, 0] * gram[:, 1, 1] - sum_t * sum_t > 0)
+    coef = np.full((len(y), 2), np.nan)
+    coef[solvable] = np.linalg.solve(gram[solvable], rhs[solvable][:, :, None])[:, :, 0]
+
+    residuals = np.where(valid, y - (coef[:, :1] + coef[:, 1:] * t[None, :]), 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rmse = np.sqrt((residuals * residuals).sum(axis=1) / points)
+    return TrendFit(model, int(years[-1]), window, coef[:, 0], coef[:, 1],
+                    np.where(solvable, rmse, np.nan), points.astype(np.int64))
+
+
+def backtest(block, year_columns=YEAR_COLUMNS, holdout=5, window=DEFAULT_WINDOW, model=DEFAULT_MODEL):
+    """Erreur absolue relative moyenne de chaque pays sur ses `holdout` dernières années.
+
+    La tendance est ajustée sans ces années, puis comparée aux valeurs observées :
+    c'est l'ordre de grandeur de l'erreur attendue à `holdout` ans d'horizon.
+    """
+    block = np.asarray(block, dtype=np.float64)
+    fit = fit_trends(block[:, :-holdout], year_columns[:-holdout], window, model)
+    observed = block[:, -holdout:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        error = np.abs(fit.project([int(year) for year in year_columns[-holdout:]]) / observed - 1.0)
+    scored = (observed > 0) & ~np.isnan(error)
+    with np.errstate(invalid="ignore"):
+        return np.where(scored, error, 0.0).sum(axis=1) / scored.sum(axis=1)
+
+
+def projection_years(base_year, horizon=DEFAULT_HORIZON):
+    return list(range(int(base_year) + 1, int(horizon) + 1))
+
+
+def projection_frame(df, year_columns=YEAR_COLUMNS, horizon=DEFAULT_HORIZON, window=DEFAULT_WINDOW,
+                     model=DEFAULT_MODEL, keys=None):
+    """Lignes de population_projection : une par (pays projetable, année après la dernière observée).
+
+    `keys` : country_key de chaque ligne de `df` (dimensions.country_keys), comme pour unpivot ;
+    par défaut les lignes sont numérotées à partir de 1.
+    """
+    block = df[year_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    fit = fit_trends(block, year_columns, window, model)
+    years = projection_years(fit.base_year, horizon)
+    rows = np.flatnonzero(fit.fitted)
+    n_years = len(years)
+    if keys is None:
+        keys = np.arange(1, len(df) + 1, dtype=key_dtype(len(df)))
+    return pd.DataFrame({
+        "country_key": np.repeat(np.asarray(keys)[rows], n_years),
+        "year": np.tile(np.asarray(years, dtype=np.int16), len(rows)),
+        "population": fit.project(years)[rows].ravel(),
+        "is_estimate": np.uint8(1),
+        "model": model,
+        "base_year": fit.base_year,
+        "fit_window": fit.window,
+        "fit_rmse": np.repeat(fit.rmse[rows], n_years),
+    }, columns=PROJECTION_COLUMNS)
+
+
+def write_projection(frame, directory, encoding="utf-8"):
+    """Fichier de staging de population_projection (même format que unpivot.write_staging)."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, PROJECTION_FILE)
+    frame.to_csv(path, sep=SEPARATOR, index=False, encoding=encoding, lineterminator="\r\n")
+    return path
@@ -0,0 +1,77 @@
+"""
+Index de classement par année pour les requêtes top-N et le bar chart race.
+
+Le classement de toutes les années est calculé une seule fois par un argsort
+sur le bloc des années (pays x années). Avec la table inverse des rangs et
+le dictionnaire country_code -> position de ligne :
+
+    - le top-k d'une année se lit sur les k premières lignes de l'ordre ;
+    - l'historique de rang d'un pays est une ligne de la table des rangs ;
+
+sans refaire de nlargest ni de filtre df[df['country_code'] == ...].
+"""
+
+import numpy as np
+import pandas as pd
+
+from etl_population.schema import YEAR_COLUMNS
+
+
+class RankingIndex:
+    """Classement décroissant de la population pour chaque année (valeurs manquantes en dernier)."""
+
+    def __init__(self, codes, block, year_columns=YEAR_COLUMNS):
+        self.codes = np.asarray(codes, dtype=object)
+        self.years = [int(year) for year in year_columns]
+        self.values = np.asarray(block, dtype=np.float64)
+        self._year_pos = {year: j for j, year in enumerate(self.years)}
+        self.position = {code: i for i, code in enumerate(self.codes)}
+
+        keys = np.where(np.isnan(self.values), np.inf, -self.values)
+        self.order = np.argsort(keys, axis=0, kind="stable")        # rang -> ligne
+        self.ranks = np.empty_like(self.order)                      # ligne -> rang
+        np.put_along_axis(self.ranks, self.order,
+                          np.arange(len(self.codes))[:, None].repeat(len(self.years), axis=1), axis=0)
+
+    @classmethod
+    def from_frame(cls, df, year_columns=YEAR_COLUMNS):
+        block = df[year_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        return cls(df["country_code"].to_numpy(), block, year_columns)
+
+    def _column(self, year):
+        try:
+            return self._year_pos[int(year)]
+        except KeyError:
+            raise KeyError(f"Année absente de l'index : {year}") from None
+
+    def top(self, year, k=5):
+        """Les k pays les plus peuplés de l'année (rang à partir de 1)."""
+        j = self._column(year)
+        rows = self.order[:k, j]
+        return pd.DataFrame({
+            "rank": np.arange(1, len(rows) + 1),
+            "country_code": self.codes[rows],
+            "population": self.values[rows, j],
+        })
+
+    def rank_history(self, country_code):
+        """Rang (à partir de 1) du pays pour chaque année."""
+        i = self.position[country_code]
+        return pd.Series(self.ranks[i] + 1, index=self.years, name=country_code)
+
+    def population_history(self, country_code):
+        i = self.position[country_code]
+        return pd.Series(self.values[i], index=self.years, name=country_code)
+
+    def bar_race_frames(self, k=10):
+        """Une image par année au format populationData du bar chart race :
+        [{"year": 1960, "CHN": 667070000.0, ...}, ...] limitée aux k premiers pays."""
+        rows = self.order[:k, :]
+        values = np.take_along_axis(self.values, rows, axis=0)
+        frames = []
+        for j, year in enumerate(self.years):
+            frame = {"year": year}
+            frame.update((code, float(value)) for code, value in zip(self.codes[rows[:, j]], values[:, j])
+                         if not np.isnan(value))
+            frames.append(frame)
+        return frames
@@ -0,0 +1,157 @@
+"""
+Bloc de données partagé des pages HTML (D3).
+
+Les pages (bar chart race, Dashboard, évolution par continent, camemberts
+1960/2023) chargent un seul fichier population_report_data.js au lieu
+d'embarquer chacune leurs tableaux de valeurs :
+
+    names   -> dictionnaire des libellés (pays, continents), chacun écrit une fois ;
+    series  -> pour chaque série, une image par année encodée en différences :
+               "set" = [indice, delta, indice, delta, ...] pour les valeurs qui
+               changent ou qui entrent dans l'image, "drop" = indices qui en sortent.
+
+Avec top_n, une image ne garde que les top_n premiers de l'année. Une valeur
+identique à l'image précédente n'est pas réécrite : la taille du fichier suit
+le nombre de changements, pas images x pays.
+
+Le décodeur JavaScript (decodeFrames) est écrit dans le même fichier et
+reconstruit le format populationData : [{year: 1960, Africa: ..., ...}, ...].
+"""
+
+import json
+import os
+
+import numpy as np
+
+from etl_population.cube import rollup
+from etl_population.schema import YEAR_COLUMNS
+
+REPORT_DATA_FILE = "population_report_data.js"
+REPORT_VARIABLE = "POPULATION_REPORT"
+
+# Libellés affichés par les pages pour les membres "continent" du cube
+CONTINENT_LABELS = {
+    "afrique": "Africa",
+    "asie": "Asia",
+    "europe": "Europe",
+    "amerique_du_nord": "North America",
+    "amerique_du_sud": "South America",
+    "oceanie": "Oceania",
+}
+
+DECODER_JS = """
+function decodeFrames(report, name) {
+    const series = report.series[name];
+    const last = new Map();
+    const shown = new Set();
+    return report.years.map((year, j) => {
+        const frame = series.frames[j];
+        (frame.drop || []).forEach(i => shown.delete(i));
+        const set = frame.set || [];
+        for (let k = 0; k < set.length; k += 2) {
+            last.set(set[k], (last.get(set[k]) || 0) + set[k + 1]);
+            shown.add(set[k]);
+        }
+        const entries = Array.from(shown, i => [report.names[i], last.get(i) * series.scale]);
+        entries.sort((a, b) => b[1] - a[1]);
+        return Object.assign({ year: year }, Object.fromEntries(entries));
+    });
+}
+"""
+
+
+class NameDictionary:
+    """Dictionnaire de libellés partagé entre les séries (libellé -> indice)."""
+
+    def __init__(self):
+        self.names = []
+        self._index = {}
+
+    def encode(self, labels):
+        codes = np.empty(len(labels), dtype=np.int64)
+        for i, label in enumerate(labels):
+            label = str(label)
+            if label not in self._index:
+                self._index[label] = len(self.names)
+                self.names.append(label)
+            codes[i] = self._index[label]
+        return codes
+
+
+def encode_frames(codes, block, top_n=None, scale=1):
+    """Images encodées en différences pour un bloc (membres x années).
+
+    Les valeurs sont arrondies à un multiple de `scale` ; les NaN sont absents
+    de l'image. Avec top_n, seuls les top_n premiers de chaque année sont gardés.
+    """
+    values = np.asarray(block, dtype=np.float64) / scale
+    present = ~np.isnan(values)
+    if top_n is not None:
+        keys = np.where(present, -values, np.inf)
+        ranks = np.empty(values.shape, dtype=np.int64)
+        np.put_along_axis(ranks, np.argsort(keys, axis=0, kind="stable"),
+                          np.arange(len(values))[:, None].repeat(values.shape[1], axis=1), axis=0)
+        present &= ranks < top_n
+    values = np.rint(np.where(present, values, 0.0)).astype(np.int64)
+
+    last = np.zeros(len(values), dtype=np.int64)
+    shown = np.zeros(len(values), dtype=bool)
+    frames = []
+    for j in range(values.shape[1]):
+        keep, current = present[:, j], values[:, j]
+        changed = np.flatnonzero(keep & (~shown | (current != last)))
+        dropped = np.flatnonzero(shown & ~keep)
+        frame = {}
+        if len(changed):
+            frame["set"] = np.column_stack([codes[changed], current[changed] - last[changed]]).ravel().tolist()
+        if len(dropped):
+            frame["drop"] = codes[dropped].tolist()
+        frames.append(frame)
+        last[changed] = current[changed]
+        shown = keep
+    return {"scale": scale, "top_n": top_n, "frames": frames}
+
+
+def decode_frames(report, name):
+    """Équivalent Python de decodeFrames : [{"year": 1960, libellé: valeur, ...}, ...]."""
+    series = report["series"][name]
+    last, shown, result = {}, set(), []
+    for year, frame in zip(report["years"], series["frames"]):
+        shown.difference_update(frame.get("drop", ()))
+        pairs = frame.get("set", [])
+        for i, delta in zip(pairs[::2], pairs[1::2]):
+            last[i] = last.get(i, 0) + delta
+            shown.add(i)
+        entries = sorted(((report["names"][i], last[i] * series["scale"]) for i in shown), key=lambda e: -e[1])
+        result.append({"year": year, **dict(entries)})
+    return result
+
+
+def build_report(df, cube, year_columns=YEAR_COLUMNS, top_n=12, label_column="name_en"):
+    """Bloc partagé : séries world, continents, idh_group (depuis le cube) et countries (top_n par année)."""
+    names = NameDictionary()
+    series = {}
+    for name, dimension, labels in (("world", "world", None),
+                                    ("continents", "continent", CONTINENT_LABELS),
+                                    ("idh_group", "idh_group", None)):
+        table = rollup(cube, dimension).reindex(index=[int(year) for year in year_columns])
+        members = [labels.get(member, member) if labels else member for member in table.columns]
+        series[name] = encode_frames(names.encode(members), table.to_numpy(dtype=np.float64).T)
+
+    labels = df[label_column].fillna(df["country_code"]).to_numpy()
+    block = df[year_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    series["countries"] = encode_frames(names.encode(labels), block, top_n=top_n)
+
+    return {"years": [int(year) for year in year_columns], "names": names.names, "series": series}
+
+
+def write_report_data(report, path=REPORT_DATA_FILE):
+    """Écrit le bloc partagé et le décodeur dans un fichier .js chargé par les pages (<script src>)."""
+    payload = json.dumps(report, separators=(",", ":"), ensure_ascii=False)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write("// Généré par etl_population/report_data.py - ne pas modifier à la main.\n")
+        handle.write(f"const {REPORT_VARIABLE} = {payload};\n")
+        handle.write(DECODER_JS)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,182 @@
+"""
+Schéma typé du fichier population_mondiale.csv.
+
+Par défaut pandas lit les 64 années en float64, les indicateurs
+d'appartenance "True"/"False" en object et idh_group en object.
+Ce module fixe explicitement les types de chaque colonne.
+
+Les colonnes d'années ne sont pas figées : elles sont lues dans l'en-tête du
+fichier (year_columns_of / read_year_columns), YEAR_COLUMNS (1960-2023) n'est
+que la valeur par défaut. Un fichier annuel qui ajoute 2024 passe donc par les
+mêmes fonctions.
+"""
+
+import numpy as np
+import pandas as pd
+
+ID_COLUMNS = ["country_code", "name_en", "name_fr", "borders"]
+
+# Indicateurs d'appartenance (colonnes BIT dans SQL Server), de arab_world à g20
+FLAG_COLUMNS = [
+    "arab_world",
+    "central_europe_and_the_baltics",
+    "east_asia_pacific",
+    "euro_area",
+    "europe_central_asia",
+    "european_union",
+    "latin_america_caribbean",
+    "north_america",
+    "oecd_members",
+    "sub_saharan_africa",
+    "upper_middle_income",
+    "south_america",
+    "central_america_caraibes",
+    "cocac",
+    "continental_europe",
+    "asia_oceania",
+    "ue27",
+    "g7",
+    "g20",
+]
+
+IDH_COLUMN = "idh_group"
+IDH_UNKNOWN = "Unknown"
+IDH_CATEGORIES = [
+    "Indice de développement humain faible",
+    "Indice de développement humain moyen",
+    "Indice de développement humain élevé",
+    "Indice de développement humain très élevé",
+    IDH_UNKNOWN,
+]
+
+# Ordre des 24 colonnes d'attributs tel qu'il apparaît dans l'en-tête du fichier
+ATTRIBUTE_COLUMNS = ID_COLUMNS + FLAG_COLUMNS[:16] + [IDH_COLUMN] + FLAG_COLUMNS[16:]
+
+YEAR_COLUMNS = [str(year) for year in range(1960, 2024)]
+
+YEAR_DTYPES = ("float32", "float64", "int64")
+
+# Schéma en étoile de Script_ETL_Data_Warehouse.sql
+# Indicateurs régionaux portés par dim_country (etl_population/dimensions.py)
+REGION_FLAG_COLUMNS = [
+    "sub_saharan_africa",
+    "europe_central_asia",
+    "east_asia_pacific",
+    "north_america",
+    "latin_america_caribbean",
+    "asia_oceania",
+]
+DIM_COUNTRY_COLUMNS = (["country_key", "country_code", "name_en", "name_fr", "borders", IDH_COLUMN]
+                       + REGION_FLAG_COLUMNS)
+DIM_COUNTRY_HISTORY_COLUMNS = (["country_key", "version"] + DIM_COUNTRY_COLUMNS[1:]
+                               + ["valid_from", "valid_to", "is_current"])
+DIM_YEAR_COLUMNS = ["year"]
+DIM_COUNTRY_BORDER_COLUMNS = ["country_code", "border_code"]
+# Mesures dérivées matérialisées dans population_data (etl_population/measures.py)
+CAGR_SPANS = (5, 10)
+ROLLING_WINDOW = 5
+FACT_MEASURE_COLUMNS = ["yoy_change", "yoy_growth", "acceleration", f"rolling_mean_{ROLLING_WINDOW}"] + [
+    f"cagr_{span}" for span in CAGR_SPANS]
+# Faits : clés entières (SMALLINT) et mesures, sans attribut de pays répété
+FACT_COLUMNS = ["country_key", "year", "population"] + FACT_MEASURE_COLUMNS
+# Partition des estimations (etl_population/projection.py), distincte des faits observés,
+# clés comme les faits : elle se joint à dim_country par country_key
+PROJECTION_COLUMNS = ["country_key", "year", "population", "is_estimate", "model", "base_year",
+                      "fit_window", "fit_rmse"]
+
+SEPARATOR = ";"
+
+
+def year_columns_of(columns):
+    """Colonnes d'années (noms à quatre chiffres), triées, dans une liste de colonnes."""
+    return sorted((str(col) for col in columns if str(col).isdigit() and len(str(col)) == 4), key=int)
+
+
+def read_year_columns(path, encoding="utf-8"):
+    """Colonnes d'années de l'en-tête d'un fichier au format population_mondiale.csv."""
+    with open(path, encoding=encoding) as handle:
+        header = handle.readline().lstrip("\ufeff").rstrip("\r\n")
+    return year_columns_of(header.split(SEPARATOR))
+
+
+def read_dtypes(year_dtype="float32", year_columns=YEAR_COLUMNS):
+    """Types passés à pd.read_csv (les années sont converties ensuite par coerce_chunk)."""
+    if year_dtype not in YEAR_DTYPES:
+        raise ValueError(f"Type d'année non supporté : {year_dtype!r} (attendu : {', '.join(YEAR_DTYPES)})")
+    dtypes = {col: "string" for col in ID_COLUMNS}
+    dtypes.update({col: "boolean" for col in FLAG_COLUMNS})
+    dtypes[IDH_COLUMN] = "string"
+    year_read = "float32" if year_dtype == "float32" else "float64"
+    dtypes.update({col: year_read for col in year_columns})
+    return dtypes
+
+
+def coerce_chunk(chunk, year_dtype="float32"):
+    """Applique les types finaux à un bloc lu avec read_dtypes().
+
+    - idh_group devient une catégorie à modalités fixes, identique d'un bloc à l'autre ;
+    - en int64 les populations sont arrondies à l'unité (type Int64 nullable,
+      les années manquantes du fichier brut restant à <NA>).
+    """
+    idh = chunk[IDH_COLUMN]
+    unknown = set(idh.dropna().unique()) - set(IDH_CATEGORIES)
+    if unknown:
+        raise ValueError(f"Valeurs idh_group inconnues : {sorted(unknown)}")
+    chunk[IDH_COLUMN] = pd.Categorical(idh, categories=IDH_CATEGORIES)
+
+    if year_dtype == "int64":
+        years = year_columns_of(chunk.columns)
+        block = chunk[years].to_numpy(dtype=np.float64).round()
+        chunk[years] = pd.DataFrame(block, index=chunk.index, columns=years).astype("Int64")
+    return chunk
+
+
+def sql_column_definitions(dialect="mssql", year_columns=YEAR_COLUMNS):
+    """Définitions SQL des colonnes de population_mondiale_1960_2023, dans l'ordre du fichier.
+
+    dialect="sqlite" remplace NVARCHAR(MAX) (inconnu de SQLite) par TEXT pour la base de substitution.
+    """
+    definitions = []
+    for col in ATTRIBUTE_COLUMNS:
+        if col == "country_code":
+            definitions.append(f"[{col}] VARCHAR(10)")
+        elif col == "borders":
+            definitions.append(f"[{col}] {'TEXT' if dialect == 'sqlite' else 'NVARCHAR(MAX)'}")
+        elif col in FLAG_COLUMNS:
+            definitions.append(f"[{col}] BIT")
+        else:
+            definitions.append(f"[{col}] VARCHAR(255)")
+    definitions.extend(f"[{year}] FLOAT" for year in year_columns)
+    return definitions
+
+
+def star_table_definitions(table, dialect="mssql"):
+    """Colonnes et clé primaire d'une table du schéma en étoile (types de Script_ETL_Data_Warehouse.sql).
+
+    Utilisé pour créer les tables dans la base SQLite de substitution ; sous SQL Server
+    elles sont créées par le script SQL.
+    """
+    borders = "TEXT" if dialect == "sqlite" else "NVARCHAR(MAX)"
+    attributes = (["[name_en] VARCHAR(255)", "[name_fr] VARCHAR(255)", f"[borders] {borders}",
+                   f"[{IDH_COLUMN}] VARCHAR(255)"] + [f"[{flag}] BIT" for flag in REGION_FLAG_COLUMNS])
+    if table == "dim_country":
+        return ["[country_key] SMALLINT PRIMARY KEY", "[country_code] VARCHAR(10) NOT NULL UNIQUE"] + attributes
+    if table == "dim_country_history":
+        return (["[country_key] SMALLINT", "[version] SMALLINT", "[country_code] VARCHAR(10) NOT NULL"]
+                + attributes
+                + ["[valid_from] DATE NOT NULL", "[valid_to] DATE", "[is_current] BIT NOT NULL",
+                   "PRIMARY KEY (country_key, version)"])
+    if table == "dim_year":
+        return ["[year] SMALLINT PRIMARY KEY"]
+    if table == "dim_country_border":
+        return ["[country_code] VARCHAR(10)", "[border_code] VARCHAR(10)",
+                "PRIMARY KEY (country_code, border_code)"]
+    if table == "population_data":
+        return (["[country_key] SMALLINT", "[year] SMALLINT", "[population] FLOAT"]
+                + [f"[{measure}] FLOAT" for measure in FACT_MEASURE_COLUMNS]
+                + ["PRIMARY KEY (country_key, year)"])
+    if table == "population_projection":
+        return ["[country_key] SMALLINT", "[year] SMALLINT", "[population] FLOAT",
+                "[is_estimate] BIT NOT NULL DEFAULT 1", "[model] VARCHAR(20)", "[base_year] SMALLINT",
+                "[fit_window] INT", "[fit_rmse] FLOAT", "PRIMARY KEY (country_key, year)"]
+    raise ValueError(f"Table inconnue du schéma en étoile : {table}")
@@ -0,0 +1,230 @@
+"""
+Exécution répartie (sharding) du nettoyage et des transformations sur plusieurs cœurs.
+
+Les pays sont répartis en `shards` parties par empreinte de country_code
+(pd.util.hash_array : la même partie d'une exécution et d'une machine à
+l'autre, et toutes les lignes d'un même code dans la même partie). Chaque
+partie est traitée par un processus d'un ProcessPoolExecutor :
+
+    nettoyage          -> imputation des années, réécrite en place dans le bloc partagé
+    contrôle           -> règles numériques et règles sur les chaînes (validation.numeric_findings,
+                          validation.string_findings), en positions globales
+    dépivotage         -> population et mesures écrites dans les matrices de faits partagées
+    agrégats partiels  -> sommes exactes du cube (cube.partial_sums)
+
+Les tableaux ne passent pas par pickle : bloc des années, masques
+d'indicateurs, codes d'IDH, codes pays et frontières (chaînes de largeur
+fixe), affectation des lignes et matrices de faits sont des segments de
+mémoire partagée (multiprocessing.shared_memory) que chaque processus ouvre
+par leur nom. Seuls les résultats compacts (positions des violations, sommes
+partielles du cube) reviennent au processus principal.
+
+La réduction additionne les sommes partielles et fusionne les violations dans
+l'ordre des lignes ; des frontières absentes de leur partie (le voisin est
+souvent dans une autre), elle ne garde que celles absentes de tout le jeu.
+Le résultat est identique au bit près à celui du traitement en un seul
+processus (clean_chunks, validate, unpivot, build_cube) : l'imputation et les
+mesures travaillent ligne par ligne, et les sommes du cube sont exactes, donc
+indépendantes de la répartition.
+
+    result = run_sharded(read_population_chunks(source, year_dtype="float64"), shards=8)
+    result.cleaned, result.report, result.cube, result.matrices
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from etl_population.continents import pack_flags, regions_from_config
+from etl_population.cube import cube_frame, cube_members, idh_codes, membership_from_codes, partial_sums
+from etl_population.imputation import impute_block
+from etl_population.schema import FACT_COLUMNS, year_columns_of
+from etl_population.streaming import fill_attributes
+from etl_population.unpivot import fact_matrices
+from etl_population.validation import (DEFAULT_FLAG_CONFLICTS, DEFAULT_MAX_JUMP, numeric_findings,
+                                       string_findings, validate)
+
+DEFAULT_SHARDS = os.cpu_count() or 1
+MATRIX_COLUMNS = FACT_COLUMNS[2:]      # population puis mesures (sans country_key ni year)
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """Nom, forme et type d'un segment de mémoire partagée : seule chose transmise aux processus."""
+    name: str
+    shape: tuple
+    dtype: str
+
+
+@dataclass(frozen=True)
+class ShardTask:
+    shard: int
+    arrays: dict
+    strategy: str
+    max_jump: float
+    flag_conflicts: tuple
+    regions: list
+    unpivot: bool
+
+
+@dataclass
+class ShardedResult:
+    cleaned: pd.DataFrame
+    report: object
+    cube: pd.DataFrame
+    matrices: dict
+    shards: int
+
+
+def shard_ids(codes, shards):
+    """Partie de chaque ligne, par empreinte de country_code."""
+    hashes = pd.util.hash_array(np.asarray(pd.Series(codes).fillna(""), dtype=object))
+    return (hashes % np.uint64(shards)).astype(np.uint32)
+
+
+def _fixed_width(values):
+    """Chaînes en tableau unicode de largeur fixe (type "U"), partageable ; <NA> -> ""."""
+    return pd.Series(values).fillna("").to_numpy(dtype=object).astype(str)
+
+
+def _create(shape, dtype, segments):
+    dtype = np.dtype(dtype)
+    size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+    segment = shared_memory.SharedMemory(create=True, size=size)
+    segments.append(segment)
+    return SharedArray(segment.name, tuple(shape), dtype.str), np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+
+
+def _share(array, segments):
+    spec, shared = _create(array.shape, array.dtype, segments)
+    shared[...] = array
+    return spec
+
+
+@contextmanager
+def _attached(specs):
+    """{nom: tableau} sur les segments de `specs`, fermés à la sortie (jamais supprimés ici)."""
+    segments = {name: shared_memory.SharedMemory(name=spec.name) for name, spec in specs.items()}
+    arrays = {name: np.ndarray(spec.shape, dtype=np.dtype(spec.dtype), buffer=segments[name].buf)
+              for name, spec in specs.items()}
+    try:
+        yield arrays
+    finally:
+        arrays.clear()
+        for segment in segments.values():
+            segment.close()
+
+
+def _process_shard(task):
+    """Traitement d'une partie : les résultats volumineux sont écrits dans les segments partagés."""
+    with _attached(task.arrays) as arrays:
+        rows = np.flatnonzero(arrays["shard"] == task.shard)
+        block = impute_block(arrays["block"][rows], task.strategy)
+        arrays["block"][rows] = block
+        bits = arrays["bits"][rows]
+
+        findings = numeric_findings(block, bits, task.max_jump, task.flag_conflicts)
+        for rule in ("negative_population", "yoy_jump"):
+            local, cols, values = findings[rule]
+            findings[rule] = (rows[local], cols, values)
+        findings["flag_conflict"] = [rows[local] for local in findings["flag_conflict"]]
+
+        strings = string_findings(pd.Series(arrays["codes"][rows].astype(object)),
+                                  pd.Series(arrays["borders"][rows].astype(object)))
+        findings["missing_code"] = rows[strings["missing_code"]]
+        local, counts = strings["duplicate_code"]
+        findings["duplicate_code"] = (rows[local], counts)
+        local, tokens = strings["unknown_border"]
+        findings["unknown_border"] = (rows[local], tokens)
+
+        if task.unpivot:
+            for i, matrix in enumerate(fact_matrices(block).values()):
+                arrays["fact"][i, rows] = matrix
+        partial = partial_sums(block, membership_from_codes(bits, arrays["idh"][rows], task.regions))
+    return findings, partial
+
+
+def _merge_findings(parts, flag_conflicts, codes):
+    """Violations de toutes les parties, dans l'ordre du traitement en un seul processus (ligne, colonne)."""
+    merged = {}
+    for rule in ("negative_population", "yoy_jump"):
+        rows, cols, values = (np.concatenate([part[rule][i] for part in parts]) for i in range(3))
+        order = np.lexsort((cols, rows))
+        merged[rule] = (rows[order], cols[order], values[order])
+    merged["flag_conflict"] = [np.sort(np.concatenate([part["flag_conflict"][i] for part in parts]))
+                               for i in range(len(flag_conflicts))]
+    merged["missing_code"] = np.sort(np.concatenate([part["missing_code"] for part in parts]))
+
+    rows, counts = (np.concatenate([part["duplicate_code"][i] for part in parts]) for i in range(2))
+    order = np.argsort(rows, kind="stable")
+    merged["duplicate_code"] = (rows[order], counts[order])
+
+    # Les codes cités d'une même ligne viennent d'une seule partie : le tri stable garde leur ordre
+    rows, tokens = (np.concatenate([part["unknown_border"][i] for part in parts]) for i in range(2))
+    order = np.argsort(rows, kind="stable")
+    rows, tokens = rows[order], tokens[order].astype(object)
+    unknown = ~pd.Index(tokens, dtype=object).isin(codes)
+    merged["unknown_border"] = (rows[unknown], tokens[unknown])
+    return merged
+
+
+def run_sharded(chunks, year_columns=None, strategy="row_mean", shards=DEFAULT_SHARDS, max_workers=None,
+                regions=None, max_jump=DEFAULT_MAX_JUMP, flag_conflicts=DEFAULT_FLAG_CONFLICTS, unpivot=True):
+    """Nettoyage, contrôle, dépivotage et cube des blocs `chunks` (read_population_chunks, float64), en parties.
+
+    Équivalent de clean_chunks + validate + unpivot (matrices de faits) + build_cube.
+    Avec max_workers=1, les parties sont traitées dans le processus courant.
+    """
+    if shards < 1:
+        raise ValueError("shards doit être >= 1")
+    df = pd.concat((fill_attributes(chunk) for chunk in chunks), ignore_index=True)
+    years = year_columns or year_columns_of(df.columns)
+    regions = regions or regions_from_config()
+    flag_conflicts = tuple(flag_conflicts)
+    max_workers = max_workers or min(shards, DEFAULT_SHARDS)
+
+    segments, fact = [], None
+    try:
+        bits = pack_flags(df)
+        arrays = {
+            "shard": _share(shard_ids(df["country_code"], shards), segments),
+            "block": _share(df[years].to_numpy(dtype=np.float64, na_value=np.nan), segments),
+            "bits": _share(bits, segments),
+            "idh": _share(idh_codes(df), segments),
+            "codes": _share(_fixed_width(df["country_code"]), segments),
+            "borders": _share(_fixed_width(df["borders"]), segments),
+        }
+        matrices = {}
+        if unpivot:
+            arrays["fact"], fact = _create((len(MATRIX_COLUMNS), len(df), len(years)), np.float64, segments)
+        tasks = [ShardTask(shard, arrays, strategy, max_jump, flag_conflicts, regions, unpivot)
+                 for shard in range(shards)]
+        if max_workers == 1:
+            results = [_process_shard(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(_process_shard, tasks))
+
+        with _attached({"block": arrays["block"]}) as shared:
+            cleaned = df.copy()
+            cleaned[years] = np.array(shared["block"])
+        if unpivot:
+            matrices = {col: np.array(fact[i]) for i, col in enumerate(MATRIX_COLUMNS)}
+    finally:
+        fact = None  # plus aucune vue sur les segments avant leur fermeture
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+    findings = _merge_findings([findings for findings, _ in results], flag_conflicts,
+                               df["country_code"].dropna().to_numpy(dtype=object))
+    report = validate(cleaned, years, max_jump, flag_conflicts, regions, findings=findings)
+    limbs = sum(partial[0] for _, partial in results)
+    countries = sum(partial[1] for _, partial in results)
+    cube = cube_frame(limbs, countries, cube_members(regions), years)
+    return ShardedResult(cleaned, report, cube, matrices, shards)
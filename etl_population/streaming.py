@@ -0,0 +1,166 @@
+"""
+Lecture en flux de population_mondiale.csv et pipeline de générateurs.
+
+Le fichier est lu par blocs de taille fixe, avec le schéma typé de
+etl_population.schema. L'EDA et le nettoyage consomment ces blocs les uns
+après les autres : leur mémoire dépend de la taille d'un bloc et non de la
+taille du fichier. Le contrôle d'intégrité et le chargement travaillent en
+revanche sur le jeu nettoyé entier (voir etl_population/cli.py).
+
+    chunks = read_population_chunks("population_mondiale.csv")
+    rows = write_chunks(clean_chunks(chunks), "population_mondiale_cleaned.csv")
+"""
+
+import numpy as np
+import pandas as pd
+
+from etl_population.imputation import impute_years
+from etl_population.schema import (
+    IDH_COLUMN,
+    IDH_UNKNOWN,
+    SEPARATOR,
+    coerce_chunk,
+    read_dtypes,
+    read_year_columns,
+    year_columns_of,
+)
+
+DEFAULT_CHUNKSIZE = 50_000
+
+
+def read_population_chunks(path, chunksize=DEFAULT_CHUNKSIZE, year_dtype="float32", encoding="utf-8"):
+    """Génère des DataFrames typés d'au plus `chunksize` lignes (années lues dans l'en-tête)."""
+    reader = pd.read_csv(
+        path,
+        sep=SEPARATOR,
+        encoding=encoding,
+        dtype=read_dtypes(year_dtype, read_year_columns(path, encoding)),
+        chunksize=chunksize,
+    )
+    with reader:
+        for chunk in reader:
+            yield coerce_chunk(chunk, year_dtype)
+
+
+def fill_attributes(chunk):
+    """Valeurs par défaut de borders et idh_group (en place)."""
+    chunk["borders"] = chunk["borders"].fillna("No Borders")
+    chunk[IDH_COLUMN] = chunk[IDH_COLUMN].fillna(IDH_UNKNOWN)
+    return chunk
+
+
+def clean_chunks(chunks, strategy="row_mean"):
+    """Étape de nettoyage : valeurs par défaut de borders / idh_group et imputation des années.
+
+    L'imputation travaille ligne par ligne, le résultat ne dépend donc pas du découpage en blocs.
+    """
+    for chunk in chunks:
+        yield impute_years(fill_attributes(chunk), year_columns_of(chunk.columns), strategy=strategy)
+
+
+def write_chunks(chunks, path, encoding="utf-8"):
+    """Écrit les blocs dans un seul CSV (en-tête une fois) et retourne le nombre de lignes écrites."""
+    rows = 0
+    with open(path, "w", encoding=encoding, newline="") as handle:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(handle, sep=SEPARATOR, index=False, header=(i == 0))
+            rows += len(chunk)
+    return rows
+
+
+class PopulationProfile:
+    """Statistiques de l'EDA accumulées bloc par bloc.
+
+    Conserve, pour les colonnes d'années : effectif, somme, moyenne, somme des
+    carrés des écarts à la moyenne (m2), min, max et valeurs manquantes ; ainsi
+    que les valeurs d'une année de référence (histogramme) et les `top_k` pays
+    les plus peuplés pour cette année.
+
+    La variance ne passe pas par somme des carrés - n * moyenne² : à 1e9 habitants
+    les carrés atteignent 1e18 et la différence perd ses chiffres significatifs.
+    Chaque bloc calcule sa moyenne et son m2 autour de sa propre moyenne, puis les
+    fusionne aux cumuls par la formule parallèle de Chan (Welford par blocs).
+    """
+
+    def __init__(self, reference_year="2023", top_k=5):
+        self.reference_year = reference_year
+        self.top_k = top_k
+        self.rows = 0
+        self.year_columns = None
+        self.missing = None
+        self.reference_values = []
+        self.top = None
+
+    def _start(self, year_columns):
+        # Les années sont celles de l'en-tête du premier bloc
+        self.year_columns = year_columns
+        n_years = len(year_columns)
+        self.count = np.zeros(n_years, dtype=np.int64)
+        self.total = np.zeros(n_years)
+        self.mean = np.zeros(n_years)
+        self.m2 = np.zeros(n_years)
+        self.minimum = np.full(n_years, np.inf)
+        self.maximum = np.full(n_years, -np.inf)
+
+    def update(self, chunk):
+        if self.year_columns is None:
+            self._start(year_columns_of(chunk.columns))
+        block = chunk[self.year_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(block)
+        values = np.where(valid, block, 0.0)
+        count = valid.sum(axis=0)
+        total = values.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, total / count, 0.0)
+        m2 = (np.where(valid, block - mean, 0.0) ** 2).sum(axis=0)
+        self._merge_moments(count, mean, m2)
+        self.rows += len(chunk)
+        self.total += total
+        self.minimum = np.fmin(self.minimum, np.where(valid, block, np.inf).min(axis=0, initial=np.inf))
+        self.maximum = np.fmax(self.maximum, np.where(valid, block, -np.inf).max(axis=0, initial=-np.inf))
+
+        missing = chunk.isnull().sum()
+        self.missing = missing if self.missing is None else self.missing.add(missing, fill_value=0)
+
+        self.reference_values.append(chunk[self.reference_year].dropna().to_numpy(dtype=np.float64))
+        candidates = chunk.nlargest(self.top_k, self.reference_year)
+        if self.top is not None:
+            candidates = pd.concat([self.top, candidates]).nlargest(self.top_k, self.reference_year)
+        self.top = candidates
+        return self
+
+    def _merge_moments(self, count, mean, m2):
+        # Formule de Chan : fusion de (n, moyenne, m2) du bloc avec les cumuls, colonne par colonne
+        merged = self.count + count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(merged > 0, count / merged, 0.0)
+        delta = mean - self.mean
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + m2 + delta * delta * self.count * weight
+        self.count = merged
+
+    def describe(self):
+        """Équivalent de df.describe() restreint aux années (count, mean, std, min, max)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(self.count > 0, self.mean, np.nan)
+            var = np.where(self.count > 1, self.m2 / (self.count - 1), np.nan)
+        return pd.DataFrame(
+            {"count": self.count, "mean": mean, "std": np.sqrt(var),
+             "min": self.minimum, "max": self.maximum},
+            index=self.year_columns,
+        ).T
+
+    def world_population(self):
+        """Somme de la population mondiale par année (équivalent de df[years].sum())."""
+        return pd.Series(self.total, index=self.year_columns)
+
+    def reference_distribution(self):
+        return np.concatenate(self.reference_values) if self.reference_values else np.array([])
+
+
+def profile_chunks(chunks, reference_year="2023", top_k=5):
+    """Étape EDA : consomme le flux de blocs et retourne un PopulationProfile."""
+    profile = PopulationProfile(reference_year=reference_year, top_k=top_k)
+    for chunk in chunks:
+        profile.update(chunk)
+    return profile
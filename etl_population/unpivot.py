@@ -0,0 +1,121 @@
+"""
+Passage du format large (une colonne par année) au schéma en étoile.
+
+population_mondiale_cleaned.csv contient une ligne par pays et 64 colonnes
+d'années, alors que la table de faits population_data attend une ligne par
+(country_key, year). Le dépivotage est fait en une seule opération NumPy
+(np.repeat / np.tile / ravel) sur le bloc des années, sans boucle par ligne.
+Les faits ne portent que des entiers compacts (country_key et year en
+SMALLINT) et des mesures : noms, borders, idh_group et indicateurs régionaux
+sont dans dim_country, dont l'historique est tenu par etl_population/dimensions.py.
+Les mesures dérivées (variation annuelle, TCAM, moyenne glissante,
+accélération ; voir etl_population/measures.py) sont calculées sur le même
+bloc et dépivotées avec la population.
+
+Les fichiers de staging écrits par write_staging correspondent exactement
+aux colonnes de dim_country, dim_country_history, dim_year, population_data et de la table pont
+dim_country_border (voir etl_population/borders.py) et peuvent être
+chargés tels quels par BULK INSERT (séparateur ';', fin de ligne CRLF,
+première ligne = en-tête, BIT en 0/1).
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from etl_population.borders import BorderIndex
+from etl_population.dimensions import country_keys, current_dimension, key_dtype, update_history
+from etl_population.measures import derived_measures
+from etl_population.schema import (
+    FACT_COLUMNS,
+    FACT_MEASURE_COLUMNS,
+    SEPARATOR,
+    YEAR_COLUMNS,
+    year_columns_of,
+)
+
+STAGING_FILES = {
+    "dim_country": "staging_dim_country.csv",
+    "dim_country_history": "staging_dim_country_history.csv",
+    "dim_year": "staging_dim_year.csv",
+    "population_data": "staging_population_data.csv",
+    "dim_country_border": "staging_dim_country_border.csv",
+}
+
+
+def fact_matrices(block, positions=None):
+    """{colonne de faits: matrice (pays x années retenues)} : la population puis les mesures dérivées.
+
+    Les mesures sont calculées sur tout le bloc, puis restreintes aux colonnes `positions`.
+    """
+    positions = slice(None) if positions is None else positions
+    measures = derived_measures(block)
+    return {"population": block[:, positions],
+            **{col: measures[col][:, positions] for col in FACT_MEASURE_COLUMNS}}
+
+
+def fact_frame(keys, year_columns, matrices):
+    """Lignes de faits ordonnées par pays puis par année, à partir des matrices de fact_matrices."""
+    fact = {
+        "country_key": np.repeat(np.asarray(keys), len(year_columns)),
+        "year": np.tile(np.asarray(year_columns, dtype=np.int16), len(keys)),
+    }
+    for col, matrix in matrices.items():
+        fact[col] = matrix.ravel()
+    return pd.DataFrame(fact, columns=FACT_COLUMNS)
+
+
+def unpivot(df, year_columns=YEAR_COLUMNS, keys=None):
+    """Retourne les lignes de faits (country_key, year, population, mesures...).
+
+    `keys` donne la country_key de chaque ligne de `df` (dimensions.country_keys) ;
+    par défaut les lignes sont numérotées à partir de 1.
+    Les lignes sont ordonnées par pays puis par année, comme le bloc d'origine lu ligne à ligne.
+    Les mesures sont calculées sur toutes les années de `df` : la partition d'une seule
+    année (ingestion annuelle) a donc les mêmes mesures que dans le dépivotage complet.
+    """
+    history = year_columns_of(df.columns)
+    block = df[history].to_numpy(dtype=np.float64, na_value=np.nan)
+    positions = [history.index(str(year)) for year in year_columns]
+    if keys is None:
+        keys = np.arange(1, len(df) + 1, dtype=key_dtype(len(df)))
+    return fact_frame(keys, year_columns, fact_matrices(block, positions))
+
+
+def dim_year(year_columns=YEAR_COLUMNS):
+    """Domaine de dim_year."""
+    return pd.DataFrame({"year": np.asarray(year_columns, dtype=np.int64)})
+
+
+def star_schema(df, year_columns=YEAR_COLUMNS, history=None, matrices=None):
+    """Retourne {table: DataFrame} pour les tables du schéma en étoile.
+
+    `history` est l'historique de dim_country (dimensions.update_history) qui fixe les
+    clés de substitution ; sans historique, les pays de `df` reçoivent les clés 1..n.
+    `matrices` : matrices de faits déjà calculées sur toutes les années (fact_matrices,
+    mode réparti) ; sinon population_data est dépivoté ici.
+    """
+    if history is None:
+        history = update_history(df)[0]
+    dim = current_dimension(history)
+    keys = country_keys(history, df["country_code"])
+    return {
+        "dim_country": dim,
+        "dim_country_history": history,
+        "dim_year": dim_year(year_columns),
+        "population_data": (unpivot(df, year_columns, keys) if matrices is None
+                            else fact_frame(keys, year_columns, matrices)),
+        "dim_country_border": BorderIndex.from_frame(dim).bridge_table(),
+    }
+
+
+def write_staging(df, directory, year_columns=YEAR_COLUMNS, history=None, matrices=None, encoding="utf-8"):
+    """Écrit les fichiers de staging du schéma en étoile et retourne {table: chemin}."""
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for table, frame in star_schema(df, year_columns, history, matrices).items():
+        path = os.path.join(directory, STAGING_FILES[table])
+        frame.to_csv(path, sep=SEPARATOR, index=False, encoding=encoding, lineterminator="\r\n")
+        paths[table] = path
+    return paths
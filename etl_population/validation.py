@@ -0,0 +1,239 @@
+"""
+Contrôle d'intégrité du jeu nettoyé avant tout chargement.
+
+Toutes les règles sont évaluées en une passe sur des tableaux NumPy (bloc des
+années, masque des indicateurs, codes pays), sans boucle par pays :
+
+    negative_population  -> population < 0 pour une année
+    yoy_jump             -> variation d'une année sur l'autre supérieure à max_jump (0.5 = 50 %)
+    missing_code         -> country_code vide
+    duplicate_code       -> country_code présent sur plusieurs lignes
+    flag_conflict        -> indicateurs contradictoires (asia_oceania et sub_saharan_africa :
+                            le pays tomberait à la fois en Afrique et hors de l'Océanie)
+    unknown_border       -> code de `borders` absent du jeu de données
+
+Les violations de gravité "error" placent la ligne en quarantaine et bloquent
+le chargement (ValidationError, levée avant toute écriture en base). Les
+"warning" sont seulement rapportées : unknown_border l'est par défaut, car le
+fichier source cite des pays qu'il ne contient pas (IRN, EGY, COD...).
+
+    report = validate(df)
+    report.write_json("reports/validation_report.json")
+    report.write_quarantine(df, "reports/quarantine.csv")
+    report.raise_for_errors()
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from etl_population.borders import parse_borders
+from etl_population.continents import FLAG_BITS, pack_flags, regions_from_config, route
+from etl_population.cube import region_label
+from etl_population.schema import SEPARATOR, YEAR_COLUMNS
+
+ERROR = "error"
+WARNING = "warning"
+
+RULES = {
+    "negative_population": ERROR,
+    "yoy_jump": ERROR,
+    "missing_code": ERROR,
+    "duplicate_code": ERROR,
+    "flag_conflict": ERROR,
+    "unknown_border": WARNING,
+}
+
+DEFAULT_MAX_JUMP = 0.5
+DEFAULT_FLAG_CONFLICTS = (("asia_oceania", "sub_saharan_africa"),)
+VIOLATION_COLUMNS = ["row", "country_code", "rule", "severity", "detail"]
+QUARANTINE_COLUMN = "violations"
+
+
+class ValidationError(ValueError):
+    """Le jeu de données contient des violations bloquantes ; rien n'a été écrit en base."""
+
+    retryable = False  # relancer l'étape relirait le même jeu (orchestrator)
+
+    def __init__(self, report):
+        self.report = report
+        super().__init__(report.summary())
+
+
+@dataclass
+class ValidationReport:
+    rows: int
+    violations: pd.DataFrame
+    elapsed: float = 0.0
+    by_region: dict = field(default_factory=dict)
+
+    @property
+    def errors(self):
+        return self.violations[self.violations["severity"] == ERROR]
+
+    @property
+    def warnings(self):
+        return self.violations[self.violations["severity"] == WARNING]
+
+    @property
+    def ok(self):
+        return self.errors.empty
+
+    @property
+    def quarantined_rows(self):
+        """Positions des lignes ayant au moins une violation bloquante."""
+        return np.unique(self.errors["row"].to_numpy(dtype=np.int64))
+
+    def counts(self):
+        return {rule: int((self.violations["rule"] == rule).sum()) for rule in RULES}
+
+    def summary(self):
+        return (f"Validation : {self.rows} lignes, {len(self.errors)} erreur(s) sur "
+                f"{len(self.quarantined_rows)} ligne(s) en quarantaine, {len(self.warnings)} avertissement(s) "
+                f"({self.elapsed * 1000:.1f} ms)")
+
+    def to_dict(self):
+        return {
+            "rows": self.rows,
+            "ok": self.ok,
+            "elapsed_seconds": round(self.elapsed, 6),
+            "quarantined_rows": len(self.quarantined_rows),
+            "rules": {rule: {"severity": RULES[rule], "violations": count} for rule, count in self.counts().items()},
+            "by_region": self.by_region,
+            "violations": self.violations.to_dict(orient="records"),
+        }
+
+    def write_json(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle, indent=2, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+        return path
+
+    def write_quarantine(self, df, path):
+        """Lignes en quarantaine, avec la liste de leurs règles violées (fichier vide si aucune)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        rows = self.quarantined_rows
+        rules = self.errors.groupby("row")["rule"].agg(lambda r: ",".join(sorted(set(r))))
+        quarantine = df.iloc[rows].copy()
+        quarantine.insert(0, QUARANTINE_COLUMN, rules.reindex(rows).to_numpy())
+        tmp_path = f"{path}.tmp"
+        quarantine.to_csv(tmp_path, sep=SEPARATOR, index=False)
+        os.replace(tmp_path, path)
+        return path
+
+    def raise_for_errors(self):
+        if not self.ok:
+            raise ValidationError(self)
+        return self
+
+
+def _violations(rule, rows, codes, details):
+    rows = np.asarray(rows, dtype=np.int64)
+    return pd.DataFrame({"row": rows, "country_code": codes[rows], "rule": rule,
+                         "severity": RULES[rule], "detail": details}, columns=VIOLATION_COLUMNS)
+
+
+def numeric_findings(block, bits, max_jump=DEFAULT_MAX_JUMP, flag_conflicts=DEFAULT_FLAG_CONFLICTS):
+    """Règles qui ne lisent que des tableaux : bloc des années et masques d'indicateurs.
+
+    Retourne {"negative_population": (lignes, colonnes, valeurs), "yoy_jump": (lignes, colonnes, variations),
+    "flag_conflict": [lignes de chaque paire de flag_conflicts]}, lignes triées (ordre de np.nonzero).
+    Les lignes sont des positions dans `block` : le mode réparti (sharding) évalue ces règles
+    shard par shard puis fusionne les positions globales.
+    """
+    rows, cols = np.nonzero(block < 0)
+    negative = (rows, cols, block[rows, cols])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = block[:, 1:] / block[:, :-1] - 1.0
+    rows, cols = np.nonzero((block[:, :-1] > 0) & (np.abs(change) > max_jump))
+    jumps = (rows, cols, change[rows, cols])
+
+    conflicts = []
+    for a, b in flag_conflicts:
+        mask = np.uint32((1 << FLAG_BITS[a]) | (1 << FLAG_BITS[b]))
+        conflicts.append(np.flatnonzero((bits & mask) == mask))
+    return {"negative_population": negative, "yoy_jump": jumps, "flag_conflict": conflicts}
+
+
+def string_findings(codes, borders):
+    """Règles sur les chaînes : codes manquants ou en double, frontières inconnues.
+
+    `codes` et `borders` sont des Series alignées. Retourne {"missing_code": lignes,
+    "duplicate_code": (lignes, effectifs), "unknown_border": (lignes, codes cités)}.
+    Sur une partie du jeu (mode réparti), "unknown_border" contient les codes absents
+    de la partie : le mode réparti ne garde ensuite que ceux absents de tout le jeu.
+    """
+    codes = codes.reset_index(drop=True)
+    missing = codes.isna().to_numpy() | (codes.fillna("").str.strip() == "").to_numpy()
+
+    duplicated = codes.duplicated(keep=False).to_numpy() & ~missing
+    rows = np.flatnonzero(duplicated)
+    counts = codes.map(codes.value_counts()).to_numpy()
+
+    # Le découpage de `borders` demande des codes uniques : les doublons sont déjà signalés ci-dessus
+    first = np.flatnonzero(~codes.duplicated().to_numpy() & ~missing)
+    source, target, tokens = parse_borders(pd.DataFrame({
+        "country_code": codes.iloc[first].to_numpy(dtype=object),
+        "borders": borders.iloc[first].to_numpy(dtype=object),
+    }))
+    unknown = target < 0
+    return {"missing_code": np.flatnonzero(missing), "duplicate_code": (rows, counts[rows]),
+            "unknown_border": (first[source[unknown]], tokens[unknown])}
+
+
+def validate(df, year_columns=YEAR_COLUMNS, max_jump=DEFAULT_MAX_JUMP, flag_conflicts=DEFAULT_FLAG_CONFLICTS,
+             regions=None, findings=None):
+    """Évalue toutes les règles sur `df` et retourne un ValidationReport (ne lève rien).
+
+    `findings` : résultats de numeric_findings et string_findings déjà calculés (mode réparti) ;
+    sinon ils sont calculés ici.
+    """
+    start = time.perf_counter()
+    codes = df["country_code"].to_numpy(dtype=object)
+    bits = pack_flags(df)
+    if findings is None:
+        findings = {**numeric_findings(df[year_columns].to_numpy(dtype=np.float64, na_value=np.nan), bits,
+                                       max_jump, flag_conflicts),
+                    **string_findings(df["country_code"], df["borders"])}
+    found = []
+
+    rows, cols, values = findings["negative_population"]
+    found.append(_violations("negative_population", rows, codes,
+                             [f"{year_columns[c]} : {v:.0f}" for c, v in zip(cols, values)]))
+
+    rows, cols, values = findings["yoy_jump"]
+    found.append(_violations("yoy_jump", rows, codes,
+                             [f"{year_columns[c]} -> {year_columns[c + 1]} : {v:+.1%}"
+                              for c, v in zip(cols, values)]))
+
+    found.append(_violations("missing_code", findings["missing_code"], codes, ""))
+
+    rows, counts = findings["duplicate_code"]
+    found.append(_violations("duplicate_code", rows, codes, [f"{int(n)} lignes" for n in counts]))
+
+    for (a, b), rows in zip(flag_conflicts, findings["flag_conflict"]):
+        found.append(_violations("flag_conflict", rows, codes, f"{a} + {b}"))
+
+    rows, tokens = findings["unknown_border"]
+    found.append(_violations("unknown_border", rows, codes, tokens))
+
+    violations = pd.concat(found, ignore_index=True).sort_values(["row", "rule"], kind="stable")
+    violations = violations.reset_index(drop=True)
+
+    # Lignes bloquées par région (SQLQuery2.sql) : l'intégrité se lit continent par continent
+    regions = regions or regions_from_config()
+    blocked = np.zeros(len(df), dtype=bool)
+    blocked[violations.loc[violations["severity"] == ERROR, "row"].to_numpy(dtype=np.int64)] = True
+    membership = route(bits, regions)
+    by_region = {region_label(region.table): {"rows": int(membership[:, i].sum()),
+                                              "quarantined": int((membership[:, i] & blocked).sum())}
+                 for i, region in enumerate(regions)}
+
+    return ValidationReport(len(df), violations, time.perf_counter() - start, by_region)
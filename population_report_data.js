@@ -0,0 +1,20 @@
+// Généré par etl_population/report_data.py - ne pas modifier à la main.
+const POPULATION_REPORT = {"years":[1960,1961,1962,1963,1964,1965,1966,1967,1968,1969,1970,1971,1972,1973,1974,1975,1976,1977,1978,1979,1980,1981,1982,1983,1984,1985,1986,1987,1988,1989,1990,1991,1992,1993,1994,1995,1996,1997,1998,1999,2000,2001,2002,2003,2004,2005,2006,2007,2008,2009,2010,2011,2012,2013,2014,2015,2016,2017,2018,2019,2020,2021,2022,2023],"names":["world","Africa","North America","South America","Asia","Europe","Oceania","Indice de développement humain faible","Indice de développement humain moyen","Indice de développement humain très élevé","Indice de développement humain élevé","Unknown","Belgium","Bolivia (Plurinational State of)","Comoros","Switzerland","Ghana","Iraq","Jamaica","Netherlands","Poland","Afghanistan","Algeria","Lao Peoples Democratic Republic","Nauru","Turkmenistan","Zambia","Australia","Bahamas","Bosnia and Herzegovina","Czech Republic","France","Philippines","Saint Vincent and the Grenadines","Armenia","Azerbaijan","Burundi","Bangladesh","Ecuador","Ethiopia","Gabon","Gambia","Haiti","Kiribati","Myanmar","Puerto Rico","Qatar","Slovakia","Togo","Ukraine","Bulgaria","Brunei Darussalam","Cyprus","Morocco","Moldova (Republic of)","Madagascar","Mongolia","Sierra Leone","Timor-Leste","Viet Nam","Angola","Belize","Hungary","Ireland","Kuwait","Maldives","Niger","Nicaragua","Palestine,State of","Argentina","Colombia","Jordan","Namibia","Serbia","Tajikistan","Cabo Verde","Georgia","Luxembourg","Oman","Russian Federation","Somalia","Seychelles","Chad","Tuvalu","Andorra","Bahrain","Brazil","Djibouti","Dominica","Estonia","Guatemala","Israel","Monaco","Malta","Senegal","Sint Maarten (Dutch part)","Vanuatu","Aruba","Benin","Belarus","Cayman Islands","Gibraltar","Guinea-Bissau","Grenada","India","Libya","Saint Lucia","Latvia","South Sudan","Trinidad and Tobago","Albania","Bhutan","Côte dIvoire","Sri Lanka","Panama","Syrian Arab Republic","Uzbekistan","Austria","Eritrea","Faroe Islands","Equatorial Guinea","Greenland","Guyana","Lithuania","Mexico","Norway","Rwanda","Swaziland","Thailand","United Arab Emirates","Spain","United Kingdom of Great Britain and Northern Ireland","Iceland","Kenya","Lesotho","Nigeria","Palau","Papua New Guinea","Burkina Faso","China","Cambodia","Lebanon","Liechtenstein","Paraguay","Slovenia","Tonga","Turkey","Tanzania,United Republic of","Virgin Islands (British)","Canada","Mali","Northern Mariana Islands","Sudan","Barbados","Fiji","Kyrgyzstan","Saint Martin (French part)","Mauritania","Zimbabwe","Chile","Croatia","Saudi Arabia","American Samoa","Bermuda","Costa Rica","Guinea","Isle of Man","Japan","Solomon Islands","San Marino","Suriname","Turks and Caicos Islands","Antigua and Barbuda","Honduras","Saint Kitts and Nevis","Romania","Sao Tome and Principe","South Africa","Greece","Mozambique","Mauritius","Botswana","Central African Republic","Finland","Kazakhstan","Marshall Islands","Montenegro","Malaysia","Nepal","New Zealand","Peru","United States of America","Cameroon","Cuba","Dominican Republic","Italy","Liberia","Sweden","Tunisia","Samoa","Curaçao","Denmark","Indonesia","Singapore","El Salvador","Uganda","Uruguay","Venezuela (Bolivarian Republic of)","Germany","Guam","Macedonia (the former Yugoslav Republic of)","Malawi","Pakistan","Portugal"],"series":{"world":{"scale":1,"top_n":null,"frames":[{"set":[0,2912728202]},{"set":[0,37643164]},{"set":[0,50948960]},{"set":[0,62998418]},{"set":[0,63386814]},{"set":[0,64040160]},{"set":[0,66508390]},{"set":[0,66297502]},{"set":[0,67946690]},{"set":[0,70376874]},{"set":[0,71512748]},{"set":[0,73829014]},{"set":[0,71825012]},{"set":[0,72512942]},{"set":[0,71932778]},{"set":[0,70161384]},{"set":[0,69075330]},{"set":[0,68636966]},{"set":[0,69552238]},{"set":[0,71022396]},{"set":[0,71670922]},{"set":[0,72995920]},{"set":[0,76099312]},{"set":[0,76904484]},{"set":[0,76376034]},{"set":[0,77989230]},{"set":[0,80435968]},{"set":[0,82715832]},{"set":[0,83461942]},{"set":[0,83517532]},{"set":[0,80946687]},{"set":[0,82677293]},{"set":[0,82061050]},{"set":[0,81683158]},{"set":[0,80057698]},{"set":[0,79010014]},{"set":[0,80071506]},{"set":[0,79993624]},{"set":[0,78889414]},{"set":[0,77610099]},{"set":[0,76748551]},{"set":[0,76546748]},{"set":[0,76881327]},{"set":[0,76457233]},{"set":[0,75991780]},{"set":[0,76247734]},{"set":[0,76572196]},{"set":[0,76536490]},{"set":[0,77801357]},{"set":[0,78168509]},{"set":[0,77980330]},{"set":[0,77439217]},{"set":[0,80646448]},{"set":[0,80934483]},{"set":[0,80113710]},{"set":[0,78958959]},{"set":[0,79043856]},{"set":[0,78810347]},{"set":[0,76865494]},{"set":[0,74638998]},{"set":[0,71992213]},{"set":[0,61506157]},{"set":[0,56684905]},{"set":[0,66401773]}]},"continents":{"scale":1,"top_n":null,"frames":[{"set":[1,211616618,2,198624756,3,149190820,4,1563547182,5,665217474,6,1563547182]},{"set":[1,5109932,2,3382744,3,4152170,4,14023525,5,7664145,6,14023525]},{"set":[1,5355640,2,3191100,3,4229671,4,26841933,5,7822462,6,26841933]},{"set":[1,5555278,2,3055100,3,4308915,4,38598162,5,7844213,6,38598162]},{"set":[1,5788382,2,3009200,3,4370355,4,38602739,5,7847708,6,38602739]},{"set":[1,6007038,2,2768200,3,4413664,4,39330638,5,7644284,6,39330638]},{"set":[1,6137260,2,2627900,3,4426729,4,42495471,5,6814686,6,42495471]},{"set":[1,6312620,2,2517000,3,4431809,4,42033160,5,6776735,6,42033160]},{"set":[1,6575197,2,2327000,3,4440563,4,43761711,5,6537706,6,43761711]},{"set":[1,6815114,2,2256000,3,4457101,4,46094895,5,6307061,6,46094895]},{"set":[1,7078762,2,2672000,3,4476601,4,47119898,5,5582027,6,47119898]},{"set":[1,7334273,2,3246632,3,4513112,4,48502688,5,5532086,6,48502688]},{"set":[1,7518339,2,2491031,3,4583107,4,46331250,5,6094111,6,46331250]},{"set":[1,7874336,2,2285914,3,4665496,4,46805834,5,5883802,6,46805834]},{"set":[1,8359364,2,2260792,3,4739800,4,45818020,5,5647940,6,45818020]},{"set":[1,8717114,2,2453906,3,4795206,4,43346593,5,5457889,6,43346593]},{"set":[1,8985368,2,2368733,3,4857644,4,41465984,5,5391316,6,41465984]},{"set":[1,9140482,2,2480235,3,4984080,4,40712157,5,5295621,6,40712157]},{"set":[1,9644515,2,2583560,3,5126009,4,41555372,5,5271480,6,41555372]},{"set":[1,10159033,2,2708541,3,5224805,4,42218618,5,5250896,6,42218618]},{"set":[1,10170860,2,2484993,3,5332284,4,42527614,5,5357905,6,42527614]},{"set":[1,10676926,2,2545628,3,5414281,4,43542288,5,5166072,6,43542288]},{"set":[1,11346798,2,2495426,3,5463775,4,46402444,5,4757020,6,46402444]},{"set":[1,11110095,2,2377990,3,5522689,4,47444850,5,4614318,6,47444850]},{"set":[1,10992709,2,2274095,3,5555632,4,46803446,5,4815790,6,46803446]},{"set":[1,11510776,2,2334538,3,5555043,4,47777302,5,4903723,6,47777302]},{"set":[1,12013340,2,2467646,3,5554423,4,49356174,5,5079552,6,49356174]},{"set":[1,12442949,2,2502790,3,5562000,4,51028619,5,5199638,6,51028619]},{"set":[1,12412402,2,2555644,3,5573312,4,51755780,5,5259421,6,51755780]},{"set":[1,12610492,2,2805528,3,5569178,4,51723723,5,4803733,6,51723723]},{"set":[1,12884700,2,3218842,3,5539878,4,51260133,5,4187093,6,51260133]},{"set":[1,12812772,2,3703977,3,5450466,4,50482506,5,4297054,6,50482506]},{"set":[1,12976879,2,3866418,3,5361445,4,49727488,5,3417740,6,49727488]},{"set":[1,13192527,2,3718815,3,5329986,4,49837941,5,2885466,6,49837941]},{"set":[1,12674042,2,3523309,3,5330059,4,49795802,5,2125024,6,49795802]},{"set":[1,13387053,2,3454074,3,5304118,4,49004304,5,1586799,6,49004304]},{"set":[1,14950773,2,3424290,3,5248009,4,48549726,5,1667337,6,48549726]},{"set":[1,15117332,2,3559098,3,5209538,4,48427397,5,1474606,6,48427397]},{"set":[1,14997738,2,3446671,3,5163626,4,47909977,5,1283982,6,47909977]},{"set":[1,15273536,2,3432455,3,5077119,4,46564282,5,1175868,6,46564282]},{"set":[1,15822775,2,3407403,3,4962333,4,45427620,5,999122,6,45427620]},{"set":[1,16339085,2,3142340,3,4833776,4,45010311,5,1121030,6,45010311]},{"set":[1,16898987,2,2994990,3,4694492,4,44629736,5,1562758,6,44629736]},{"set":[1,17454930,2,2766415,3,4520852,4,43435405,5,2220894,6,43435405]},{"set":[1,18033042,2,2994126,3,4413933,4,41872269,5,2554733,6,41872269]},{"set":[1,18567397,2,3015640,3,4368106,4,41043991,5,2625317,6,41043991]},{"set":[1,19159467,2,3192143,3,4279238,4,39975955,5,2684835,6,39975955]},{"set":[1,19858466,2,3169353,3,4172170,4,38782801,5,2798541,6,38782801]},{"set":[1,20529896,2,3221556,3,4060213,4,38380865,5,3602128,6,38380865]},{"set":[1,21054827,2,3060697,3,4008896,4,38488325,5,3539577,6,38488325]},{"set":[1,21610042,2,2930935,3,3716413,4,38681066,5,3477592,6,38681066]},{"set":[1,22075391,2,2589097,3,4104130,4,39552400,5,2188433,6,39552400]},{"set":[1,22573857,2,2668589,3,4066223,4,41048646,5,3423500,6,41048646]},{"set":[1,23191089,2,2550085,3,4008631,4,40003900,5,4046605,6,40003900]},{"set":[1,23717544,2,2679593,3,4005651,4,38746823,5,4177971,6,38746823]},{"set":[1,24451350,2,2623196,3,4029288,4,37244035,5,4179603,6,37244035]},{"set":[1,24560679,2,2738383,3,4008681,4,37302245,5,4088022,6,37302245]},{"set":[1,24751473,2,2483964,3,3942286,4,37884630,5,3559926,6,37884630]},{"set":[1,25585895,2,2243661,3,3841448,4,35413088,5,3424886,6,35413088]},{"set":[1,26195870,2,2037622,3,3682291,4,33154741,5,3036844,6,33154741]},{"set":[1,26675317,2,3607105,3,3352489,4,30846579,5,2169326,6,30846579]},{"set":[1,26686346,2,733141,3,2908816,4,25773659,5,786616,6,25773659]},{"set":[1,26776277,2,1921457,3,2747909,4,22787055,5,-3163848,6,22787055]},{"set":[1,27318774,2,2802083,3,3050977,4,24073200,5,2951841,6,24073200]}]},"idh_group":{"scale":1,"top_n":null,"frames":[{"set":[7,210758665,8,656632796,9,969456228,10,1070134430,11,5746083]},{"set":[7,4818282,8,16231287,9,12545868,10,3922982,11,124744]},{"set":[7,4972884,8,16715025,9,12792237,10,16331032,11,137784]},{"set":[7,5154656,8,17161211,9,12763573,10,27774452,11,144525]},{"set":[7,5400528,8,17540035,9,12821492,10,27482970,11,141788]},{"set":[7,5636645,8,17658992,9,12513813,10,28095652,11,135058]},{"set":[7,5796962,8,17649327,9,11473400,10,31461802,11,126900]},{"set":[7,6001375,8,17965103,9,11416461,10,30795960,11,118602]},{"set":[7,6271705,8,18612050,9,11124321,10,31821284,11,117331]},{"set":[7,6494227,8,19164008,9,11049539,10,33543742,11,125359]},{"set":[7,6733802,8,19343929,9,10922569,10,34371708,11,140739]},{"set":[7,6888121,8,18935180,9,12805187,10,35048364,11,152162]},{"set":[7,7019410,8,19648218,9,11614688,10,33378884,11,163813]},{"set":[7,7417120,8,21053161,9,11372275,10,32497072,11,173312]},{"set":[7,7916726,8,21462077,9,11219608,10,31161144,11,173224]},{"set":[7,8326419,8,21488818,9,11019561,10,29161600,11,164986]},{"set":[7,8699135,8,21438888,9,10627347,10,28146770,11,163190]},{"set":[7,8922583,8,22186706,9,10616994,10,26743082,11,167601]},{"set":[7,9269110,8,23050131,9,10761190,10,26097006,11,374801]},{"set":[7,9447665,8,23818909,9,10843552,10,26235370,11,676901]},{"set":[7,9235246,8,25087197,9,10746162,10,26070686,11,531631]},{"set":[7,9618362,8,25956884,9,10694763,10,26634084,11,91826]},{"set":[7,10623420,8,26372052,9,10306487,10,28730812,11,66541]},{"set":[7,10706170,8,27126387,9,9936162,10,28895244,11,240521]},{"set":[7,10527143,8,27750523,9,9937024,10,27885452,11,275893]},{"set":[7,11089926,8,27887079,9,10145057,10,28556564,11,310603]},{"set":[7,11432175,8,28171895,9,10367844,10,30137948,11,326106]},{"set":[7,11793641,8,28409431,9,10544437,10,31671212,11,297111]},{"set":[7,12170444,8,28607915,9,10647653,10,31986506,11,49424]},{"set":[7,12613420,8,29148228,9,10470289,10,31363784,11,-78188]},{"set":[7,12592798,8,29319833,9,9971725,10,29053571,11,8759]},{"set":[7,13000565,8,29237354,9,11126273,10,29544249,11,-231148]},{"set":[7,13947549,8,29779758,9,10995826,10,27610477,11,-272560]},{"set":[7,14459486,8,30328236,9,10236803,10,26426556,11,232077]},{"set":[7,13961059,8,30345835,9,9280212,10,26088731,11,381861]},{"set":[7,14368244,8,30272849,9,8560352,10,25512872,11,295697]},{"set":[7,15849196,8,30322152,9,8496136,10,25085483,11,318539]},{"set":[7,15968338,8,30541152,9,8535986,10,24633603,11,314545]},{"set":[7,15843217,8,30771120,9,8358026,10,23557477,11,359574]},{"set":[7,16256010,8,30859287,9,8170492,10,21965168,11,359142]},{"set":[7,16775633,8,31005214,9,7870908,10,20741393,11,355403]},{"set":[7,17242251,8,31308997,9,7983692,10,19651181,11,360627]},{"set":[7,18053422,8,31400568,9,8151316,10,18924791,11,351230]},{"set":[7,18401365,8,31070011,9,8248274,10,18379411,11,358172]},{"set":[7,18265848,8,30806719,9,8619152,10,17932199,11,367862]},{"set":[7,18609015,8,30288744,9,9135500,10,17862031,11,352444]},{"set":[7,19210851,8,29046757,9,10162023,10,17843574,11,308991]},{"set":[7,19304640,8,28520805,9,10835225,10,17558486,11,317334]},{"set":[7,20006299,8,28384185,9,11692460,10,17408396,11,310017]},{"set":[7,21005492,8,28474885,9,11084852,10,17333370,11,269910]},{"set":[7,21383489,8,29186856,9,9459768,10,17667187,11,283030]},{"set":[7,21925643,8,29473563,9,7380887,10,18506660,11,152464]},{"set":[7,21881402,8,29369134,9,9082814,10,20126313,11,186785]},{"set":[7,21557783,8,28453373,9,9461167,10,21083547,11,378613]},{"set":[7,21641026,8,27373081,9,9545542,10,21148815,11,405246]},{"set":[7,21617297,8,27367413,9,9384113,10,20190001,11,400135]},{"set":[7,21864906,8,28348944,9,9592572,10,18769764,11,467670]},{"set":[7,22728838,8,28148639,9,8752165,10,18687797,11,492908]},{"set":[7,23675260,8,26980068,9,8284999,10,17507949,11,417218]},{"set":[7,24413239,8,26524544,9,7400395,10,15728862,11,571958]},{"set":[7,25337371,8,26314479,9,6681958,10,13014100,11,644305]},{"set":[7,25740801,8,24375620,9,1300026,10,9580196,11,509514]},{"set":[7,25988793,8,23157235,9,5803422,10,1246441,11,489014]},{"set":[7,26693659,8,25755681,9,8181253,10,5238768,11,532412]}]},"countries":{"scale":1,"top_n":12,"frames":[{"set":[31,46649927,37,50396429,79,119897000,86,73092515,104,445954579,131,52400000,139,667070000,167,93216000,191,180671000,195,50199700,202,88382881,208,72814900]},{"set":[31,511714,37,1486340,79,1339000,86,2237493,104,10397297,131,400000,139,-6740000,167,839000,191,3020000,195,336650,202,2434057,208,562732]},{"set":[37,1578892,79,1355000,86,2269210,104,10672317,131,450000,139,5440000,167,878000,191,2847000,195,343100,202,2528551,208,648152,212,48161841],"drop":[31]},{"set":[37,1632454,79,1369000,86,2316337,104,10909426,131,400000,139,16565000,167,967000,191,2704000,195,372550,202,2617038,208,688569,212,1163209]},{"set":[37,1680350,79,1385000,86,2347239,104,11125690,131,350000,139,16020000,167,1003000,191,2647000,195,423350,202,2712534,208,603984,212,1227542]},{"set":[37,1725694,79,1400000,86,2360953,104,11055037,131,348050,139,16830000,167,1049000,191,2414000,195,437000,202,2482807,208,645358,212,1289034]},{"set":[37,1765100,79,723000,86,2355536,104,10878271,131,300450,139,20215000,167,899000,191,2257000,195,406650,202,2403237,208,636616,212,1357788]},{"set":[37,1839229,79,728000,86,2344005,104,10994452,131,295100,139,19150000,167,1028000,191,2152000,195,381500,202,2699644,208,351025,212,1430379]},{"set":[37,1891164,79,732000,86,2335958,104,11444840,131,268100,139,19960000,167,1132000,191,1994000,195,335250,202,2877974,208,342978,212,1494950]},{"set":[37,1871256,79,736000,86,2341135,104,11882761,131,230050,135,54360750,139,21515000,167,1208000,191,1971000,202,3010523,208,615368,212,1552062],"drop":[195]},{"set":[37,1674952,79,740000,86,2369494,104,12186631,131,221500,135,1208514,139,22290000,167,1184000,191,2375000,202,3079148,208,259607,212,1614067]},{"set":[37,834344,79,751000,86,2396413,104,12497877,131,232973,135,1268350,139,22790000,167,2294000,191,2609000,202,3118741,208,143553,212,1587909]},{"set":[37,970501,79,754000,86,2428106,104,12838795,131,189842,135,1336220,139,20925000,167,1491000,191,2235000,202,3157010,208,375610,212,1630784]},{"set":[37,1798113,79,760000,86,2472510,104,13269510,131,108462,135,1431612,139,19910000,167,1519000,191,2013000,202,3204913,208,248214,212,1776059]},{"set":[37,1802989,79,763000,86,2500468,104,13614468,124,56945880,135,1552485,139,18410000,167,1455000,191,1945000,202,3236138,208,30767,212,1863545],"drop":[131]},{"set":[37,1752538,79,768000,86,2533143,104,13802268,124,1746002,135,1693381,139,16045000,167,1411000,191,2119000,202,3268019,208,-293879,212,1977830]},{"set":[37,1679735,79,947000,86,2585989,104,13927229,124,1760661,135,1807003,139,14290000,167,1202000,191,2062000,202,3307810,208,-336604,212,2103924]},{"set":[37,1757708,79,953000,86,2653382,104,14234180,124,1809962,135,1931340,139,12770000,167,1097000,191,2204000,202,3340515,208,-177136,212,2220182]},{"set":[37,1869762,79,960000,86,2724496,104,14582132,124,1861492,135,2043689,139,12710000,167,1041000,191,2346000,202,3389424,208,-67994,212,2338225]},{"set":[37,1900601,79,967000,86,2782921,104,14980623,124,1848915,135,2116963,139,12840000,167,977000,191,2470000,202,3442123,208,34530,212,2618011]},{"set":[37,2021614,79,983000,86,2841080,104,15580002,124,1732274,135,2201132,139,12230000,167,917000,191,2170000,202,3484009,208,162226,212,3216716]},{"set":[37,2225071,79,931000,86,2879677,104,16040913,124,1528583,135,2223948,139,12650000,167,854000,191,2241000,202,3509241,208,119331,212,3646145]},{"set":[37,2400500,79,882000,86,2897035,104,16300168,124,1423014,135,2212680,139,14745000,167,819000,191,2198000,202,3542321,208,-74541,212,3557996]},{"set":[37,2490142,79,845000,86,2912275,104,16657080,124,1423527,135,1963519,139,14680000,167,827000,191,2128000,202,3561953,208,-205084,212,3252174]},{"set":[37,2488761,79,1077000,86,2911405,104,17068610,124,1409344,135,1985967,139,13515000,167,776000,191,2033000,202,3541351,208,-269597,212,2923495]},{"set":[37,2424860,79,1113000,86,2894405,104,17346928,124,1382352,135,2247698,139,14215000,167,754000,191,2099000,202,3459732,208,-173812,212,3117685]},{"set":[37,2312647,79,1036000,86,2860175,104,17636909,124,1352359,135,2218934,139,15750000,167,645000,191,2209000,202,3343579,208,35563,212,3496971]},{"set":[37,2218510,79,1014000,86,2822909,104,17837132,124,1329139,135,2240002,139,17245000,167,587000,191,2156000,202,3286117,208,119484,212,3632570]},{"set":[37,2198577,79,949000,86,2787709,104,18013556,124,1338511,135,2307280,139,17595000,167,509000,191,2210000,202,3273257,208,304699,212,3716745]},{"set":[37,2204841,79,864000,86,2749438,104,18282992,124,1341734,135,2392597,139,17020000,167,491000,191,2320000,202,3254527,208,606664,212,3702548]},{"set":[37,2253977,79,248406,86,2703035,104,18439492,124,1486679,135,2470193,139,16535000,167,409000,191,2804000,202,3210700,208,681746,212,3743683]},{"set":[37,2095183,79,424810,86,2629999,104,18489591,124,1631167,135,2471103,139,15595000,167,486000,191,3358000,202,3201354,208,580867,212,3789500]},{"set":[37,2029268,79,143981,86,2564345,104,18632293,124,1641569,135,2496685,139,14190000,167,461000,191,3533000,202,3197188,208,610702,212,3171610]},{"set":[37,2146655,79,-79420,86,2540085,104,18777248,124,1655283,135,2593420,139,13470000,167,404000,191,3405000,202,3178871,208,531765,212,3171436]},{"set":[37,2196134,79,-50865,86,2539597,104,18910661,124,1665977,135,2680656,139,13395000,167,349000,191,3207000,202,3191246,208,281985,212,3698524]},{"set":[37,2178447,79,-32125,86,2534856,104,19017171,124,1655148,135,2731489,139,13020000,167,294000,191,3152000,202,3211629,208,239703,212,3872337]},{"set":[37,2083530,79,-215658,86,2521794,104,19002089,124,1616983,135,2768573,139,12695000,167,285000,191,3116000,202,3233629,208,236780,212,4117334]},{"set":[37,2162358,79,-244768,86,2509585,104,19054012,124,1596539,135,2834998,139,12525000,167,300000,191,3263000,202,3254216,208,119940,212,4095457]},{"set":[37,2311245,79,-244577,86,2493097,104,19099346,124,1584190,135,2899346,139,11860000,167,343000,191,3197000,202,3227479,208,12424,212,4145839]},{"set":[37,2404353,79,-456008,86,2446477,104,19065478,124,1567526,135,3005038,139,10800000,167,231000,191,3186000,202,3141424,208,53048,212,4218356]},{"set":[37,2438503,79,-617907,86,2387439,104,19133621,124,1538632,135,3156419,139,9910000,167,212000,191,3122411,202,3075511,208,111265,212,4675462]},{"set":[37,2477157,79,-620387,86,2338161,104,19337232,124,1520846,135,3300694,139,9205000,167,306000,191,2806544,202,3040016,208,138417,212,4847803]},{"set":[37,2469342,79,-669985,86,2264804,104,19342132,124,1522793,135,3430348,139,8550000,167,296000,191,2656238,202,3002655,208,138570,212,4045080]},{"set":[32,82942837,37,2363380,79,-657879,86,2152593,104,19102084,124,1512260,135,3536775,139,8000000,167,273000,191,2482740,202,2965029,212,3613873],"drop":[208]},{"set":[32,1664664,37,2286519,79,-581302,86,2092765,104,18849460,124,1516472,135,3637047,139,7675000,167,43000,191,2697365,202,2858474,212,3771940]},{"set":[32,1653749,37,2122865,79,-548502,86,2075291,104,18374130,124,1496589,135,3733874,139,7645000,167,12000,191,2711301,202,2866549,212,3723478]},{"set":[32,1640585,37,1716241,79,-469177,86,2023348,104,17735075,124,1444388,135,3839042,139,7300000,167,81000,191,2863313,202,2992283,212,3697886]},{"set":[32,1659542,37,1507103,79,-244523,86,1958771,104,17318021,124,1416183,135,3964264,139,6865000,167,147000,191,2851295,202,3060862,212,3854537]},{"set":[32,1690949,37,1285384,79,-62748,86,1892864,104,17042997,124,1381516,135,4088478,139,6770000,167,62000,191,2862759,202,3078254,212,4007434]},{"set":[32,1694625,37,1285492,79,42982,86,1845232,104,16905354,124,1364939,135,4213252,139,6605000,167,-16000,191,2677563,202,3044756,212,4191267]},{"set":[32,1689749,37,1684329,79,64120,86,1835943,104,16973460,124,1482973,135,4357095,139,6445000,167,23000,191,2555614,202,3034874,212,4331276]},{"set":[32,1701213,37,1819866,79,168727,86,1831810,104,17007571,124,1618080,135,4510892,139,7330000,167,-237000,191,2256338,202,3083524,212,4148240]},{"set":[32,1694404,37,1879644,79,360252,86,1792405,104,16866024,124,1605428,135,4612187,139,9155000,167,-204000,191,2294181,202,3122998,212,3603123]},{"set":[32,1667790,37,1939490,79,427191,86,1744060,104,16644848,124,1534777,135,4650191,139,9050000,167,-184000,191,2182285,202,3053223,212,3131701]},{"set":[32,1625094,37,1931160,79,431585,86,1737883,104,16114446,124,1465201,135,4652893,139,8620000,167,-169000,191,2326382,202,2953843,212,2914066]},{"set":[32,1706164,37,1868701,79,403493,86,1728555,104,15619996,124,1394010,135,4616769,139,8000000,167,-135000,191,2352665,202,2862209,212,2717670]},{"set":[37,1954568,39,105293228,79,374744,86,1671373,104,15769835,124,1369324,135,4671146,139,7930000,167,-65000,191,2332761,202,2758212,212,2555542],"drop":[32]},{"set":[37,2009396,39,2904722,79,277800,86,1645382,104,15559340,124,1320037,135,4828976,139,8425000,167,-104000,191,2050373,202,2648670,212,2854815]},{"set":[37,1889994,39,2931488,79,104846,86,1661632,104,14807626,124,1174603,135,4891716,139,6545000,167,-161000,191,1716071,202,2567991,212,3351824]},{"set":[37,1832264,39,2991156,79,55185,86,1616286,104,14108744,124,1071450,135,4916869,139,4985000,167,-178000,191,1491754,202,2516035,212,3561801]},{"set":[37,1904729,39,3070317,79,-208143,86,1413426,104,13275077,124,912991,135,5022913,139,3355000,167,-372000,191,3196980,202,2275092,212,3903461]},{"set":[37,1935300,39,3092115,79,-498386,86,1129919,104,11176715,124,706836,135,5073918,139,1260000,167,-579407,191,522044,202,1895221,212,4205376]},{"set":[37,1830121,39,3096898,79,-509829,86,987275,104,9609331,124,798987,135,5139889,139,-185000,167,-556604,191,1222434,202,1748148,212,4422745]},{"set":[37,1767947,39,3147136,79,-410803,86,1108948,104,11454490,124,951442,135,5263420,139,-1465000,167,-608339,191,1643484,202,2032783,212,4660796]}]}}};
+
+function decodeFrames(report, name) {
+    const series = report.series[name];
+    const last = new Map();
+    const shown = new Set();
+    return report.years.map((year, j) => {
+        const frame = series.frames[j];
+        (frame.drop || []).forEach(i => shown.delete(i));
+        const set = frame.set || [];
+        for (let k = 0; k < set.length; k += 2) {
+            last.set(set[k], (last.get(set[k]) || 0) + set[k + 1]);
+            shown.add(set[k]);
+        }
+        const entries = Array.from(shown, i => [report.names[i], last.get(i) * series.scale]);
+        entries.sort((a, b) => b[1] - a[1]);
+        return Object.assign({ year: year }, Object.fromEntries(entries));
+    });
+}
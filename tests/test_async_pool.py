@@ -0,0 +1,207 @@
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from etl_population.async_pool import AsyncConnectionPool, TableWriter, run_load_tables
+from etl_population.bulk_loader import connect_standin, create_table, row_count
+
+TABLES = ["population_a", "population_b", "population_c"]
+
+
+class Tracker:
+    """Compte les connexions ouvertes et les écritures simultanées."""
+
+    def __init__(self, delay=0.0, gate=None):
+        self.delay = delay
+        self.gate = gate
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+
+    def enter(self):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def leave(self):
+        with self.lock:
+            self.active -= 1
+
+
+class TrackedCursor:
+    def __init__(self, cursor, tracker):
+        self._cursor = cursor
+        self._tracker = tracker
+
+    def executemany(self, statement, rows):
+        self._tracker.enter()
+        try:
+            if self._tracker.gate is not None:
+                self._tracker.gate.wait(timeout=5)
+            time.sleep(self._tracker.delay)
+        finally:
+            self._tracker.leave()
+        return self._cursor.executemany(statement, rows)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class TrackedConnection:
+    def __init__(self, conn, tracker):
+        self._conn = conn
+        self._tracker = tracker
+
+    def cursor(self):
+        return TrackedCursor(self._conn.cursor(), self._tracker)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "standin.db")
+    conn = connect_standin(path)
+    for table in TABLES:
+        create_table(conn, table, ["country_code TEXT PRIMARY KEY", "population REAL"])
+    conn.close()
+    return path
+
+
+def connector(path, tracker):
+    def connect():
+        with tracker.lock:
+            tracker.connections += 1
+        conn = connect_standin(path)
+        conn.execute("PRAGMA busy_timeout = 10000")
+        return TrackedConnection(conn, tracker)
+    return connect
+
+
+def frame(prefix, n, start=0):
+    return pd.DataFrame({"country_code": [f"{prefix}{i:04d}" for i in range(start, start + n)],
+                         "population": [float(i) for i in range(start, start + n)]})
+
+
+def counts(path):
+    conn = connect_standin(path)
+    try:
+        return {table: row_count(conn, table) for table in TABLES}
+    finally:
+        conn.close()
+
+
+def test_pool_never_opens_more_than_size_connections(database):
+    tracker = Tracker(delay=0.02)
+
+    def work(conn):
+        tracker.enter()
+        time.sleep(0.02)
+        tracker.leave()
+
+    async def main():
+        pool = AsyncConnectionPool(connector(database, tracker), size=2)
+        try:
+            await asyncio.gather(*(pool.run(work) for _ in range(10)))
+        finally:
+            await pool.close()
+
+    asyncio.run(main())
+    assert tracker.connections == 2
+    assert tracker.max_active == 2
+
+
+def test_pool_size_must_be_positive():
+    with pytest.raises(ValueError):
+        AsyncConnectionPool(lambda: None, size=0)
+
+
+def test_tables_are_written_concurrently(database):
+    tracker = Tracker(delay=0.05)
+    frames = {table: [frame(table[-1], 50, start) for start in (0, 50)] for table in TABLES}
+    reports = run_load_tables(connector(database, tracker), frames, pool_size=3, batch_size=20)
+
+    assert tracker.max_active >= 2
+    assert tracker.connections <= 3
+    assert {table: report.rows_loaded for table, report in reports.items()} == dict.fromkeys(TABLES, 100)
+    assert counts(database) == dict.fromkeys(TABLES, 100)
+
+
+def test_order_groups_run_one_after_the_other(database):
+    tracker = Tracker(delay=0.02)
+    frames = {table: frame(table[-1], 10) for table in TABLES}
+    run_load_tables(connector(database, tracker), frames, order=[[TABLES[0]], TABLES[1:]], pool_size=3)
+    assert counts(database) == dict.fromkeys(TABLES, 10)
+
+
+def test_full_queue_blocks_the_producer(database):
+    gate = threading.Event()
+    tracker = Tracker(gate=gate)
+
+    async def main():
+        pool = AsyncConnectionPool(connector(database, tracker), size=1)
+        writer = TableWriter(pool, TABLES[0], queue_size=1).start()
+        try:
+            await writer.put(frame("A", 5, 0))
+            await asyncio.sleep(0.1)                  # le consommateur a pris le premier bloc et attend
+            await writer.put(frame("A", 5, 5))         # remplit la file
+            blocked = asyncio.create_task(writer.put(frame("A", 5, 10)))
+            await asyncio.sleep(0.1)
+            assert writer.queue.full()
+            assert not blocked.done()
+
+            gate.set()
+            await asyncio.wait_for(blocked, timeout=5)
+            return await asyncio.wait_for(writer.close(), timeout=5)
+        finally:
+            gate.set()
+            await pool.close()
+
+    report = asyncio.run(main())
+    assert report.rows_loaded == 15
+    assert counts(database)[TABLES[0]] == 15
+
+
+def test_failed_batch_is_reported_for_its_table_only(database):
+    tracker = Tracker()
+    frames = {table: frame(table[-1], 10) for table in TABLES}
+    frames["population_missing"] = frame("M", 10)
+    reports = run_load_tables(connector(database, tracker), frames, pool_size=2)
+
+    assert len(reports["population_missing"].errors) == 1
+    assert "no such table" in reports["population_missing"].errors[0].error
+    assert all(not reports[table].errors for table in TABLES)
+    assert counts(database) == dict.fromkeys(TABLES, 10)
+
+
+def test_writer_exception_propagates_without_blocking_the_producer(database):
+    def broken():
+        raise ConnectionError("serveur injoignable")
+
+    async def main():
+        pool = AsyncConnectionPool(broken, size=1)
+        try:
+            writer = TableWriter(pool, TABLES[0], queue_size=1).start()
+            for start in range(0, 50, 5):
+                await writer.put(frame("A", 5, start))
+            await writer.close()
+        finally:
+            await pool.close()
+
+    with pytest.raises(ConnectionError, match="injoignable"):
+        asyncio.run(asyncio.wait_for(main(), timeout=5))
+
+
+def test_rerun_with_key_columns_does_not_duplicate(database):
+    tracker = Tracker()
+    frames = {table: frame(table[-1], 30) for table in TABLES}
+    for _ in range(2):
+        reports = run_load_tables(connector(database, tracker), frames, pool_size=2, batch_size=7,
+                                  key_columns=["country_code"], dialect="sqlite")
+        assert all(report.rows_loaded == 30 for report in reports.values())
+    assert counts(database) == dict.fromkeys(TABLES, 30)
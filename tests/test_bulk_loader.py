@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl_population.bulk_loader import BulkLoader, connect_standin, create_table, frame_rows, row_count
+
+TABLE = "population_test"
+
+
+@pytest.fixture
+def conn():
+    conn = connect_standin()
+    create_table(conn, TABLE, ["id INTEGER PRIMARY KEY", "country_code TEXT", "population REAL"])
+    yield conn
+    conn.close()
+
+
+def frame(ids):
+    ids = list(ids)
+    return pd.DataFrame({"id": ids, "country_code": [f"C{i}" for i in ids],
+                         "population": np.arange(len(ids), dtype=np.float64)})
+
+
+def loader(conn, batch_size):
+    return BulkLoader(conn, TABLE, ["id", "country_code", "population"], batch_size=batch_size)
+
+
+@pytest.mark.parametrize("rows, batch_size, batches", [(2500, 1000, 3), (2000, 1000, 2), (999, 1000, 1),
+                                                       (1, 1, 1), (0, 1000, 0)])
+def test_batching_boundaries(conn, rows, batch_size, batches):
+    report = loader(conn, batch_size).load(frame(range(rows)))
+    assert (report.batches, report.rows_sent, report.rows_loaded) == (batches, rows, rows)
+    assert report.errors == []
+    assert row_count(conn, TABLE) == rows
+
+
+def test_frames_continue_row_numbering(conn):
+    report = loader(conn, 4).load([frame(range(0, 6)), frame(range(6, 9))])
+    assert (report.batches, report.rows_sent, report.rows_loaded) == (3, 9, 9)
+    assert row_count(conn, TABLE) == 9
+
+
+def test_failed_batch_is_rolled_back_and_others_kept(conn):
+    ids = list(range(25))
+    ids[13] = 11                     # clé en double dans le deuxième lot (lignes 10 à 19)
+    report = loader(conn, 10).load(frame(ids))
+
+    assert (report.batches, report.rows_sent, report.rows_loaded) == (3, 25, 15)
+    assert len(report.errors) == 1
+    error = report.errors[0]
+    assert (error.batch, error.first_row, error.last_row) == (2, 10, 19)
+    assert "UNIQUE" in error.error
+
+    loaded = [row[0] for row in conn.execute(f"SELECT id FROM {TABLE} ORDER BY id")]
+    assert loaded == list(range(10)) + list(range(20, 25))
+
+
+def test_error_row_ranges_span_frames(conn):
+    conn.execute(f"INSERT INTO {TABLE} VALUES (7, 'C7', 0)")
+    conn.commit()
+    report = loader(conn, 3).load([frame(range(0, 4)), frame(range(4, 8))])
+    # Deuxième bloc : lots 3 (lignes 4 à 6) et 4 (ligne 7, en conflit)
+    assert [(e.batch, e.first_row, e.last_row) for e in report.errors] == [(4, 7, 7)]
+    assert report.rows_loaded == 7
+
+
+def test_placeholder_column_mismatch():
+    with pytest.raises(ValueError, match="placeholders"):
+        BulkLoader(None, TABLE, ["id", "country_code"], statement=f"INSERT INTO {TABLE} VALUES (?, ?, ?)")
+
+
+def test_batch_size_must_be_positive():
+    with pytest.raises(ValueError):
+        BulkLoader(None, TABLE, ["id"], batch_size=0)
+
+
+def test_frame_rows_native_types():
+    df = pd.DataFrame({"a": pd.array([1, None], dtype="Int64"), "b": [1.5, np.nan], "c": ["x", None]})
+    assert frame_rows(df) == [(1, 1.5, "x"), (None, None, None)]
@@ -0,0 +1,48 @@
+import pandas as pd
+
+from etl_population.bulk_loader import BulkLoader, connect_standin, create_table, row_count
+from etl_population.checkpoint import BatchJournal, journal_path
+from etl_population.delta_load import upsert_statement
+
+TABLE = "population_test"
+COLUMNS = ["country_code", "population"]
+
+
+def setup(tmp_path):
+    conn = connect_standin(str(tmp_path / "target.db"))
+    create_table(conn, TABLE, ["country_code TEXT PRIMARY KEY", "population REAL"])
+    journal = BatchJournal(journal_path(str(tmp_path), TABLE), ["country_code"])
+    return conn, journal
+
+
+def load(conn, journal, df):
+    statement = upsert_statement(TABLE, ["country_code"], COLUMNS, dialect="sqlite")
+    return BulkLoader(conn, TABLE, COLUMNS, batch_size=10, statement=statement, journal=journal).load(df)
+
+
+def frame(n):
+    return pd.DataFrame({"country_code": [f"C{i:03d}" for i in range(n)], "population": [float(i) for i in range(n)]})
+
+
+def test_rerun_skips_committed_batches(tmp_path):
+    conn, journal = setup(tmp_path)
+    load(conn, journal, frame(20))              # interrompu avant journal.clear()
+
+    resumed = BatchJournal(journal.path, ["country_code"])
+    assert resumed.verify(row_count(conn, TABLE))
+    report = load(conn, resumed, frame(30))
+    assert (report.batches_skipped, report.rows_skipped, report.rows_loaded) == (2, 20, 10)
+    assert row_count(conn, TABLE) == 30
+
+
+def test_journal_dropped_when_target_lost_its_rows(tmp_path):
+    conn, journal = setup(tmp_path)
+    load(conn, journal, frame(20))
+    conn.execute(f"DELETE FROM {TABLE}")
+    conn.commit()
+
+    resumed = BatchJournal(journal.path, ["country_code"])
+    assert not resumed.verify(row_count(conn, TABLE))
+    report = load(conn, resumed, frame(20))
+    assert (report.batches_skipped, report.rows_loaded) == (0, 20)
+    assert row_count(conn, TABLE) == 20
@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+
+from etl_population.bulk_loader import connect_standin, create_table, row_count
+from etl_population.config import DatabaseConfig
+from etl_population.delta_load import incremental_load, target_manifest_dir
+
+TABLE = "dim_year"
+
+
+def years(first, last):
+    return pd.DataFrame({"year": range(first, last + 1)})
+
+
+def connect(path):
+    conn = connect_standin(str(path))
+    create_table(conn, TABLE, ["year INTEGER PRIMARY KEY"])
+    return conn
+
+
+@pytest.fixture
+def manifests(tmp_path):
+    return str(tmp_path / "manifests")
+
+
+def load(conn, df, manifest_dir):
+    return incremental_load(conn, df, TABLE, manifest_dir, dialect="sqlite")
+
+
+def test_manifests_are_scoped_by_target(tmp_path, manifests):
+    first, second = (DatabaseConfig(sqlite=str(tmp_path / name)) for name in ("a.db", "b.db"))
+    dirs = [target_manifest_dir(manifests, db.identity) for db in (first, second)]
+    assert dirs[0] != dirs[1]
+
+    for db, directory in zip((first, second), dirs):
+        conn = connect(db.sqlite)
+        report = load(conn, years(1960, 1969), directory)
+        assert (report.inserted, report.unchanged) == (10, 0)
+        assert row_count(conn, TABLE) == 10
+        conn.close()
+
+
+def test_second_run_sends_nothing(tmp_path, manifests):
+    conn = connect(tmp_path / "a.db")
+    load(conn, years(1960, 1969), manifests)
+    report = load(conn, years(1960, 1970), manifests)
+    assert (report.inserted, report.unchanged, report.reloaded) == (1, 10, False)
+    conn.close()
+
+
+def test_emptied_target_is_reloaded(tmp_path, manifests):
+    conn = connect(tmp_path / "a.db")
+    load(conn, years(1960, 1969), manifests)
+    conn.execute(f"DELETE FROM {TABLE}")
+    conn.commit()
+
+    report = load(conn, years(1960, 1969), manifests)
+    assert report.reloaded
+    assert report.inserted == 10
+    assert row_count(conn, TABLE) == 10
+    conn.close()
+
+
+def test_delete_missing_removes_keys_absent_from_extract(tmp_path, manifests):
+    conn = connect(tmp_path / "a.db")
+    load(conn, years(1960, 1969), manifests)
+    report = incremental_load(conn, years(1960, 1964), TABLE, manifests, dialect="sqlite", delete_missing=True)
+    assert (report.deleted, report.purge.rows_loaded) == (5, 5)
+    assert [row[0] for row in conn.execute(f"SELECT year FROM {TABLE} ORDER BY year")] == list(range(1960, 1965))
+
+    report = incremental_load(conn, years(1960, 1964), TABLE, manifests, dialect="sqlite", delete_missing=True)
+    assert (report.unchanged, report.deleted) == (5, 0)
+    conn.close()
+
+
+def test_rows_absent_from_extract_are_kept_by_default(tmp_path, manifests):
+    conn = connect(tmp_path / "a.db")
+    load(conn, years(1960, 1969), manifests)
+    report = load(conn, years(1960, 1964), manifests)
+    assert report.deleted == 5
+    assert row_count(conn, TABLE) == 10
+    conn.close()
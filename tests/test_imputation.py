@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl_population.imputation import STRATEGIES, impute_block, impute_years
+from etl_population.schema import SEPARATOR, year_columns_of
+from etl_population.streaming import clean_chunks, read_population_chunks
+
+SOURCE = os.path.join(os.path.dirname(__file__), "..", "population_mondiale.csv")
+
+
+def legacy_loop(df, cols_years):
+    # Boucle du script d'origine : moyenne de la ligne recalculée pour chaque colonne
+    df = df.copy()
+    for col in cols_years:
+        df[col] = df[col].fillna(df[cols_years].mean(axis=1))
+    return df
+
+
+@pytest.fixture(scope="module")
+def source():
+    df = pd.read_csv(SOURCE, sep=SEPARATOR)
+    years = year_columns_of(df.columns)
+    # Trous supplémentaires (1 %) et un pays sans aucune valeur
+    block = df[years].to_numpy(dtype=np.float64)
+    block[np.random.default_rng(0).random(block.shape) < 0.01] = np.nan
+    block[5] = np.nan
+    df[years] = block
+    return df, years
+
+
+def test_row_mean_matches_the_legacy_loop(source):
+    df, years = source
+    expected = legacy_loop(df, years)[years].to_numpy()
+    result = impute_years(df, years, strategy="row_mean")[years].to_numpy()
+    np.testing.assert_allclose(result, expected, rtol=1e-12)
+    assert np.isnan(result[5]).all()
+
+
+def test_chunked_cleaning_matches_the_legacy_loop(tmp_path, source):
+    df, years = source
+    path = str(tmp_path / "population.csv")
+    df.to_csv(path, sep=SEPARATOR, index=False)
+    cleaned = pd.concat(clean_chunks(read_population_chunks(path, chunksize=37, year_dtype="float64")),
+                        ignore_index=True)
+    np.testing.assert_allclose(cleaned[years].to_numpy(), legacy_loop(df, years)[years].to_numpy(), rtol=1e-12)
+
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+def test_strategies_fill_every_gap(strategy):
+    block = np.array([[np.nan, 2.0, np.nan, 4.0, np.nan], [np.nan] * 5, [1.0, 2.0, 3.0, 4.0, 5.0]])
+    filled = impute_block(block, strategy)
+    assert not np.isnan(filled[[0, 2]]).any()
+    assert np.isnan(filled[1]).all()
+    np.testing.assert_array_equal(filled[2], block[2])
+    np.testing.assert_array_equal(filled[0, [1, 3]], [2.0, 4.0])
+
+
+def test_interpolate_and_ffill_bfill():
+    block = np.array([[np.nan, 2.0, np.nan, 4.0, np.nan]])
+    np.testing.assert_array_equal(impute_block(block, "interpolate"), [[2.0, 2.0, 3.0, 4.0, 4.0]])
+    np.testing.assert_array_equal(impute_block(block, "ffill_bfill"), [[2.0, 2.0, 2.0, 4.0, 4.0]])
+    np.testing.assert_array_equal(impute_block(block, "row_mean"), [[3.0, 2.0, 3.0, 4.0, 3.0]])
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError, match="Stratégie d'imputation inconnue"):
+        impute_block(np.zeros((1, 2)), "median")
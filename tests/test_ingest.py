@@ -0,0 +1,59 @@
+import os
+import shutil
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from etl_population.cli import main
+from etl_population.schema import SEPARATOR, read_year_columns
+
+SOURCE = os.path.join(os.path.dirname(__file__), "..", "population_mondiale.csv")
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    shutil.copy(SOURCE, "population_mondiale.csv")
+    with open("etl_config.json", "w", encoding="utf-8") as handle:
+        handle.write('{"figures_dir": "figures", "database": {"sqlite": "warehouse.db"}}')
+    assert main(["load"]) == 0
+    return tmp_path
+
+
+def annual_file(path, growth=1.01, missing=()):
+    source = pd.read_csv("population_mondiale.csv", sep=SEPARATOR, usecols=["country_code", "2023"])
+    source = source[~source["country_code"].isin(missing)]
+    annual = pd.DataFrame({"country_code": source["country_code"], "2024": source["2023"] * growth})
+    annual.to_csv(path, sep=SEPARATOR, index=False)
+    return str(path)
+
+
+def test_blocked_ingest_leaves_source_untouched(workspace):
+    with open("population_mondiale.csv", "rb") as handle:
+        before = handle.read()
+    # Sans valeur 2024, MWI reçoit la moyenne de sa ligne : chute bloquante (yoy_jump)
+    assert main(["ingest", annual_file(workspace / "annual.csv", missing=["MWI", "FRA", "USA"])]) == 1
+    with open("population_mondiale.csv", "rb") as handle:
+        assert handle.read() == before
+    assert not [name for name in os.listdir(workspace) if name.startswith("tmp")]
+
+
+def test_ingest_adds_the_year_to_the_source(workspace):
+    assert main(["ingest", annual_file(workspace / "annual.csv")]) == 0
+    assert read_year_columns("population_mondiale.csv")[-1] == "2024"
+    assert main(["ingest", annual_file(workspace / "annual.csv")]) == 0     # rien de nouveau
+
+
+def test_ingest_ships_history_revised_by_imputation(workspace, capsys):
+    assert main(["ingest", annual_file(workspace / "annual.csv")]) == 0
+    capsys.readouterr()
+    # Un `load` complet juste après ne trouve plus rien à envoyer : l'entrepôt suit la source
+    assert main(["load"]) == 0
+    assert "population_data : 0 insérée(s), 0 modifiée(s)" in capsys.readouterr().out
+
+    cleaned = pd.read_csv("population_mondiale_cleaned.csv", sep=SEPARATOR).set_index("country_code")
+    years = read_year_columns("population_mondiale_cleaned.csv")
+    with sqlite3.connect("warehouse.db") as conn:
+        world = pd.read_sql("SELECT * FROM population_mondiale_1960_2023", conn).set_index("country_code")
+    pd.testing.assert_frame_equal(world.loc[cleaned.index, years], cleaned[years], check_dtype=False)
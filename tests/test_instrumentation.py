@@ -0,0 +1,43 @@
+import pytest
+
+from etl_population.instrumentation import RunRecorder
+
+
+def recorder():
+    run = RunRecorder("population_etl", run_id="test")
+    for rows in (10, 20, 30):
+        with run.stage("validate", rows_in=rows) as stage:
+            stage.rows_out = rows - 1
+    with pytest.raises(RuntimeError):
+        with run.stage("insert", rows_in=5):
+            raise RuntimeError("lot perdu")
+    with run.stage("insert", rows_in=7):
+        pass
+    return run
+
+
+def samples(text):
+    return [line for line in text.splitlines() if line and not line.startswith("#")]
+
+
+def test_one_sample_per_label_set():
+    lines = samples(recorder().prometheus_text())
+    series = [line.rsplit(" ", 1)[0] for line in lines]
+    assert len(series) == len(set(series))
+
+
+def test_repeated_stages_are_aggregated():
+    values = {line.rsplit(" ", 1)[0]: line.rsplit(" ", 1)[1] for line in samples(recorder().prometheus_text())}
+    labels = '{pipeline="population_etl",stage="%s"}'
+    assert values["etl_stage_rows_in" + labels % "validate"] == "60"
+    assert values["etl_stage_rows_out" + labels % "validate"] == "57"
+    assert values["etl_stage_runs" + labels % "validate"] == "3"
+    assert values["etl_stage_rows_in" + labels % "insert"] == "12"
+    assert values["etl_stage_success" + labels % "validate"] == "1"
+    assert values["etl_stage_success" + labels % "insert"] == "0"
+
+
+def test_json_report_keeps_every_stage():
+    stages = recorder().report()["stages"]
+    assert [stage["name"] for stage in stages] == ["validate"] * 3 + ["insert"] * 2
+    assert [stage["status"] for stage in stages[3:]] == ["failed", "success"]
@@ -0,0 +1,18 @@
+import numpy as np
+
+from etl_population.measures import derived_measures
+from etl_population.schema import FACT_MEASURE_COLUMNS
+
+
+def test_measures_are_the_fact_columns():
+    assert list(derived_measures(np.ones((2, 12)))) == FACT_MEASURE_COLUMNS
+
+
+def test_measure_values():
+    block = np.array([[100.0, 110.0, 121.0, 133.1, 146.41, 161.051]])
+    measures = derived_measures(block, spans=(5,), window=3)
+    np.testing.assert_allclose(measures["yoy_growth"][0, 1:], 0.1)
+    np.testing.assert_allclose(measures["acceleration"][0, 2], 1.0)
+    np.testing.assert_allclose(measures["rolling_mean_3"][0, 2], 110.333333, rtol=1e-6)
+    np.testing.assert_allclose(measures["cagr_5"][0, 5], 0.1)
+    assert np.isnan(measures["cagr_5"][0, :5]).all()
@@ -0,0 +1,193 @@
+import functools
+import os
+import shutil
+import threading
+from datetime import datetime
+
+import pytest
+
+from etl_population.bulk_loader import connect_standin, row_count, table_columns
+from etl_population.cron import CronExpression, run_on_schedule
+from etl_population.orchestrator import NIFI_STANDARD, DagRunner, Flow, FlowContext, processor
+
+SOURCE = os.path.join(os.path.dirname(__file__), "..", "population_mondiale.csv")
+
+calls = []
+failures = {}
+lock = threading.Lock()
+
+
+@processor("test.Record")
+def record(context, inputs, properties):
+    with lock:
+        calls.append(properties["Label"])
+    return [*sum(inputs, []), properties["Label"]]
+
+
+@processor("test.Flaky")
+def flaky(context, inputs, properties):
+    label = properties["Label"]
+    with lock:
+        failures[label] = failures.get(label, 0) + 1
+        attempt = failures[label]
+    if attempt <= int(properties["Failures"]):
+        raise ConnectionError(f"{label} : tentative {attempt} en échec")
+    return [label]
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    calls.clear()
+    failures.clear()
+
+
+def flow(processors, connections):
+    return Flow.from_dict({"flow": {
+        "name": "test",
+        "processors": [{"id": pid, "name": pid, "type": type_name, "properties": properties}
+                       for pid, type_name, properties in processors],
+        "connections": [{"sourceId": source, "destinationId": destination} for source, destination in connections],
+    }})
+
+
+def by_name(results):
+    return {result.name: result for result in results}
+
+
+def test_stages_start_after_all_their_upstreams():
+    diamond = flow([(label, "test.Record", {"Label": label}) for label in "ABCD"],
+                   [("A", "B"), ("A", "C"), ("B", "D"), ("C", "D")])
+    results = by_name(DagRunner(diamond, max_workers=3).run())
+
+    assert all(result.status == "success" for result in results.values())
+    assert calls[0] == "A" and calls[-1] == "D"
+    assert sorted(calls[1:3]) == ["B", "C"]
+
+
+def test_cycle_is_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        flow([(label, "test.Record", {"Label": label}) for label in "AB"], [("A", "B"), ("B", "A")])
+
+
+def test_failed_stage_is_retried():
+    dag = flow([("A", "test.Flaky", {"Label": "A", "Failures": "2", "Retry Count": "2"}),
+                ("B", "test.Record", {"Label": "B"})], [("A", "B")])
+    results = by_name(DagRunner(dag, retry_delay=0).run())
+
+    assert (results["A"].status, results["A"].attempts) == ("success", 3)
+    assert results["B"].status == "success"
+
+
+def test_exhausted_retries_skip_downstream_only():
+    dag = flow([("A", "test.Flaky", {"Label": "A", "Failures": "5", "Retry Count": "1"}),
+                ("B", "test.Record", {"Label": "B"}),
+                ("C", "test.Record", {"Label": "C"})], [("A", "B")])
+    results = by_name(DagRunner(dag, retry_delay=0).run())
+
+    assert (results["A"].status, results["A"].attempts) == ("failed", 2)
+    assert "tentative 2" in results["A"].error
+    assert results["B"].status == "skipped"
+    assert results["C"].status == "success"
+
+
+def population_flow(directory, source="population_mondiale.csv"):
+    put = NIFI_STANDARD + "PutDatabaseRecord"
+    return flow([
+        ("1", NIFI_STANDARD + "GetFile", {"Input Directory": directory, "File Filter": source}),
+        ("2", NIFI_STANDARD + "ConvertRecord", {}),
+        ("3", put, {"Table Name": "population_mondiale_1960_2023", "Retry Count": "1"}),
+        ("4", put, {"Table Name": "population_afrique_1960_2023", "Region": "sub_saharan_africa"}),
+    ], [("1", "2"), ("2", "3"), ("2", "4")])
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)                      # cache colonnaire du jeu nettoyé sous tmp_path
+    shutil.copy(SOURCE, tmp_path / "population_mondiale.csv")
+    return tmp_path
+
+
+def test_rerun_does_not_duplicate_rows(workdir):
+    database = str(workdir / "warehouse.db")
+    context = FlowContext(functools.partial(connect_standin, database), "sqlite", create_tables=True)
+    runner = DagRunner(population_flow(str(workdir)), context, retry_delay=0)
+    for _ in range(2):
+        assert all(result.status == "success" for result in runner.run())
+
+    conn = connect_standin(database)
+    try:
+        for table in ("population_mondiale_1960_2023", "population_afrique_1960_2023"):
+            distinct = conn.execute(f"SELECT COUNT(DISTINCT country_code) FROM {table}").fetchone()[0]
+            assert row_count(conn, table) == distinct > 0
+    finally:
+        conn.close()
+
+
+def test_year_added_to_source_is_added_to_tables(workdir):
+    database = str(workdir / "warehouse.db")
+    context = FlowContext(functools.partial(connect_standin, database), "sqlite", create_tables=True)
+    runner = DagRunner(population_flow(str(workdir)), context, retry_delay=0)
+    runner.run()
+
+    path = workdir / "population_mondiale.csv"
+    lines = path.read_text(encoding="utf-8").splitlines()
+    path.write_text("\n".join([lines[0] + ";2024"] + [line + ";" + line.split(";")[-1] for line in lines[1:]]) + "\n",
+                    encoding="utf-8")
+    assert all(result.status == "success" for result in runner.run())
+
+    conn = connect_standin(database)
+    try:
+        for table in ("population_mondiale_1960_2023", "population_afrique_1960_2023"):
+            assert table_columns(conn, table, "sqlite")[-1] == "2024"
+            assert conn.execute(f"SELECT COUNT(*) FROM {table} WHERE [2024] IS NULL").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+
+def test_blocking_violation_fails_put_without_retry(workdir):
+    lines = (workdir / "population_mondiale.csv").read_text(encoding="utf-8").splitlines()
+    lines[1] = lines[1].replace(lines[1].split(";")[1], "Doublon", 1)
+    lines.append(lines[1])                           # country_code en double : violation bloquante
+    (workdir / "population_mondiale.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    database = str(workdir / "warehouse.db")
+    context = FlowContext(functools.partial(connect_standin, database), "sqlite", create_tables=True)
+    results = by_name(DagRunner(population_flow(str(workdir)), context, retry_delay=0).run())
+
+    assert (results["3"].status, results["3"].attempts) == ("failed", 1)
+    assert "quarantaine" in results["3"].error
+    conn = connect_standin(database)
+    try:
+        assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall() == []
+    finally:
+        conn.close()
+
+
+def test_cron_next_fire_time():
+    cron = CronExpression("0 0 0 5 1 *")
+    assert cron.next_after(datetime(2024, 3, 1)) == datetime(2025, 1, 5)
+    assert cron.next_after(datetime(2025, 1, 5)) == datetime(2026, 1, 5)
+    assert CronExpression("0 */15 * * * ?").next_after(datetime(2024, 1, 1, 10, 7, 30)) == datetime(2024, 1, 1, 10, 15)
+    assert CronExpression("0 0 9 ? * MON").next_after(datetime(2024, 1, 1, 9)) == datetime(2024, 1, 8, 9)
+
+
+def test_cron_rejects_invalid_expressions():
+    with pytest.raises(ValueError):
+        CronExpression("0 0 0 5 1")
+    with pytest.raises(ValueError):
+        CronExpression("0 0 25 * * *")
+    with pytest.raises(ValueError, match="Aucune date"):
+        CronExpression("0 0 0 30 2 *").next_after(datetime(2024, 1, 1))
+
+
+def test_schedule_sleeps_until_each_fire_time():
+    clock = [datetime(2024, 12, 31, 23, 59, 0)]
+    slept, runs = [], []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        clock[0] = clock[0].fromtimestamp(clock[0].timestamp() + seconds)
+
+    run_on_schedule("0 0 0 5 1 *", lambda: runs.append(clock[0]), now=lambda: clock[0], sleep=sleep, max_runs=2)
+    assert runs == [datetime(2025, 1, 5), datetime(2026, 1, 5)]
+    assert slept[0] == (datetime(2025, 1, 5) - datetime(2024, 12, 31, 23, 59)).total_seconds()
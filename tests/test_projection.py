@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from etl_population.bulk_loader import connect_standin, create_table, table_columns
+from etl_population.dimensions import migrate_legacy_projection
+from etl_population.projection import projection_frame
+from etl_population.schema import PROJECTION_COLUMNS, star_table_definitions
+
+YEARS = [str(year) for year in range(2014, 2024)]
+
+
+def frame():
+    growth = np.array([1.01, 1.02, np.nan])[:, None] ** np.arange(len(YEARS))[None, :]
+    df = pd.DataFrame(1e6 * growth, columns=YEARS)
+    df.insert(0, "country_code", ["AAA", "BBB", "CCC"])
+    return df
+
+
+def test_projection_is_keyed_by_country_key():
+    projection = projection_frame(frame(), YEARS, horizon=2026, window=5, keys=np.array([7, 3, 9], dtype=np.int16))
+    assert list(projection.columns) == PROJECTION_COLUMNS
+    # CCC n'a aucune année valide : pas projeté
+    assert list(zip(projection["country_key"], projection["year"])) == [(7, 2024), (7, 2025), (7, 2026),
+                                                                       (3, 2024), (3, 2025), (3, 2026)]
+    np.testing.assert_allclose(projection["population"].iloc[:3], 1e6 * 1.01 ** np.arange(10, 13))
+
+
+def test_projection_keys_default_to_row_numbers():
+    assert list(projection_frame(frame(), YEARS, horizon=2024)["country_key"]) == [1, 2]
+
+
+def test_legacy_projection_table_is_recreated(tmp_path):
+    conn = connect_standin()
+    create_table(conn, "population_projection", ["country_code TEXT", "year INT", "population REAL"])
+    assert migrate_legacy_projection(conn, str(tmp_path), "sqlite")
+    assert table_columns(conn, "population_projection", "sqlite") == []
+
+    create_table(conn, "population_projection", star_table_definitions("population_projection", "sqlite"))
+    assert not migrate_legacy_projection(conn, str(tmp_path), "sqlite")
+    assert table_columns(conn, "population_projection", "sqlite") == PROJECTION_COLUMNS
+    conn.close()
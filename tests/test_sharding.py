@@ -0,0 +1,71 @@
+import filecmp
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl_population.cli import main
+from etl_population.cube import build_cube
+from etl_population.sharding import MATRIX_COLUMNS, run_sharded
+from etl_population.streaming import clean_chunks, read_population_chunks
+from etl_population.schema import year_columns_of
+from etl_population.unpivot import unpivot
+from etl_population.validation import validate
+
+SOURCE = os.path.join(os.path.dirname(__file__), "..", "population_mondiale.csv")
+
+
+def chunks():
+    return read_population_chunks(SOURCE, chunksize=50, year_dtype="float64")
+
+
+@pytest.fixture(scope="module")
+def single():
+    df = pd.concat(clean_chunks(chunks()), ignore_index=True)
+    years = year_columns_of(df.columns)
+    return df, years, validate(df, years), build_cube(df, years), unpivot(df, years)
+
+
+@pytest.mark.parametrize("shards, max_workers", [(1, 1), (4, 1), (3, 2)])
+def test_sharded_run_matches_single_process(single, shards, max_workers):
+    df, _, report, cube, facts = single
+    result = run_sharded(chunks(), shards=shards, max_workers=max_workers)
+
+    pd.testing.assert_frame_equal(result.cleaned, df)
+    # Sommes exactes : identiques au bit près quelle que soit la répartition
+    pd.testing.assert_frame_equal(result.cube, cube)
+    for col in MATRIX_COLUMNS:
+        np.testing.assert_array_equal(result.matrices[col].ravel(), facts[col].to_numpy())
+    pd.testing.assert_frame_equal(result.report.violations, report.violations)
+    assert result.report.by_region == report.by_region
+
+
+def test_sharded_run_matches_on_invalid_rows(single):
+    df, years, _, _, _ = single
+    broken = df.copy()
+    broken.loc[3, "country_code"] = broken.loc[40, "country_code"]
+    broken.loc[7, years[10]] = -1.0
+    broken.loc[9, "borders"] = "ZZZ"
+    expected = validate(broken, years)
+    assert not expected.ok
+
+    result = run_sharded([broken], shards=4, max_workers=1)
+    pd.testing.assert_frame_equal(result.report.violations, expected.violations)
+
+
+def test_clean_writes_the_same_files_sharded(tmp_path, monkeypatch):
+    for name, extra in (("single", []), ("sharded", ["--shards", "4"])):
+        (tmp_path / name).mkdir()
+        monkeypatch.chdir(tmp_path / name)
+        shutil.copy(SOURCE, "population_mondiale.csv")
+        with open("etl_config.json", "w", encoding="utf-8") as handle:
+            handle.write('{"figures_dir": "figures", "database": {"sqlite": "warehouse.db"}}')
+        assert main(["clean", *extra]) == 0
+
+    staging = sorted(os.listdir(tmp_path / "single" / "staging"))
+    assert "staging_population_cube.csv" in staging
+    files = ["population_mondiale_cleaned.csv"] + [os.path.join("staging", name) for name in staging]
+    _, mismatch, errors = filecmp.cmpfiles(tmp_path / "single", tmp_path / "sharded", files, shallow=False)
+    assert mismatch == [] and errors == []
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from etl_population.streaming import PopulationProfile
+
+YEARS = ["2021", "2022", "2023"]
+
+
+def frame(values):
+    df = pd.DataFrame(values, columns=YEARS)
+    df.insert(0, "country_code", [f"C{i:04d}" for i in range(len(df))])
+    return df
+
+
+def profile(df, chunksize):
+    result = PopulationProfile(reference_year="2023", top_k=3)
+    for first in range(0, len(df), chunksize):
+        result.update(df.iloc[first:first + chunksize])
+    return result
+
+
+def test_std_is_exact_at_population_magnitudes():
+    # Écart-type d'environ 1 autour de 1e9 : somme des carrés - n * moyenne² n'en garde aucun chiffre
+    rng = np.random.default_rng(0)
+    values = 1e9 + rng.normal(0.0, 1.0, size=(5000, len(YEARS)))
+    values[17, 1] = np.nan
+    df = frame(values)
+    # Référence : écarts à 1e9 (soustraction exacte à cette échelle)
+    exact = np.nanstd(values - 1e9, axis=0, ddof=1)
+
+    for chunksize in (1, 333, 5000):
+        described = profile(df, chunksize).describe()
+        np.testing.assert_allclose(described.loc["std"], exact, rtol=1e-6)
+        np.testing.assert_allclose(described.loc["mean"], df[YEARS].mean(), rtol=1e-12)
+        assert list(described.loc["count"]) == [5000, 4999, 5000]
+
+
+def test_std_needs_two_values():
+    described = profile(frame([[1.0, np.nan, 3.0], [np.nan, np.nan, 5.0]]), 1).describe()
+    assert np.isnan(described.loc["std", "2021"])
+    assert np.isnan(described.loc["mean", "2022"]) and np.isnan(described.loc["std", "2022"])
+    assert described.loc["std", "2023"] == np.std([3.0, 5.0], ddof=1)
+    assert list(profile(frame([[1.0, 2.0, 3.0], [2.0, 4.0, 5.0]]), 1).world_population()) == [3.0, 6.0, 8.0]
@@ -0,0 +1,135 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl_population.cli import main
+from etl_population.continents import FLAG_COLUMNS
+from etl_population.validation import ValidationError, validate
+
+YEARS = ["2021", "2022", "2023"]
+SOURCE = os.path.join(os.path.dirname(__file__), "..", "population_mondiale.csv")
+
+
+def frame(codes=("AAA", "BBB", "CCC"), borders=None, values=None):
+    df = pd.DataFrame({"country_code": pd.array(codes, dtype="string"),
+                       "borders": borders or ["BBB", "AAA,CCC", "BBB"]})
+    for flag in FLAG_COLUMNS:
+        df[flag] = False
+    values = np.full((len(codes), len(YEARS)), 1e6) if values is None else np.asarray(values, dtype=float)
+    for i, year in enumerate(YEARS):
+        df[year] = values[:, i]
+    return df
+
+
+def rules(report):
+    return {rule: count for rule, count in report.counts().items() if count}
+
+
+def test_clean_frame_passes():
+    report = validate(frame(), YEARS)
+    assert report.ok and rules(report) == {}
+    report.raise_for_errors()
+
+
+@pytest.mark.parametrize("row, expected", [
+    ([1e6, 1.4e6, 1.9e6], {}),                                   # +40 %, +36 % : sous le seuil de 50 %
+    ([1e6, 1.6e6, 1.6e6], {"yoy_jump": 1}),
+    ([1e6, 0.4e6, 0.4e6], {"yoy_jump": 1}),
+    ([0.0, 1e6, 1e6], {}),                                       # pas de variation depuis une année à zéro
+    ([np.nan, 1e6, 1e6], {}),
+])
+def test_yoy_jump(row, expected):
+    report = validate(frame(values=[row, [1e6] * 3, [1e6] * 3]), YEARS)
+    assert rules(report) == expected
+    assert report.ok == (not expected)
+
+
+def test_yoy_jump_threshold_is_configurable():
+    df = frame(values=[[1e6, 1.3e6, 1.3e6], [1e6] * 3, [1e6] * 3])
+    assert validate(df, YEARS).ok
+    report = validate(df, YEARS, max_jump=0.2)
+    assert list(report.errors["detail"]) == ["2021 -> 2022 : +30.0%"]
+    assert list(report.quarantined_rows) == [0]
+
+
+def test_negative_population_blocks():
+    report = validate(frame(values=[[1e6] * 3, [1e6, -5.0, 1e6], [1e6] * 3]), YEARS)
+    assert not report.ok
+    assert list(report.errors["rule"]).count("negative_population") == 1
+    assert list(report.quarantined_rows) == [1]
+    with pytest.raises(ValidationError) as raised:
+        report.raise_for_errors()
+    assert raised.value.report is report and not raised.value.retryable
+
+
+@pytest.mark.parametrize("code", [None, "", "  "])
+def test_missing_code_blocks(code):
+    report = validate(frame(codes=["AAA", code, "CCC"], borders=["", "", ""]), YEARS)
+    assert rules(report) == {"missing_code": 1}
+    assert list(report.quarantined_rows) == [1]
+
+
+def test_duplicate_code_blocks_every_copy():
+    report = validate(frame(codes=["AAA", "BBB", "AAA"], borders=["BBB", "AAA", "BBB"]), YEARS)
+    assert rules(report) == {"duplicate_code": 2}
+    assert list(report.errors["detail"]) == ["2 lignes", "2 lignes"]
+    assert list(report.quarantined_rows) == [0, 2]
+
+
+def test_flag_conflict_blocks():
+    df = frame()
+    df.loc[2, ["asia_oceania", "sub_saharan_africa"]] = True
+    report = validate(df, YEARS)
+    assert rules(report) == {"flag_conflict": 1}
+    assert list(report.quarantined_rows) == [2]
+
+
+def test_unknown_border_is_only_a_warning():
+    report = validate(frame(borders=["BBB,IRN", "AAA,CCC", "BBB"]), YEARS)
+    assert report.ok
+    assert rules(report) == {"unknown_border": 1}
+    assert list(report.warnings["detail"]) == ["IRN"]
+    assert len(report.quarantined_rows) == 0
+
+
+def test_quarantine_lists_the_rules_of_each_row(tmp_path):
+    df = frame(codes=["AAA", "AAA", "CCC"], borders=["", "", ""], values=[[1e6] * 3, [1e6, -1.0, 1e6], [1e6] * 3])
+    report = validate(df, YEARS)
+    quarantine = pd.read_csv(report.write_quarantine(df, str(tmp_path / "quarantine.csv")), sep=";")
+    assert list(quarantine["violations"]) == ["duplicate_code", "duplicate_code,negative_population,yoy_jump"]
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    shutil.copy(SOURCE, "population_mondiale.csv")
+    with open("etl_config.json", "w", encoding="utf-8") as handle:
+        handle.write('{"figures_dir": "figures", "database": {"sqlite": "warehouse.db"}}')
+    return tmp_path
+
+
+def stage_names():
+    with open(os.path.join("reports", "run_report.json"), encoding="utf-8") as handle:
+        return [stage["name"] for stage in json.load(handle)["stages"]]
+
+
+def test_all_validates_once(workspace):
+    assert main(["all", "--no-figures"]) == 0
+    names = stage_names()
+    assert names.count("validate") == 1
+    assert names.index("validate") < names.index("insert")
+
+
+def test_load_writes_nothing_when_validation_fails(workspace):
+    source = pd.read_csv("population_mondiale.csv", sep=";", dtype=str, keep_default_na=False)
+    source.loc[5, "country_code"] = source.loc[6, "country_code"]
+    source.to_csv("population_mondiale.csv", sep=";", index=False)
+
+    assert main(["load"]) == 1
+    assert "insert" not in stage_names()
+    with open(os.path.join("reports", "validation_report.json"), encoding="utf-8") as handle:
+        assert json.load(handle)["rules"]["duplicate_code"]["violations"] == 2